@@ -0,0 +1,66 @@
+import sys
+import os
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+from alembic import context
+
+# Add project root path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from database import MasterSessionLocal, tenant_database_url
+from models.models_master import Hospital
+
+# Alembic Config
+config = context.config
+
+# Interpret .ini file for Python logging (skipped when the app migrates in-process)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+# Tenant schemas are partly created by raw DDL, so migrations are hand-written
+# and autogenerate is not used
+target_metadata = None
+
+
+def tenant_db_names():
+    """-x tenant=<db_name> selects one tenant; default is every registered hospital"""
+    selected = context.get_x_argument(as_dictionary=True).get("tenant")
+    if selected:
+        return [selected]
+    with MasterSessionLocal() as db:
+        return [str(h.db_name) for h in db.query(Hospital).order_by(Hospital.id)]
+
+
+def run_migrations_offline():
+    """Run migrations in 'offline' mode (SQL for one tenant)."""
+    context.configure(
+        url=tenant_database_url(tenant_db_names()[0]),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run migrations in 'online' mode, one tenant DB after another."""
+    for db_name in tenant_db_names():
+        print(f"Migrating tenant {db_name}")
+        connectable = create_engine(tenant_database_url(db_name), poolclass=pool.NullPool)
+        try:
+            with connectable.connect() as connection:
+                context.configure(connection=connection, target_metadata=target_metadata)
+
+                with context.begin_transaction():
+                    context.run_migrations()
+        finally:
+            connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,67 @@
+"""attendance, leave and payroll composite indexes
+
+Revision ID: 3c1e7a9d5b20
+Revises:
+Create Date: 2026-10-18 10:12:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1e7a9d5b20'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+# Per-employee lookups (payslip, punch logs, roster, legacy validation) lead with
+# employee_id; month-wide scans (validation/payroll engines) lead with the date.
+INDEXES = [
+    ('ix_attendance_punches_employee_date', 'attendance_punches', ['employee_id', 'date']),
+    ('ix_attendance_punches_date_status', 'attendance_punches', ['date', 'status', 'employee_id']),
+    ('ix_employee_roster_employee_date', 'employee_roster', ['employee_id', 'date']),
+    ('ix_employee_roster_date', 'employee_roster', ['date']),
+    ('ix_leave_applications_employee_status_dates', 'leave_applications', ['employee_id', 'status', 'from_date', 'to_date']),
+    ('ix_leave_applications_to_date', 'leave_applications', ['to_date', 'from_date']),
+    ('ix_od_applications_employee_date_status', 'od_applications', ['employee_id', 'od_date', 'status']),
+    ('ix_od_applications_od_date', 'od_applications', ['od_date']),
+    ('ix_attendance_regularizations_employee_date_status', 'attendance_regularizations', ['employee_id', 'punch_date', 'status']),
+    ('ix_attendance_regularizations_punch_date', 'attendance_regularizations', ['punch_date']),
+    ('ix_payroll_runs_month_year', 'payroll_runs', ['month', 'year']),
+]
+
+
+def _existing(inspector, table):
+    if not inspector.has_table(table):
+        return None, None
+    columns = {c['name'] for c in inspector.get_columns(table)}
+    indexes = {i['name'] for i in inspector.get_indexes(table)}
+    return columns, indexes
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing_columns, existing_indexes = _existing(inspector, table)
+        # Some tables are created lazily or with older column sets; index what exists
+        if existing_columns is None or not set(columns) <= existing_columns:
+            print(f"  skip {name}: {table} missing or lacks {columns}")
+            continue
+        if name in existing_indexes:
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        _, existing_indexes = _existing(inspector, table)
+        if existing_indexes and name in existing_indexes:
+            op.drop_index(name, table_name=table)
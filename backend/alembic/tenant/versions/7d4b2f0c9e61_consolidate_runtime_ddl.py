@@ -0,0 +1,445 @@
+"""consolidate runtime DDL
+
+Schema changes that used to run from routes/organization/create_table.py,
+add_oncall_*.py, fix_medical_table.py and CREATE TABLE IF NOT EXISTS calls
+inside request handlers. Every step checks the live schema first, so tenants
+that already received some of them by hand migrate cleanly.
+
+Revision ID: 7d4b2f0c9e61
+Revises: 3c1e7a9d5b20
+Create Date: 2026-10-18 11:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4b2f0c9e61'
+down_revision: Union[str, Sequence[str], None] = '3c1e7a9d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> [(column, definition)]
+ADD_COLUMNS = {
+    'hr_policies': [
+        ('description', 'TEXT'),
+        ('document', 'VARCHAR(255)'),
+    ],
+    'users': [
+        ('employee_code', 'VARCHAR(50) UNIQUE'),
+        ('employee_type', 'VARCHAR(50)'),
+        ('designation', 'VARCHAR(150)'),
+        ('joining_date', 'DATE'),
+        ('status', "VARCHAR(50) DEFAULT 'Active'"),
+        ('leave_policy_id', 'INT NULL'),
+    ],
+    'employees': [
+        ('leave_policy_id', 'INT NULL'),
+    ],
+    'offer_letters': [
+        ('candidate_id', 'INT'),
+        ('candidate_name', 'VARCHAR(150)'),
+        ('job_title', 'VARCHAR(200)'),
+        ('department', 'VARCHAR(100)'),
+        ('ctc', 'INT'),
+        ('basic_percent', 'INT DEFAULT 40'),
+        ('hra_percent', 'INT DEFAULT 20'),
+        ('joining_date', 'DATE'),
+        ('probation_period', "VARCHAR(50) DEFAULT '3 Months'"),
+        ('notice_period', "VARCHAR(50) DEFAULT '30 Days'"),
+        ('terms', 'TEXT'),
+        ('document', 'VARCHAR(255)'),
+        ('offer_status', "VARCHAR(50) DEFAULT 'Draft'"),
+        ('token', 'VARCHAR(200)'),
+        ('created_at', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    'document_uploads': [
+        ('candidate_id', 'INT'),
+        ('document_type', 'VARCHAR(100)'),
+        ('file_name', 'VARCHAR(255)'),
+        ('file_path', 'VARCHAR(500)'),
+        ('status', "VARCHAR(50) DEFAULT 'Uploaded'"),
+        ('remarks', 'TEXT'),
+        ('uploaded_at', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    'onboarding_candidates': [
+        ('employee_id', 'VARCHAR(50)'),
+    ],
+    'bgv': [
+        ('candidate_id', 'INT'),
+        ('verification_type', "VARCHAR(50) DEFAULT 'Internal HR Team'"),
+        ('agency_name', 'VARCHAR(150)'),
+        ('status', "VARCHAR(50) DEFAULT 'Pending'"),
+        ('identity_verified', 'BOOLEAN DEFAULT FALSE'),
+        ('address_verified', 'BOOLEAN DEFAULT FALSE'),
+        ('employment_verified', 'BOOLEAN DEFAULT FALSE'),
+        ('education_verified', 'BOOLEAN DEFAULT FALSE'),
+        ('criminal_verified', 'BOOLEAN DEFAULT FALSE'),
+        ('remarks', 'TEXT'),
+        ('created_at', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
+        ('updated_at', 'DATETIME DEFAULT CURRENT_TIMESTAMP'),
+    ],
+    'employee_medical': [
+        ('height', 'VARCHAR(10)'),
+        ('weight', 'VARCHAR(10)'),
+        ('allergies', 'TEXT'),
+        ('chronic_conditions', 'TEXT'),
+        ('medications', 'TEXT'),
+        ('emergency_contact_name', 'VARCHAR(150)'),
+        ('emergency_contact_phone', 'VARCHAR(20)'),
+        ('emergency_contact_relation', 'VARCHAR(50)'),
+        ('medical_insurance_provider', 'VARCHAR(200)'),
+        ('medical_insurance_number', 'VARCHAR(100)'),
+        ('medical_council_registration_number', 'VARCHAR(100)'),
+        ('medical_council_name', 'VARCHAR(200)'),
+        ('medical_council_expiry_date', 'DATE'),
+        ('vaccination_records', 'JSON'),
+        ('professional_licenses', 'JSON'),
+        ('license_alert_enabled', 'BOOLEAN DEFAULT TRUE'),
+        ('license_alert_days', 'INT DEFAULT 30'),
+    ],
+    'employee_exit': [
+        ('reason', 'VARCHAR(100)'),
+        ('notice_period', "VARCHAR(10) DEFAULT '30'"),
+        ('exit_interview_date', 'DATE'),
+        ('handover_status', "VARCHAR(50) DEFAULT 'Pending'"),
+        ('asset_return_status', "VARCHAR(50) DEFAULT 'Pending'"),
+        ('final_settlement', "VARCHAR(50) DEFAULT 'Pending'"),
+    ],
+    'employee_education': [
+        ('specialization', 'VARCHAR(200)'),
+        ('board_university', 'VARCHAR(200)'),
+        ('start_year', 'VARCHAR(10)'),
+        ('end_year', 'VARCHAR(10)'),
+        ('percentage_cgpa', 'VARCHAR(20)'),
+        ('education_type', 'VARCHAR(50)'),
+        ('country', 'VARCHAR(100)'),
+        ('state', 'VARCHAR(100)'),
+        ('city', 'VARCHAR(100)'),
+    ],
+    'employee_experience': [
+        ('job_title', 'VARCHAR(150)'),
+        ('department', 'VARCHAR(150)'),
+        ('employment_type', 'VARCHAR(50)'),
+        ('start_date', 'DATE'),
+        ('end_date', 'DATE'),
+        ('current_job', 'BOOLEAN DEFAULT FALSE'),
+        ('salary', 'VARCHAR(50)'),
+        ('location', 'VARCHAR(200)'),
+        ('job_description', 'TEXT'),
+        ('achievements', 'TEXT'),
+        ('reason_for_leaving', 'VARCHAR(200)'),
+        ('reporting_manager', 'VARCHAR(150)'),
+        ('manager_contact', 'VARCHAR(50)'),
+    ],
+    'employee_reporting': [
+        ('alternate_supervisor_id', 'INT'),
+    ],
+    'attendance_punches': [
+        ('latitude', 'FLOAT'),
+        ('longitude', 'FLOAT'),
+        ('device_info', 'VARCHAR(200)'),
+    ],
+    'leave_policies': [
+        ('leave_allocations', 'JSON NULL'),
+    ],
+    'leave_applications': [
+        ('policy_id', 'INT NULL'),
+    ],
+    'statutory_rules': [
+        ('pf_apply_on', "VARCHAR(50) DEFAULT 'Basic'"),
+        ('esi_threshold', 'FLOAT DEFAULT 21000.0'),
+        ('pt_enabled', 'BOOLEAN DEFAULT TRUE'),
+        ('tds_percent', 'FLOAT DEFAULT 10.0'),
+        ('updated_at', 'DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'),
+    ],
+    # payroll_runs may have been created from the ORM model, which lacks the
+    # columns the payroll run screens write
+    'payroll_runs': [
+        ('employee_name', 'VARCHAR(255)'),
+        ('employee_code', 'VARCHAR(50)'),
+        ('year', 'INT'),
+        ('leave_days', 'INT DEFAULT 0'),
+        ('basic_salary', 'DECIMAL(15,2) DEFAULT 0'),
+        ('hra_salary', 'DECIMAL(15,2) DEFAULT 0'),
+        ('allowances', 'DECIMAL(15,2) DEFAULT 0'),
+        ('lop_deduction', 'DECIMAL(15,2) DEFAULT 0'),
+    ],
+    'payroll_adjustments': [
+        ('status', "VARCHAR(50) DEFAULT 'Active'"),
+    ],
+    'asset_assignments': [
+        ('asset_id', 'VARCHAR(150)'),
+        ('brand', 'VARCHAR(150)'),
+        ('model', 'VARCHAR(150)'),
+        ('`condition`', 'VARCHAR(50)'),
+        ('location', 'VARCHAR(150)'),
+        ('cost', 'FLOAT'),
+    ],
+    'pms_goals': [
+        ('description', 'TEXT'),
+        ('priority', "VARCHAR(50) DEFAULT 'Medium'"),
+        ('current_value', "VARCHAR(100) DEFAULT '0'"),
+        ('unit', 'VARCHAR(50)'),
+    ],
+    'pms_feedback': [
+        ('strengths', 'TEXT'),
+        ('improvements', 'TEXT'),
+        ('goals', 'TEXT'),
+    ],
+    'pms_appraisal': [
+        ('strengths', 'TEXT'),
+        ('improvements', 'TEXT'),
+        ('development_plan', 'TEXT'),
+        ('comments', 'TEXT'),
+    ],
+}
+
+# table -> [(old column, new column, definition)]
+RENAME_COLUMNS = {
+    'employee_education': [('year', 'end_year_old', 'VARCHAR(10)')],
+    'employee_experience': [
+        ('role', 'job_title_old', 'VARCHAR(150)'),
+        ('from_year', 'start_year_old', 'VARCHAR(10)'),
+        ('to_year', 'end_year_old', 'VARCHAR(10)'),
+    ],
+}
+
+CREATE_TABLES = {
+    'attendance_locations': """
+        CREATE TABLE attendance_locations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            description TEXT,
+            address TEXT,
+            latitude FLOAT,
+            longitude FLOAT,
+            radius INT DEFAULT 100,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """,
+    'salary_structures': """
+        CREATE TABLE salary_structures (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            ctc FLOAT NOT NULL,
+            basic_percent FLOAT NOT NULL,
+            hra_percent FLOAT NOT NULL,
+            allowances TEXT,
+            deductions TEXT,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'statutory_rules': """
+        CREATE TABLE statutory_rules (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            pf_enabled BOOLEAN DEFAULT TRUE,
+            pf_percent FLOAT DEFAULT 12.0,
+            pf_apply_on VARCHAR(50) DEFAULT 'Basic',
+            esi_enabled BOOLEAN DEFAULT TRUE,
+            esi_threshold FLOAT DEFAULT 21000.0,
+            esi_percent FLOAT DEFAULT 1.75,
+            pt_enabled BOOLEAN DEFAULT TRUE,
+            pt_amount FLOAT DEFAULT 200.0,
+            tds_enabled BOOLEAN DEFAULT TRUE,
+            tds_percent FLOAT DEFAULT 10.0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """,
+    'payroll_runs': """
+        CREATE TABLE payroll_runs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id VARCHAR(50),
+            employee_name VARCHAR(255),
+            employee_code VARCHAR(50),
+            month VARCHAR(20),
+            year INT,
+            present_days INT DEFAULT 0,
+            leave_days INT DEFAULT 0,
+            lop_days INT DEFAULT 0,
+            ot_hours FLOAT DEFAULT 0,
+            basic_salary DECIMAL(15,2) DEFAULT 0,
+            hra_salary DECIMAL(15,2) DEFAULT 0,
+            allowances DECIMAL(15,2) DEFAULT 0,
+            gross_salary DECIMAL(15,2) DEFAULT 0,
+            lop_deduction DECIMAL(15,2) DEFAULT 0,
+            net_salary DECIMAL(15,2) DEFAULT 0,
+            status VARCHAR(50) DEFAULT 'Completed',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_employee_month (employee_id, month, year),
+            KEY ix_payroll_runs_month_year (month, year)
+        )
+    """,
+    'payroll_adjustments': """
+        CREATE TABLE payroll_adjustments (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id INT NOT NULL,
+            month VARCHAR(50) NOT NULL,
+            adjustment_type VARCHAR(50) NOT NULL,
+            amount DECIMAL(15,2) NOT NULL,
+            description TEXT,
+            status VARCHAR(50) DEFAULT 'Active',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'license_renewal_alerts': """
+        CREATE TABLE license_renewal_alerts (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id INT NOT NULL,
+            license_type VARCHAR(100) NOT NULL,
+            license_number VARCHAR(100) NOT NULL,
+            expiry_date DATE NOT NULL,
+            alert_date DATE NOT NULL,
+            alert_days INT DEFAULT 30,
+            status VARCHAR(50) DEFAULT 'Pending',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES users(id)
+        )
+    """,
+    'on_call_duties': """
+        CREATE TABLE on_call_duties (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id INT NOT NULL,
+            date DATE NOT NULL,
+            from_time TIME NOT NULL,
+            to_time TIME NOT NULL,
+            duty_type VARCHAR(50) DEFAULT 'On-Call',
+            department_id INT,
+            priority_level VARCHAR(20) DEFAULT 'Normal',
+            contact_number VARCHAR(20),
+            status VARCHAR(50) DEFAULT 'Scheduled',
+            remarks TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES users (id),
+            FOREIGN KEY (department_id) REFERENCES departments (id)
+        )
+    """,
+    'emergency_call_logs': """
+        CREATE TABLE emergency_call_logs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            on_call_duty_id INT NOT NULL,
+            employee_id INT NOT NULL,
+            call_time DATETIME NOT NULL,
+            response_time DATETIME,
+            call_type VARCHAR(50) NOT NULL,
+            caller_details VARCHAR(200),
+            issue_description TEXT,
+            resolution_notes TEXT,
+            call_duration INT,
+            status VARCHAR(50) DEFAULT 'Received',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (on_call_duty_id) REFERENCES on_call_duties (id),
+            FOREIGN KEY (employee_id) REFERENCES users (id)
+        )
+    """,
+    'referral_links': """
+        CREATE TABLE referral_links (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id INT NOT NULL,
+            referrer_employee_id INT NOT NULL,
+            referrer_name VARCHAR(255) NOT NULL,
+            referral_code VARCHAR(50) UNIQUE NOT NULL,
+            referral_url TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            status VARCHAR(20) DEFAULT 'Active'
+        )
+    """,
+}
+
+# (table, constraint name, columns); the bulk punch and payroll writers rely on
+# these for INSERT ... ON DUPLICATE KEY UPDATE, so duplicates are collapsed first
+UNIQUE_KEYS = [
+    ('attendance_punches', 'unique_employee_date', ['employee_id', 'date']),
+    ('payroll_runs', 'unique_employee_month', ['employee_id', 'month', 'year']),
+]
+
+# table -> statement run before collapsing, folding older rows into the newest one
+MERGE_DUPLICATES = {
+    # repeated punches fold into one record the way the punch ingest does: earliest IN, latest OUT
+    'attendance_punches': """
+        UPDATE attendance_punches newest
+        JOIN (
+            SELECT employee_id, date, MAX(id) AS id, MIN(in_time) AS in_time, MAX(out_time) AS out_time
+            FROM attendance_punches GROUP BY employee_id, date HAVING COUNT(*) > 1
+        ) folded ON folded.id = newest.id
+        SET newest.in_time = folded.in_time, newest.out_time = folded.out_time
+    """,
+}
+
+
+def _columns(inspector, table):
+    return {c['name'] for c in inspector.get_columns(table)}
+
+
+def _collapse_duplicates(table, columns):
+    """Keep the newest row per key; payroll reruns and punch updates always superseded older rows"""
+    if table in MERGE_DUPLICATES:
+        op.execute(MERGE_DUPLICATES[table])
+    matches = ' AND '.join(f"newer.{c} = older.{c}" for c in columns)
+    op.execute(f"""
+        DELETE older FROM {table} older
+        JOIN {table} newer ON {matches} AND newer.id > older.id
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    inspector = sa.inspect(bind)
+    for table, ddl in CREATE_TABLES.items():
+        if not inspector.has_table(table):
+            op.execute(ddl)
+
+    inspector = sa.inspect(bind)
+    for table, columns in ADD_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing = _columns(inspector, table)
+        for column, definition in columns:
+            if column.strip('`') not in existing:
+                op.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    for table, renames in RENAME_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing = _columns(inspector, table)
+        for old, new, definition in renames:
+            if old in existing and new not in existing:
+                op.execute(f"ALTER TABLE {table} CHANGE {old} {new} {definition}")
+
+    if inspector.has_table('hr_policies') and 'code_of_conduct' in _columns(inspector, 'hr_policies'):
+        op.execute("ALTER TABLE hr_policies DROP COLUMN code_of_conduct")
+
+    if inspector.has_table('attendance_punches'):
+        # widened for GPS data
+        op.execute("ALTER TABLE attendance_punches MODIFY COLUMN location VARCHAR(500)")
+
+    inspector = sa.inspect(bind)
+    for table, name, columns in UNIQUE_KEYS:
+        if not inspector.has_table(table):
+            continue
+        if not set(columns) <= _columns(inspector, table):
+            continue
+        if name in {c['name'] for c in inspector.get_unique_constraints(table)}:
+            continue
+        _collapse_duplicates(table, columns)
+        op.create_unique_constraint(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Consolidates changes that were applied by hand for a long time; there is
+    # no reliable earlier state to return to.
+    pass
@@ -0,0 +1,55 @@
+"""attendance monthly summary table
+
+Revision ID: a5f3c8e2d914
+Revises: 7d4b2f0c9e61
+Create Date: 2026-10-18 16:05:12.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f3c8e2d914'
+down_revision: Union[str, Sequence[str], None] = '7d4b2f0c9e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from utils.attendance_summary import rebuild_attendance_summary
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    # new tenants already have it from create_all
+    if not inspector.has_table('attendance_monthly_summary'):
+        op.create_table(
+            'attendance_monthly_summary',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('employee_id', sa.Integer(), nullable=False),
+            sa.Column('year', sa.Integer(), nullable=False),
+            sa.Column('month', sa.Integer(), nullable=False),
+            sa.Column('present_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('late_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('early_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('absent_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('punched_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('worked_minutes', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('ot_minutes', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+            sa.UniqueConstraint('employee_id', 'year', 'month', name='uq_attendance_monthly_summary_employee_month'),
+        )
+        op.create_index('ix_attendance_monthly_summary_month', 'attendance_monthly_summary', ['year', 'month'])
+
+    # backfill from existing punches
+    if inspector.has_table('attendance_punches'):
+        rebuild_attendance_summary(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('attendance_monthly_summary'):
+        op.drop_table('attendance_monthly_summary')
@@ -0,0 +1,54 @@
+"""employee roster unique employee/day
+
+Roster copies and rotation templates skip days that are already rostered,
+which needs a unique (employee_id, date) key. Duplicate days are collapsed to
+the newest row first; that is the one the schedule screen showed.
+
+Revision ID: c7e1d4b9f302
+Revises: a5f3c8e2d914
+Create Date: 2026-10-18 18:42:09.311574
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1d4b9f302'
+down_revision: Union[str, Sequence[str], None] = 'a5f3c8e2d914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('employee_roster'):
+        return
+    if 'uq_employee_roster_employee_date' in {c['name'] for c in inspector.get_unique_constraints('employee_roster')}:
+        return
+
+    op.execute("""
+        DELETE older FROM employee_roster older
+        JOIN employee_roster newer
+          ON newer.employee_id = older.employee_id AND newer.date = older.date AND newer.id > older.id
+    """)
+    op.create_unique_constraint('uq_employee_roster_employee_date', 'employee_roster', ['employee_id', 'date'])
+
+    # the unique key serves the employee/date lookups the plain index did
+    if 'ix_employee_roster_employee_date' in {i['name'] for i in inspector.get_indexes('employee_roster')}:
+        op.drop_index('ix_employee_roster_employee_date', table_name='employee_roster')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('employee_roster'):
+        return
+    if 'ix_employee_roster_employee_date' not in {i['name'] for i in inspector.get_indexes('employee_roster')}:
+        op.create_index('ix_employee_roster_employee_date', 'employee_roster', ['employee_id', 'date'])
+    if 'uq_employee_roster_employee_date' in {c['name'] for c in inspector.get_unique_constraints('employee_roster')}:
+        op.drop_constraint('uq_employee_roster_employee_date', 'employee_roster', type_='unique')
@@ -0,0 +1,49 @@
+"""attendance daily totals table
+
+Tenant-wide punch counts per day and status for the daily attendance report,
+refreshed with attendance_monthly_summary.
+
+Revision ID: e4b8a2f6d135
+Revises: c7e1d4b9f302
+Create Date: 2026-10-18 21:14:37.620815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8a2f6d135'
+down_revision: Union[str, Sequence[str], None] = 'c7e1d4b9f302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from utils.attendance_summary import rebuild_daily_totals
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    # new tenants already have it from create_all
+    if not inspector.has_table('attendance_daily_totals'):
+        op.create_table(
+            'attendance_daily_totals',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(50), nullable=False),
+            sa.Column('punches', sa.Integer(), nullable=False, server_default='0'),
+            sa.UniqueConstraint('date', 'status', name='uq_attendance_daily_totals_date_status'),
+        )
+
+    # backfill from existing punches
+    if inspector.has_table('attendance_punches'):
+        rebuild_daily_totals(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('attendance_daily_totals'):
+        op.drop_table('attendance_daily_totals')
@@ -0,0 +1,94 @@
+"""hospital subscription columns and tenant bookkeeping tables
+
+Revision ID: b5e2c8a41f73
+Revises: 8f08415706d4
+Create Date: 2026-10-18 11:20:05.402187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2c8a41f73'
+down_revision: Union[str, Sequence[str], None] = '8f08415706d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    # Previously added by routes/organization/create_table.py
+    hospital_columns = {c['name'] for c in inspector.get_columns('hospitals')}
+    if 'subscription_plan' not in hospital_columns:
+        op.add_column('hospitals', sa.Column('subscription_plan', sa.String(length=50), nullable=True, server_default='Standard'))
+    if 'license_start_date' not in hospital_columns:
+        op.add_column('hospitals', sa.Column('license_start_date', sa.Date(), nullable=True))
+    if 'license_end_date' not in hospital_columns:
+        op.add_column('hospitals', sa.Column('license_end_date', sa.Date(), nullable=True))
+
+    # Tables the app may already have created at startup via create_all
+    if not inspector.has_table('tenant_user_directory'):
+        op.create_table('tenant_user_directory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=191), nullable=False),
+        sa.Column('hospital_id', sa.Integer(), nullable=False),
+        sa.Column('db_name', sa.String(length=150), nullable=False),
+        sa.Column('tenant_user_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hospital_id'], ['hospitals.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_tenant_user_directory_email'), 'tenant_user_directory', ['email'], unique=True)
+        op.create_index(op.f('ix_tenant_user_directory_db_name'), 'tenant_user_directory', ['db_name'], unique=False)
+
+    if not inspector.has_table('background_jobs'):
+        op.create_table('background_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('tenant_id', sa.String(length=150), nullable=False),
+        sa.Column('job_type', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=True),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('result_path', sa.String(length=512), nullable=True),
+        sa.Column('result_filename', sa.String(length=255), nullable=True),
+        sa.Column('result_media_type', sa.String(length=100), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.String(length=191), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_background_jobs_tenant_id'), 'background_jobs', ['tenant_id'], unique=False)
+        op.create_index(op.f('ix_background_jobs_status'), 'background_jobs', ['status'], unique=False)
+
+    if not inspector.has_table('tenant_schema_versions'):
+        op.create_table('tenant_schema_versions',
+        sa.Column('db_name', sa.String(length=150), nullable=False),
+        sa.Column('revision', sa.String(length=32), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('migrated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('db_name')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tenant_schema_versions')
+    op.drop_index(op.f('ix_background_jobs_status'), table_name='background_jobs')
+    op.drop_index(op.f('ix_background_jobs_tenant_id'), table_name='background_jobs')
+    op.drop_table('background_jobs')
+    op.drop_index(op.f('ix_tenant_user_directory_db_name'), table_name='tenant_user_directory')
+    op.drop_index(op.f('ix_tenant_user_directory_email'), table_name='tenant_user_directory')
+    op.drop_table('tenant_user_directory')
+    op.drop_column('hospitals', 'license_end_date')
+    op.drop_column('hospitals', 'license_start_date')
+    op.drop_column('hospitals', 'subscription_plan')
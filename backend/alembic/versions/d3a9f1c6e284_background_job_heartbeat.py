@@ -0,0 +1,34 @@
+"""background job owner and heartbeat
+
+Revision ID: d3a9f1c6e284
+Revises: e91a3d6c2b48
+Create Date: 2026-10-19 10:12:37.905216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9f1c6e284'
+down_revision: Union[str, Sequence[str], None] = 'e91a3d6c2b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name'] for c in inspector.get_columns('background_jobs')}
+    if 'worker_id' not in columns:
+        op.add_column('background_jobs', sa.Column('worker_id', sa.String(length=100), nullable=True))
+    if 'heartbeat_at' not in columns:
+        op.add_column('background_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('background_jobs', 'heartbeat_at')
+    op.drop_column('background_jobs', 'worker_id')
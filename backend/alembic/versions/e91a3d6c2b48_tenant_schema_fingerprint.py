@@ -0,0 +1,30 @@
+"""tenant schema fingerprint
+
+Revision ID: e91a3d6c2b48
+Revises: b5e2c8a41f73
+Create Date: 2026-10-18 12:41:52.760334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91a3d6c2b48'
+down_revision: Union[str, Sequence[str], None] = 'b5e2c8a41f73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if 'fingerprint' not in {c['name'] for c in inspector.get_columns('tenant_schema_versions')}:
+        op.add_column('tenant_schema_versions', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tenant_schema_versions', 'fingerprint')
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Async Handler DB Access
+Fires a mix of slow and fast requests at async handlers concurrently, once with
+the query run inline on the event loop (the old pattern) and once through the
+DB thread pool (run_db / get_tenant_db_async). Reports throughput and fast
+request latency for each mode; inline mode serializes everything behind the
+slow queries.
+
+Without a tenant DB the queries are simulated with time.sleep, which blocks the
+same way a pymysql call does.
+
+Usage: python benchmarks/async_db_concurrency.py [tenant_db] [--requests 60] [--slow-ratio 0.2]
+                                                  [--slow-ms 300] [--interval-ms 5]
+"""
+
+import sys
+import os
+import time
+import asyncio
+import argparse
+import statistics
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from database import DB_EXECUTOR_WORKERS, open_tenant_session, run_db
+
+FAST_SECONDS = 0.005
+
+
+def make_query(tenant_db):
+    if tenant_db is None:
+        def query(seconds):
+            time.sleep(seconds)
+    else:
+        def query(seconds):
+            with open_tenant_session(tenant_db) as db:
+                db.execute(text("SELECT SLEEP(:s)"), {"s": seconds})
+    return query
+
+
+async def handler(query, seconds, offload, arrival):
+    if offload:
+        await run_db(query, seconds)
+    else:
+        query(seconds)
+    # measured from the scheduled arrival, so time queued behind a blocked loop counts
+    return time.perf_counter() - arrival
+
+
+async def run_mode(query, plan, offload, interval):
+    start = time.perf_counter()
+    tasks = []
+    for i, seconds in enumerate(plan):
+        arrival = start + i * interval
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(handler(query, seconds, offload, arrival)))
+    latencies = await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+    fast = [lat for lat, seconds in zip(latencies, plan) if seconds == FAST_SECONDS]
+    return wall, fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inline vs thread-pool DB access in async handlers")
+    parser.add_argument("tenant_db", nargs="?")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--slow-ratio", type=float, default=0.2)
+    parser.add_argument("--slow-ms", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=5, help="time between request arrivals")
+    args = parser.parse_args()
+
+    query = make_query(args.tenant_db)
+    every = max(1, round(1 / args.slow_ratio)) if args.slow_ratio > 0 else args.requests + 1
+    plan = [args.slow_ms / 1000 if i % every == 0 else FAST_SECONDS for i in range(args.requests)]
+    slow = sum(1 for s in plan if s != FAST_SECONDS)
+
+    print(f"{len(plan)} requests ({slow} slow at {args.slow_ms} ms), DB pool threads: {DB_EXECUTOR_WORKERS}, "
+          f"target: {args.tenant_db or 'simulated'}")
+    for label, offload in (("inline", False), ("thread pool", True)):
+        wall, fast = asyncio.run(run_mode(query, plan, offload, args.interval_ms / 1000))
+        fast.sort()
+        p95 = fast[int(len(fast) * 0.95) - 1] if fast else 0
+        print(f"{label:<12} {len(plan) / wall:8.1f} req/s  wall {wall * 1000:8.1f} ms  "
+              f"fast p50 {statistics.median(fast) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
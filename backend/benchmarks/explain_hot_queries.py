@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Query Plan Check: Attendance, Leave and Payroll Hot Queries
+Runs EXPLAIN for the hot lookups in validation, payslip, roster and punch log
+code on tenant databases and exits 1 when a query has no usable index
+(the expected index is missing from possible_keys). With --strict, a plan
+that still picks a full table scan (type=ALL) also fails; MySQL does that
+on tiny tables, so use --strict against realistically sized data.
+
+Usage: python benchmarks/explain_hot_queries.py [tenant_db ...] [--strict]
+"""
+
+import sys
+import os
+import argparse
+from datetime import date
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text, inspect
+
+from database import MasterSessionLocal, get_tenant_engine
+from models.models_master import Hospital
+
+MONTH_START = date(2025, 1, 1)
+MONTH_END = date(2025, 1, 31)
+
+# (label, table, expected indexes (any; only ones whose leading columns the WHERE fixes), sql, params)
+HOT_QUERIES = [
+    ("punch by employee/day", "attendance_punches", {"ix_attendance_punches_employee_date"},
+     "SELECT * FROM attendance_punches WHERE employee_id = :emp AND date = :day",
+     {"emp": 1, "day": MONTH_START}),
+    ("present days for month", "attendance_punches", {"ix_attendance_punches_date_status"},
+     "SELECT employee_id, COUNT(*) FROM attendance_punches WHERE date BETWEEN :start AND :end "
+     "AND status IN ('Present', 'Late') GROUP BY employee_id",
+     {"start": MONTH_START, "end": MONTH_END}),
+    ("roster by employee/day", "employee_roster", {"uq_employee_roster_employee_date"},
+     "SELECT * FROM employee_roster WHERE employee_id = :emp AND date = :day",
+     {"emp": 1, "day": MONTH_START}),
+    ("roster for date range", "employee_roster", {"ix_employee_roster_date"},
+     "SELECT * FROM employee_roster WHERE date BETWEEN :start AND :end",
+     {"start": MONTH_START, "end": MONTH_END}),
+    ("employee approved leave", "leave_applications", {"ix_leave_applications_employee_status_dates"},
+     "SELECT * FROM leave_applications WHERE employee_id = :emp AND status = 'Approved' "
+     "AND from_date <= :end AND to_date >= :start",
+     {"emp": 1, "start": MONTH_START, "end": MONTH_END}),
+    ("leave overlapping month", "leave_applications", {"ix_leave_applications_to_date"},
+     "SELECT * FROM leave_applications WHERE from_date <= :end AND to_date >= :start",
+     {"start": MONTH_START, "end": MONTH_END}),
+    ("employee OD for month", "od_applications", {"ix_od_applications_employee_date_status"},
+     "SELECT * FROM od_applications WHERE employee_id = :emp AND od_date BETWEEN :start AND :end AND status = 'pending'",
+     {"emp": 1, "start": MONTH_START, "end": MONTH_END}),
+    ("OD for month", "od_applications", {"ix_od_applications_od_date"},
+     "SELECT * FROM od_applications WHERE od_date BETWEEN :start AND :end",
+     {"start": MONTH_START, "end": MONTH_END}),
+    ("employee regularizations", "attendance_regularizations", {"ix_attendance_regularizations_employee_date_status"},
+     "SELECT * FROM attendance_regularizations WHERE employee_id = :emp AND punch_date BETWEEN :start AND :end "
+     "AND status = 'Pending'",
+     {"emp": 1, "start": MONTH_START, "end": MONTH_END}),
+    ("regularizations for month", "attendance_regularizations", {"ix_attendance_regularizations_punch_date"},
+     "SELECT * FROM attendance_regularizations WHERE punch_date BETWEEN :start AND :end",
+     {"start": MONTH_START, "end": MONTH_END}),
+    ("payroll runs for month", "payroll_runs", {"ix_payroll_runs_month_year"},
+     "SELECT * FROM payroll_runs WHERE month = :month AND year = :year",
+     {"month": "January", "year": 2025}),
+]
+
+
+def check_tenant(tenant_db, strict):
+    engine = get_tenant_engine(tenant_db)
+    tables = set(inspect(engine).get_table_names())
+    failures = 0
+
+    with engine.connect() as conn:
+        for label, table, expected, sql, params in HOT_QUERIES:
+            if table not in tables:
+                print(f"  -    {label:<28} ({table} does not exist)")
+                continue
+            plan = [dict(row._mapping) for row in conn.execute(text(f"EXPLAIN {sql}"), params)]
+            row = next((p for p in plan if p.get("table") == table), plan[0])
+            possible = set((row.get("possible_keys") or "").split(","))
+            access = row.get("type")
+
+            if not expected & possible:
+                status, failed = "FAIL", True
+            elif access == "ALL":
+                status, failed = ("FAIL" if strict else "scan"), strict
+            else:
+                status, failed = "ok", False
+            failures += failed
+            print(f"  {status:<4} {label:<28} type={access} key={row.get('key')} rows={row.get('rows')}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN hot tenant queries and flag full scans")
+    parser.add_argument("tenants", nargs="*", help="tenant DB names (default: all hospitals)")
+    parser.add_argument("--strict", action="store_true", help="also fail plans that choose a full scan")
+    args = parser.parse_args()
+
+    tenants = args.tenants
+    if not tenants:
+        with MasterSessionLocal() as db:
+            tenants = [str(h.db_name) for h in db.query(Hospital).order_by(Hospital.id)]
+
+    failures = 0
+    for tenant_db in tenants:
+        print(f"Tenant {tenant_db}")
+        failures += check_tenant(tenant_db, args.strict)
+
+    if failures:
+        print(f"❌ {failures} hot queries without a usable index — run: alembic --name tenant upgrade head")
+        sys.exit(1)
+    print("✅ Every hot query has an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Role and User Listing
+Counts the SQL statements issued by the role and user list queries at several
+page sizes on a tenant database. The count must not grow with the number of
+rows returned; the script exits 1 if it does.
+
+Usage: python benchmarks/list_query_counts.py <tenant_db> [--sizes 1,10,100,500]
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+
+from database import get_tenant_engine, open_tenant_session
+from routes.roles import query_roles_page
+from routes.users import query_users_page
+
+
+def measure(func, tenant_db, limit):
+    engine = get_tenant_engine(tenant_db)
+    counter = {"queries": 0}
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    try:
+        with open_tenant_session(tenant_db) as db:
+            start = time.perf_counter()
+            rows = func(db, None, limit)
+            elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+    return len(rows), counter["queries"], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check role/user listing query counts")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--sizes", default="1,10,100,500")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    failed = False
+    for label, func in (("roles", query_roles_page), ("users", query_users_page)):
+        counts = set()
+        for size in sizes:
+            rows, queries, elapsed = measure(func, args.tenant_db, size)
+            # an empty page skips the follow-up query, so only compare non-empty pages
+            if rows:
+                counts.add(queries)
+            print(f"{label:<6} limit={size:>5}  rows={rows:>5}  queries={queries:>3}  {elapsed * 1000:8.1f} ms")
+        if len(counts) > 1:
+            print(f"❌ {label}: query count varies with page size {sorted(counts)}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Query counts are constant across page sizes")
+
+
+if __name__ == "__main__":
+    main()
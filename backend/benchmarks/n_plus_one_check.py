@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+Check: N+1 Queries in List Endpoints
+Seeds a tenant with marked rows for each list endpoint at 1x and 10x volume,
+calls the endpoint under the query tracker and compares statement counts. The
+count must not grow with the data and no statement shape may repeat
+N_PLUS_ONE_THRESHOLD times; the script exits 1 otherwise. Seeded rows are
+deleted afterwards.
+
+Usage: python benchmarks/n_plus_one_check.py <tenant_db> [--base 5] [--only goals,offers]
+"""
+
+import sys
+import os
+import argparse
+from datetime import date, time, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import open_tenant_session
+from models.models_tenant import (
+    User, PMSGoal, AssetAssignment, EmployeeInsurance, EmployeeExit,
+    Candidate, OfferLetter, BGV, OnboardingCandidate, OnCallDuty
+)
+from utils.metrics import track_queries
+from utils.nplusone import N_PLUS_ONE_THRESHOLD
+
+MARK = "nplusone-check"
+
+
+# ---------------------------------------------------------------------------
+# Seeding: every row carries MARK in one column so cleanup can find it
+# ---------------------------------------------------------------------------
+def seed_goals(db, user_ids, count):
+    db.add_all(PMSGoal(title=MARK, employee_id=user_ids[i % len(user_ids)]) for i in range(count))
+
+
+def seed_assets(db, user_ids, count):
+    db.add_all(
+        AssetAssignment(employee_id=user_ids[i % len(user_ids)], asset_type=MARK, asset_name=f"Asset {i}",
+                        issue_date=date.today(), status="Pending")
+        for i in range(count)
+    )
+
+
+def seed_insurance(db, user_ids, count):
+    db.add_all(
+        EmployeeInsurance(employee_id=user_ids[i % len(user_ids)], policy_type=MARK, coverage_amount=0,
+                          start_date=date.today(), expiry_date=date.today() + timedelta(days=365))
+        for i in range(count)
+    )
+
+
+def seed_resignations(db, user_ids, count):
+    db.add_all(
+        EmployeeExit(employee_id=user_ids[i % len(user_ids)], reason=MARK, resignation_date=date.today())
+        for i in range(count)
+    )
+
+
+def seed_candidates(db, count):
+    candidates = [Candidate(name=MARK) for _ in range(count)]
+    db.add_all(candidates)
+    db.flush()
+    return candidates
+
+
+def seed_offers(db, user_ids, count):
+    candidates = seed_candidates(db, count)
+    for i, candidate in enumerate(candidates):
+        db.add(OfferLetter(candidate_id=candidate.id, candidate_name=MARK, job_title="Staff", department="QA", ctc=0))
+        # alternate between a BGV record and an onboarding record per candidate
+        if i % 2:
+            db.add(BGV(candidate_id=candidate.id, agency_name=MARK, status="Pending"))
+        else:
+            db.add(OnboardingCandidate(application_id=candidate.id, candidate_name=MARK, job_title="Staff", department="QA"))
+
+
+def seed_onboarding(db, user_ids, count):
+    for candidate in seed_candidates(db, count):
+        db.add(OnboardingCandidate(application_id=candidate.id, candidate_name=MARK, job_title="Staff", department="QA"))
+
+
+def seed_on_call(db, user_ids, count):
+    db.add_all(
+        OnCallDuty(employee_id=user_ids[i % len(user_ids)], date=date.today(), from_time=time(20, 0),
+                   to_time=time(23, 0), remarks=MARK)
+        for i in range(count)
+    )
+
+
+def cleanup(db):
+    candidate_ids = [c.id for c in db.query(Candidate.id).filter(Candidate.name == MARK)]
+    db.query(BGV).filter(BGV.agency_name == MARK).delete(synchronize_session=False)
+    db.query(OfferLetter).filter(OfferLetter.candidate_name == MARK).delete(synchronize_session=False)
+    db.query(OnboardingCandidate).filter(OnboardingCandidate.candidate_name == MARK).delete(synchronize_session=False)
+    if candidate_ids:
+        db.query(Candidate).filter(Candidate.id.in_(candidate_ids)).delete(synchronize_session=False)
+    db.query(PMSGoal).filter(PMSGoal.title == MARK).delete(synchronize_session=False)
+    db.query(AssetAssignment).filter(AssetAssignment.asset_type == MARK).delete(synchronize_session=False)
+    db.query(EmployeeInsurance).filter(EmployeeInsurance.policy_type == MARK).delete(synchronize_session=False)
+    db.query(EmployeeExit).filter(EmployeeExit.reason == MARK).delete(synchronize_session=False)
+    db.query(OnCallDuty).filter(OnCallDuty.remarks == MARK).delete(synchronize_session=False)
+    db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Endpoints under test
+# ---------------------------------------------------------------------------
+def endpoints(tenant_db):
+    from routes.pms.goals import _get_goals
+    from routes.hr.assets import _get_pending_assets
+    from routes.hr.insurance import _get_insurance_policies
+    from routes.EIS.resignation_tracking import list_resignations
+    from routes.recruitment.offer import list_offers
+    from routes.recruitment.onboarding import list_onboarded_employees
+    from routes.attendance.roster import get_on_call_duties
+
+    user = {"tenant_db": tenant_db, "email": "system"}
+    return {
+        "goals": (seed_goals, _get_goals),
+        "pending_assets": (seed_assets, _get_pending_assets),
+        "insurance": (seed_insurance, _get_insurance_policies),
+        "resignations": (seed_resignations, lambda db: list_resignations(user=user, db=db)),
+        "offers": (seed_offers, list_offers),
+        "onboarded": (seed_onboarding, list_onboarded_employees),
+        "on_call": (seed_on_call, lambda db: get_on_call_duties(date=None, department_id=None, user=user, db=db)),
+    }
+
+
+def measure(tenant_db, call):
+    with open_tenant_session(tenant_db) as db:
+        with track_queries() as stats:
+            call(db)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check list endpoints for N+1 queries")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--base", type=int, default=5, help="rows seeded at 1x")
+    parser.add_argument("--only", help="comma-separated endpoint names")
+    args = parser.parse_args()
+
+    targets = endpoints(args.tenant_db)
+    if args.only:
+        targets = {name: targets[name] for name in args.only.split(",")}
+
+    with open_tenant_session(args.tenant_db) as db:
+        user_ids = [u.id for u in db.query(User.id).order_by(User.id).limit(args.base * 10)]
+    if not user_ids:
+        print("❌ Tenant has no users to attach seeded rows to")
+        sys.exit(1)
+
+    failed = False
+    for name, (seed, call) in targets.items():
+        counts = []
+        try:
+            for scale in (1, 10):
+                with open_tenant_session(args.tenant_db) as db:
+                    cleanup(db)
+                    seed(db, user_ids, args.base * scale)
+                    db.commit()
+                stats = measure(args.tenant_db, call)
+                counts.append(stats.query_count)
+                repeated = stats.shapes.repeated()
+        finally:
+            with open_tenant_session(args.tenant_db) as db:
+                cleanup(db)
+
+        ok = counts[0] == counts[1] and not repeated
+        failed = failed or not ok
+        print(f"{'✅' if ok else '❌'} {name:<15} queries 1x={counts[0]:>3}  10x={counts[1]:>3}")
+        for shape, count in repeated.items():
+            print(f"     {count}x (threshold {N_PLUS_ONE_THRESHOLD}): {shape[:200]}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
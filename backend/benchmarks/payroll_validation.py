@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Payroll Validation
+Compares the per-employee, per-day validation queries with the set-based
+validation engine on a tenant database and checks both return the same issues.
+
+Usage: python benchmarks/payroll_validation.py <tenant_db> <month> <year> [--repeat N]
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+
+from database import get_tenant_engine, open_tenant_session
+from routes.payroll.validation import (
+    check_pending_leaves,
+    check_missing_attendance,
+    check_pending_od_approvals,
+    check_pending_regularization,
+)
+from routes.payroll.validation_engine import LINKED_EMPLOYEES_QUERY, compute_validation_issues
+
+
+def legacy_validation_issues(db, month, year):
+    """Per-employee path that validate_payroll_readiness used before the engine"""
+    issues = []
+    for emp in db.execute(LINKED_EMPLOYEES_QUERY).fetchall():
+        emp_issues = []
+        emp_issues.extend(check_pending_leaves(db, emp.id, month, year))
+        emp_issues.extend(check_missing_attendance(db, emp.id, emp.employee_code, month, year))
+        emp_issues.extend(check_pending_od_approvals(db, emp.id, month, year))
+        emp_issues.extend(check_pending_regularization(db, emp.id, month, year))
+        for issue in emp_issues:
+            issue.update({
+                'employee_id': emp.employee_code or str(emp.id),
+                'employee_name': emp.name
+            })
+            issues.append(issue)
+    return issues
+
+
+def run(label, func, tenant_db, month, year, repeat):
+    engine = get_tenant_engine(tenant_db)
+    counter = {"queries": 0}
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    timings = []
+    result = None
+    try:
+        for _ in range(repeat):
+            db = open_tenant_session(tenant_db)
+            try:
+                start = time.perf_counter()
+                result = func(db, month, year)
+                timings.append(time.perf_counter() - start)
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_query)
+
+    best = min(timings)
+    print(f"{label:<12} best={best * 1000:9.1f} ms  queries/run={counter['queries'] // repeat:>7}  issues={len(result)}")
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark payroll validation paths")
+    parser.add_argument("tenant_db")
+    parser.add_argument("month", type=int)
+    parser.add_argument("year", type=int)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with get_tenant_engine(args.tenant_db).connect() as conn:
+        employees = conn.execute(LINKED_EMPLOYEES_QUERY).fetchall()
+    print(f"Tenant {args.tenant_db}: {len(employees)} employees linked to salary structures, {args.month:02d}/{args.year}")
+
+    legacy, legacy_time = run("legacy", legacy_validation_issues, args.tenant_db, args.month, args.year, args.repeat)
+    engine, engine_time = run("set-based", compute_validation_issues, args.tenant_db, args.month, args.year, args.repeat)
+
+    if legacy != engine:
+        print("❌ Issue lists differ between legacy and set-based validation")
+        sys.exit(1)
+    print(f"✅ Identical issue lists, speedup x{legacy_time / engine_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
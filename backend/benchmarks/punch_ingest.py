@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Bulk Punch Ingestion
+Generates a device sync batch (IN and OUT events, plus repeated punches) for
+employees of a tenant and loads it once through the one-punch-at-a-time path
+used by POST /attendance/punches/ and once through the bulk ingestion used by
+POST /attendance/punches/bulk. Reports time and SQL statement count for each
+and checks both store the same in/out times and statuses. Punches are written
+on days past the latest stored punch and deleted afterwards.
+
+Usage: python benchmarks/punch_ingest.py <tenant_db> [--employees 1000] [--days 2] [--repeat-ratio 0.1]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func
+
+from database import open_tenant_session
+from models.models_tenant import AttendancePunch, User
+from routes.attendance.punch_ingest import ingest_punches
+from routes.attendance.punch_logs import calculate_attendance_status
+from utils.attendance_summary import refresh_attendance_summary
+from utils.metrics import track_queries
+
+MARK = "punch-ingest-benchmark"
+
+
+def make_batch(employee_ids, first_day, days, repeat_ratio, rng):
+    rows = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        for employee_id in employee_ids:
+            check_in = datetime.combine(day, datetime.min.time()) + timedelta(minutes=8 * 60 + rng.randint(30, 90))
+            check_out = check_in + timedelta(hours=9, minutes=rng.randint(-60, 30))
+            for moment in (check_in, check_out):
+                row = {"employee_id": employee_id, "punch_time": moment.isoformat(), "location": MARK}
+                rows.append(row)
+                # devices resend punches when a sync is retried
+                if rng.random() < repeat_ratio:
+                    rows.append(dict(row))
+    rng.shuffle(rows)
+    return rows
+
+
+def legacy_load(db, rows):
+    """What the device sync costs through the single-punch endpoint: status, summary and commit per punch"""
+    punches = {}
+    for row in sorted(rows, key=lambda r: r["punch_time"]):
+        moment = datetime.fromisoformat(row["punch_time"])
+        key = (row["employee_id"], moment.date())
+        punch = punches.get(key)
+        if punch is None:
+            punch = AttendancePunch(employee_id=key[0], date=key[1], in_time=moment.time(), location=MARK,
+                                    source="BIOMETRIC")
+            db.add(punch)
+            punches[key] = punch
+        elif moment.time() > punch.in_time:
+            punch.out_time = moment.time()
+        punch.status = calculate_attendance_status(key[0], str(key[1]), punch.in_time, punch.out_time, db)
+        db.flush()
+        refresh_attendance_summary(db, [key])
+        db.commit()
+
+
+def snapshot(db):
+    return {
+        (p.employee_id, p.date): (p.in_time, p.out_time, p.status)
+        for p in db.query(AttendancePunch).filter(AttendancePunch.location == MARK)
+    }
+
+
+def cleanup(db):
+    keys = db.query(AttendancePunch.employee_id, AttendancePunch.date).filter(AttendancePunch.location == MARK).all()
+    db.query(AttendancePunch).filter(AttendancePunch.location == MARK).delete(synchronize_session=False)
+    refresh_attendance_summary(db, keys)
+    db.commit()
+
+
+def run(label, tenant_db, load, rows):
+    with open_tenant_session(tenant_db) as db:
+        cleanup(db)
+        with track_queries(track_shapes=False) as stats:
+            start = time.perf_counter()
+            load(db, rows)
+            elapsed = time.perf_counter() - start
+        stored = snapshot(db)
+        cleanup(db)
+    print(f"{label:<8} {len(rows):>7} punches  {elapsed * 1000:10.1f} ms  {stats.query_count:>7} queries")
+    return stored
+
+
+def bulk_load(db, rows):
+    ingest_punches(db, rows)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-punch and bulk punch ingestion")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--repeat-ratio", type=float, default=0.1, help="share of punches sent twice")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with open_tenant_session(args.tenant_db) as db:
+        employee_ids = [u.id for u in db.query(User.id).order_by(User.id).limit(args.employees)]
+        last_day = db.query(func.max(AttendancePunch.date)).scalar()
+    if not employee_ids or last_day is None:
+        print("❌ Tenant needs employees and punches; run generate_tenant_data.py first")
+        sys.exit(1)
+
+    rows = make_batch(employee_ids, last_day + timedelta(days=1), args.days, args.repeat_ratio,
+                      random.Random(args.seed))
+    legacy = run("legacy", args.tenant_db, legacy_load, rows)
+    bulk = run("bulk", args.tenant_db, bulk_load, rows)
+
+    if legacy != bulk:
+        mismatched = [key for key in legacy.keys() | bulk.keys() if legacy.get(key) != bulk.get(key)]
+        print(f"❌ {len(mismatched)} punch records differ, e.g. {mismatched[:3]}")
+        sys.exit(1)
+    print(f"✅ Both paths stored the same {len(bulk)} punch records")
+
+
+if __name__ == "__main__":
+    main()
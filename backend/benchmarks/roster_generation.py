@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Roster Generation
+Writes a 4-on/2-off rotation for employees of a tenant over a window past the
+latest rostered day, then copies its first week onto the following week twice:
+once with the row-by-row loop copy-last-week used to run and once with the
+set-based copy. Reports time and SQL statement count for each, checks both
+copies wrote the same rows, and deletes everything it wrote.
+
+Usage: python benchmarks/roster_generation.py <tenant_db> [--employees 2000] [--days 90]
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func
+
+from database import open_tenant_session
+from models.models_tenant import EmployeeRoster, Shift, User
+from routes.attendance.roster_engine import clear_roster, copy_roster, expand_blocks, generate_rotation
+from utils.metrics import track_queries
+
+
+def legacy_copy(db, source_start, target_start):
+    """copy-last-week before the engine: one existence check per source row"""
+    for entry in db.query(EmployeeRoster).filter(
+        EmployeeRoster.date >= source_start,
+        EmployeeRoster.date <= source_start + timedelta(days=6)
+    ).all():
+        new_date = entry.date + (target_start - source_start)
+        existing = db.query(EmployeeRoster).filter(
+            EmployeeRoster.employee_id == entry.employee_id,
+            EmployeeRoster.date == new_date
+        ).first()
+        if not existing:
+            db.add(EmployeeRoster(employee_id=entry.employee_id, shift_id=entry.shift_id, date=new_date,
+                                  status=entry.status))
+
+
+def snapshot(db, start, end):
+    return {
+        (r.employee_id, r.date): (r.shift_id, r.status)
+        for r in db.query(EmployeeRoster).filter(EmployeeRoster.date.between(start, end))
+    }
+
+
+def timed(label, db, action):
+    with track_queries(track_shapes=False) as stats:
+        start = time.perf_counter()
+        rows = action()
+        db.commit()
+        elapsed = time.perf_counter() - start
+    suffix = f"  {rows:>8} rows" if rows is not None else ""
+    print(f"{label:<14} {elapsed * 1000:10.1f} ms  {stats.query_count:>7} queries{suffix}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rotation generation and roster copies")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=90)
+    args = parser.parse_args()
+
+    with open_tenant_session(args.tenant_db) as db:
+        employee_ids = [u.id for u in db.query(User.id).order_by(User.id).limit(args.employees)]
+        shift_ids = [s.id for s in db.query(Shift.id).order_by(Shift.id).limit(2)]
+        last_day = db.query(func.max(EmployeeRoster.date)).scalar()
+        if not employee_ids or not shift_ids or last_day is None:
+            print("❌ Tenant needs employees, shifts and a roster; run generate_tenant_data.py first")
+            sys.exit(1)
+
+        # rotation window, then the week after it as the copy target
+        start = last_day + timedelta(days=1)
+        end = start + timedelta(days=args.days - 1)
+        target = end + timedelta(days=1)
+        target_end = target + timedelta(days=6)
+        pattern = expand_blocks([(shift_ids[0], 4), (None, 2)])
+
+        try:
+            timed("rotation", db, lambda: generate_rotation(db, pattern, employee_ids, start, end, stagger_days=1))
+            timed("legacy copy", db, lambda: legacy_copy(db, start, target))
+            legacy = snapshot(db, target, target_end)
+            clear_roster(db, target, target_end)
+            db.commit()
+            timed("set-based copy", db, lambda: copy_roster(db, start, start + timedelta(days=6), target))
+            engine = snapshot(db, target, target_end)
+        finally:
+            clear_roster(db, start, target_end)
+            db.commit()
+
+    if legacy != engine:
+        mismatched = [key for key in legacy.keys() | engine.keys() if legacy.get(key) != engine.get(key)]
+        print(f"❌ {len(mismatched)} copied roster days differ, e.g. {mismatched[:3]}")
+        sys.exit(1)
+    print(f"✅ Both copies wrote the same {len(engine)} roster days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Roster Schedule
+Builds GET /roster/schedule for a date range the way it used to (a scan of all
+roster rows per employee) and through the single-pass grid in both the full
+and compact formats. Reports time, SQL statement count and JSON payload size,
+and checks the full format matches the old output.
+
+Usage: python benchmarks/roster_schedule.py <tenant_db> [--days 31] [--end YYYY-MM-DD] [--department ID] [--repeat 3]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func
+
+from database import open_tenant_session
+from models.models_tenant import EmployeeRoster, Shift, User
+from routes.attendance.roster import get_roster_schedule
+from utils.metrics import track_queries
+
+
+def legacy_schedule(db, start_date, end_date, department=None):
+    """get_roster_schedule before the grid: employees x roster rows"""
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+    roster_data = db.query(EmployeeRoster).filter(
+        EmployeeRoster.date >= start_dt,
+        EmployeeRoster.date <= end_dt
+    ).all()
+    employee_ids = list(set([r.employee_id for r in roster_data]))
+    if employee_ids:
+        emp_query = db.query(User).filter(User.id.in_(employee_ids))
+        if department:
+            emp_query = emp_query.filter(User.department_id == int(department))
+        employees = emp_query.all()
+    else:
+        employees = []
+    shift_map = {shift.id: shift for shift in db.query(Shift).all()}
+
+    result = []
+    for emp in employees:
+        emp_roster = [r for r in roster_data if r.employee_id == emp.id]
+        roster_dict = {r.date.strftime("%Y-%m-%d"): r for r in emp_roster}
+        current_date = start_dt
+        schedule = []
+        while current_date <= end_dt:
+            date_str = current_date.strftime("%Y-%m-%d")
+            roster_entry = roster_dict.get(date_str)
+            if roster_entry:
+                shift_info = shift_map.get(roster_entry.shift_id)
+                schedule.append({
+                    "date": date_str,
+                    "shift_id": roster_entry.shift_id,
+                    "shift_name": shift_info.name if shift_info else "Unknown",
+                    "status": roster_entry.status
+                })
+            else:
+                schedule.append({"date": date_str, "shift_id": None, "shift_name": "Not Assigned",
+                                 "status": "Unscheduled"})
+            current_date += timedelta(days=1)
+        result.append({
+            "employee_id": emp.id,
+            "employee_name": emp.name,
+            "department": emp.department.name if emp.department else "Unknown",
+            "schedule": schedule
+        })
+    return {"roster": result}
+
+
+def run(label, tenant_db, build, repeat):
+    timings = []
+    for _ in range(repeat):
+        db = open_tenant_session(tenant_db)
+        try:
+            with track_queries(track_shapes=False) as stats:
+                start = time.perf_counter()
+                payload = build(db)
+                timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+    size = len(json.dumps(payload, default=str))
+    print(f"{label:<8} best={min(timings) * 1000:9.1f} ms  queries={stats.query_count:>6}  "
+          f"payload={size / 1024:9.1f} KiB")
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark roster schedule building")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--end", help="last day, YYYY-MM-DD (default: latest rostered day)")
+    parser.add_argument("--department", help="department id")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    end = args.end
+    if end is None:
+        with open_tenant_session(args.tenant_db) as db:
+            last_day = db.query(func.max(EmployeeRoster.date)).scalar()
+        if last_day is None:
+            print("❌ Tenant has no roster; run generate_tenant_data.py first")
+            sys.exit(1)
+        end = last_day.isoformat()
+    start = (datetime.strptime(end, "%Y-%m-%d").date() - timedelta(days=args.days - 1)).isoformat()
+    print(f"Roster schedule {start} .. {end}" + (f", department {args.department}" if args.department else ""))
+
+    legacy = run("legacy", args.tenant_db, lambda db: legacy_schedule(db, start, end, args.department), args.repeat)
+    full = run("full", args.tenant_db, lambda db: get_roster_schedule(
+        start, end, args.department, None, None, "full", user={}, db=db), args.repeat)
+    run("compact", args.tenant_db, lambda db: get_roster_schedule(
+        start, end, args.department, None, None, "compact", user={}, db=db), args.repeat)
+
+    expected = sorted(legacy["roster"], key=lambda e: e["employee_id"])
+    if expected != full["roster"]:
+        print("❌ Full format differs from the old schedule output")
+        sys.exit(1)
+    print(f"✅ Full format matches the old output for {len(expected)} employees")
+
+
+if __name__ == "__main__":
+    main()
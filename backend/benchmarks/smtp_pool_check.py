@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+"""
+Check: SMTP Connection Pool
+Runs SMTPConnectionPool against a local SMTP stand-in on a free port and checks
+that messages are sent over reused connections, that a refused recipient fails
+once without tearing down its connection, that a temporary SMTP error is
+retried on the same connection, and that a connection the server drops is
+re-opened and the message retried. Exits 1 on any failure.
+
+Usage: python benchmarks/smtp_pool_check.py [--messages 20] [--pool-size 2]
+"""
+
+import sys
+import os
+import argparse
+import socketserver
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.email import SMTPConnectionPool, build_message
+
+REFUSED = "refused@example.test"
+DROPPED = "dropped@example.test"
+DEFERRED = "deferred@example.test"
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.delivered = []
+        self.dropped_once = False
+        self.deferred_once = False
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 stand-in ready")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode(errors="replace").strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 stand-in")
+            elif command in ("MAIL", "RSET", "NOOP"):
+                recipients = [] if command != "NOOP" else recipients
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = line.split(":", 1)[1].strip(" <>")
+                if address == REFUSED:
+                    self.reply("550 No such user")
+                    continue
+                if address == DROPPED:
+                    with server.lock:
+                        first, server.dropped_once = not server.dropped_once, True
+                    if first:
+                        return  # close the socket mid-transaction
+                recipients.append(address)
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline().rstrip(b"\r\n") != b".":
+                    pass
+                if DEFERRED in recipients:
+                    with server.lock:
+                        first, server.deferred_once = not server.deferred_once, True
+                    if first:
+                        self.reply("451 Try again later")
+                        continue
+                with server.lock:
+                    server.delivered.extend(recipients)
+                self.reply("250 Queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+def pool_for(server, size):
+    host, port = server.server_address
+    return SMTPConnectionPool(host=host, port=port, user=None, password=None, sender="payroll@example.test",
+                              use_tls=False, size=size, max_retries=1, timeout=5)
+
+
+def messages(addresses):
+    return [(i, build_message(address, "Payslip", "<p>check</p>")) for i, address in enumerate(addresses)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the SMTP connection pool against a local stand-in")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    server = StandInServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    failures = []
+
+    def check(label, ok, detail=""):
+        print(f"{'✅' if ok else '❌'} {label}{f': {detail}' if detail and not ok else ''}")
+        if not ok:
+            failures.append(label)
+
+    try:
+        addresses = [f"employee{i}@example.test" for i in range(args.messages)]
+        results = pool_for(server, args.pool_size).send_many(messages(addresses))
+        check("all messages sent", all(r["status"] == "sent" for r in results), results)
+        check("connections reused", server.connections <= args.pool_size,
+              f"{server.connections} connections for pool size {args.pool_size}")
+
+        before = server.connections
+        results = pool_for(server, 1).send_many(messages([REFUSED, "after-refused@example.test"]))
+        check("refused recipient fails without retry",
+              results[0]["status"] == "failed" and results[0]["attempts"] == 1, results[0])
+        check("connection kept after a refusal",
+              results[1]["status"] == "sent" and server.connections - before == 1,
+              f"{server.connections - before} connections opened")
+
+        before = server.connections
+        results = pool_for(server, 1).send_many(messages([DROPPED]))
+        check("dropped connection re-opened and retried",
+              results[0]["status"] == "sent" and results[0]["attempts"] == 2 and server.connections - before == 2,
+              f"{results[0]}, {server.connections - before} connections opened")
+
+        before = server.connections
+        results = pool_for(server, 1).send_many(messages([DEFERRED]))
+        check("temporary failure retried on the same connection",
+              results[0]["status"] == "sent" and results[0]["attempts"] == 2 and server.connections - before == 1,
+              f"{results[0]}, {server.connections - before} connections opened")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: Critical HRM Workflows
+Drives the FastAPI app in-process (ASGI test client) against a tenant seeded
+with generate_tenant_data.py and reports p50/p95 latency, throughput and SQL
+statement count (X-DB-Queries) per scenario. Results are written as JSON to
+benchmarks/results/<label>.json so runs can be diffed between commits; with
+--baseline the run is compared against an earlier result file and exits 1 if
+any scenario's p95 or query count regresses by more than --max-regression.
+
+Rows the scenarios create (punches, leave applications) are removed afterwards.
+
+Usage: python benchmarks/workflow_suite.py <tenant_db> [--iterations 20] [--warmup 2] [--concurrency 1]
+                                            [--only login,punch_create] [--label NAME]
+                                            [--baseline results/OLD.json] [--max-regression 20]
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import argparse
+import platform
+import subprocess
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+from database import MasterSessionLocal, open_tenant_session
+from models.models_master import Hospital
+from models.models_tenant import AttendancePunch, Department, JobRequisition, LeaveApplication, LeaveType, User
+from utils.attendance_summary import refresh_attendance_summary
+from utils.synthetic_data import CODE_PREFIX, MARK, PASSWORD
+from utils.token import create_access_token
+from utils.user_directory import upsert_user_entry
+
+BENCH_MARK = "workflow-benchmark"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+# ---------------------------------------------------------------------------
+# Fixture discovery: everything is looked up in the synthetic data set
+# ---------------------------------------------------------------------------
+def prepare(tenant_db):
+    with open_tenant_session(tenant_db) as db:
+        employees = db.query(User.id, User.email).filter(
+            User.employee_code.like(f"{CODE_PREFIX}-%")
+        ).order_by(User.id).limit(500).all()
+        if not employees:
+            print(f"❌ {tenant_db} has no synthetic employees; run generate_tenant_data.py first")
+            sys.exit(1)
+        last_day = db.query(AttendancePunch.date).filter(
+            AttendancePunch.employee_id.in_([e.id for e in employees])
+        ).order_by(AttendancePunch.date.desc()).limit(1).scalar()
+        leave_type_id = db.query(LeaveType.id).filter(LeaveType.code == f"{CODE_PREFIX}-CL").scalar()
+        job_id = db.query(JobRequisition.id).filter(JobRequisition.title.like(f"{MARK}%")).order_by(
+            JobRequisition.id
+        ).limit(1).scalar()
+        department = db.query(Department.name).filter(Department.name.like(f"%{MARK}")).order_by(
+            Department.id
+        ).limit(1).scalar()
+
+    # the login scenario signs in as the first synthetic employee
+    with MasterSessionLocal() as master:
+        hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
+        if not hospital:
+            print(f"❌ {tenant_db} is not a registered hospital")
+            sys.exit(1)
+        upsert_user_entry(master, hospital, employees[0].id, employees[0].email)
+
+    token = create_access_token({"email": "benchmark@synthetic.example", "role": "admin", "tenant_db": tenant_db})
+    return {
+        "tenant_db": tenant_db,
+        "headers": {"Authorization": f"Bearer {token}"},
+        "employees": employees,
+        "last_day": last_day,
+        "leave_type_id": leave_type_id,
+        "job_id": job_id,
+        "department": department,
+        "punch_ids": [],
+        "lock": threading.Lock(),
+    }
+
+
+def cleanup(tenant_db):
+    with open_tenant_session(tenant_db) as db:
+        keys = db.query(AttendancePunch.employee_id, AttendancePunch.date).filter(
+            AttendancePunch.location == BENCH_MARK
+        ).all()
+        db.query(AttendancePunch).filter(AttendancePunch.location == BENCH_MARK).delete(synchronize_session=False)
+        refresh_attendance_summary(db, keys)
+        db.query(LeaveApplication).filter(LeaveApplication.reason == BENCH_MARK).delete(synchronize_session=False)
+        db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Scenarios: (name, method, request builder(ctx, i) -> (path, request kwargs))
+# ---------------------------------------------------------------------------
+def punch_create(ctx, i):
+    employees = ctx["employees"]
+    # every call gets its own (employee, date) pair past the seeded range
+    day = ctx["last_day"] + timedelta(days=1 + i // len(employees))
+    return "/api/attendance/punches/", {"json": {
+        "employee_id": employees[i % len(employees)].id, "date": day.isoformat(),
+        "in_time": "09:04:00", "out_time": "18:10:00", "location": BENCH_MARK, "source": "WEB",
+    }}
+
+
+def punch_update(ctx, i):
+    punch_id, employee_id, day = ctx["punch_ids"][i % len(ctx["punch_ids"])]
+    return f"/api/attendance/punches/{punch_id}", {"json": {
+        "employee_id": employee_id, "date": day, "in_time": "09:20:00" if i % 2 else "09:02:00",
+        "out_time": "18:05:00", "location": BENCH_MARK, "source": "WEB",
+    }}
+
+
+def punch_bulk_ingest(ctx, i):
+    # one device sync per call: IN and OUT events for up to 200 employees on a fresh day
+    day = ctx["last_day"] + timedelta(days=30 + i)
+    punches = []
+    for employee in ctx["employees"][:200]:
+        for moment in ("08:57:00", "18:04:00"):
+            punches.append({"employee_id": employee.id, "punch_time": f"{day.isoformat()}T{moment}",
+                            "location": BENCH_MARK})
+    return "/api/attendance/punches/bulk", {"json": punches}
+
+
+def leave_apply(ctx, i):
+    employees = ctx["employees"]
+    day = ctx["last_day"] + timedelta(days=60 + i // len(employees))
+    return "/api/leave/applications/", {
+        "params": {"employee_id": employees[i % len(employees)].id},
+        "json": {"leave_type_id": ctx["leave_type_id"], "from_date": day.isoformat(), "to_date": day.isoformat(),
+                 "total_days": 1, "reason": BENCH_MARK},
+    }
+
+
+def month_path(template):
+    return lambda ctx, i: (template.format(month=ctx["last_day"].month, year=ctx["last_day"].year), {})
+
+
+def roster_schedule(ctx, i):
+    end = ctx["last_day"]
+    return "/api/roster/schedule", {"params": {
+        "start_date": (end - timedelta(days=6)).isoformat(), "end_date": end.isoformat(),
+    }}
+
+
+def roster_schedule_department(ctx, i):
+    path, kwargs = roster_schedule(ctx, i)
+    kwargs["params"]["department"] = ctx["department"]
+    return path, kwargs
+
+
+def roster_schedule_compact(ctx, i):
+    path, kwargs = roster_schedule(ctx, i)
+    kwargs["params"]["format"] = "compact"
+    return path, kwargs
+
+
+def daily_report(ctx, i):
+    end = ctx["last_day"]
+    return "/api/attendance/reports/daily", {"params": {
+        "start_date": (end - timedelta(days=6)).isoformat(), "end_date": end.isoformat(),
+    }}
+
+
+def static(path):
+    return lambda ctx, i: (path.format(**ctx), {})
+
+
+SCENARIOS = [
+    ("login", "POST", lambda ctx, i: ("/auth/login", {"json": {"email": ctx["employees"][0].email,
+                                                              "password": PASSWORD}})),
+    ("punch_create", "POST", punch_create),
+    ("punch_update", "PUT", punch_update),
+    ("punch_bulk_ingest", "POST", punch_bulk_ingest),
+    ("leave_apply", "POST", leave_apply),
+    ("payroll_validation", "POST", month_path("/api/payroll/validation/check/{month}/{year}")),
+    ("payroll_summary", "GET", static("/api/payroll/reports/summary")),
+    ("payroll_summary_pdf", "GET", static("/api/payroll/reports/payroll-summary/pdf")),
+    ("attendance_payroll_pdf", "GET", static("/api/payroll/reports/attendance-payroll/pdf")),
+    ("department_payroll_pdf", "GET", static("/api/payroll/reports/department-wise/pdf")),
+    ("attendance_daily_report", "GET", daily_report),
+    ("roster_schedule", "GET", roster_schedule),
+    ("roster_schedule_department", "GET", roster_schedule_department),
+    ("roster_schedule_compact", "GET", roster_schedule_compact),
+    ("ats_filter", "POST", lambda ctx, i: ("/recruitment/ats/filter", {"json": {"job_id": ctx["job_id"]}})),
+    ("list_users", "GET", static("/hospitals/users/{tenant_db}/list")),
+    ("list_roles", "GET", static("/hospitals/roles/{tenant_db}/list")),
+    ("list_punches", "GET", static("/api/attendance/punches/")),
+    ("list_leave_applications", "GET", static("/api/leave/applications/")),
+    ("list_goals", "GET", static("/api/pms/goals")),
+    ("list_pending_assets", "GET", static("/hr/assets/pending")),
+    ("list_insurance", "GET", static("/hr/insurance/")),
+    ("list_resignations", "GET", static("/api/resignation/list")),
+    ("list_offers", "GET", static("/recruitment/offer/list")),
+    ("list_onboarded", "GET", static("/recruitment/onboarding/list")),
+    ("list_on_call", "GET", static("/api/roster/on-call")),
+]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    # nearest-rank
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_scenario(client, ctx, name, method, build, iterations, warmup, concurrency):
+    counter = {"next": 0}
+
+    def call(_):
+        with ctx["lock"]:
+            i = counter["next"]
+            counter["next"] += 1
+        path, kwargs = build(ctx, i)
+        start = time.perf_counter()
+        response = client.request(method, path, headers=ctx["headers"], **kwargs)
+        elapsed = time.perf_counter() - start
+        if name == "punch_create" and response.status_code == 200:
+            body = response.json()
+            with ctx["lock"]:
+                ctx["punch_ids"].append((body["id"], body["employee_id"], body["date"]))
+        return elapsed, int(response.headers.get("x-db-queries", 0)), response.status_code
+
+    for i in range(warmup):
+        call(i)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(call, range(iterations)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [s[0] * 1000 for s in samples]
+    queries = [s[1] for s in samples]
+    errors = {}
+    for _, _, status in samples:
+        if status >= 400:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+    return {
+        "method": method,
+        "requests": len(samples),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "max_ms": round(max(latencies), 2),
+        "throughput_rps": round(len(samples) / wall, 2) if wall else None,
+        "queries_p50": percentile(queries, 50),
+        "queries_max": max(queries),
+        "errors": errors,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path, max_regression):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nAgainst {baseline_path} ({baseline['meta'].get('commit')}):")
+
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            continue
+        changes = []
+        for key in ("p95_ms", "queries_max"):
+            old, new = previous[key], current[key]
+            change = (new - old) / old * 100 if old else (100.0 if new else 0.0)
+            changes.append(f"{key} {old} → {new} ({change:+.0f}%)")
+            # ignore sub-millisecond jitter on very fast endpoints
+            if max_regression is not None and change > max_regression and not (key == "p95_ms" and new - old < 1):
+                regressions.append(f"{name} {key}")
+        print(f"   {name:<28} " + "  ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark critical HRM workflows in-process")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--iterations", type=int, default=20, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per scenario")
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--label", help="result file name (default: current commit)")
+    parser.add_argument("--baseline", help="earlier result JSON to compare against")
+    parser.add_argument("--max-regression", type=float, help="fail if p95/query count grows more than this %%")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.only:
+        wanted = set(args.only.split(","))
+        scenarios = [s for s in SCENARIOS if s[0] in wanted]
+
+    from main import app
+
+    # no context manager: startup hooks (tenant bootstrap) stay out of the measurements
+    client = TestClient(app, raise_server_exceptions=False)
+    ctx = prepare(args.tenant_db)
+    commit = git_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "tenant_db": args.tenant_db,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+
+    failed = False
+    try:
+        print(f"{'scenario':<28} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>8} {'queries':>8}  errors")
+        for name, method, build in scenarios:
+            if name == "punch_update" and not ctx["punch_ids"]:
+                print(f"⚠️  {name}: skipped, needs punch_create to run first")
+                continue
+            stats = run_scenario(client, ctx, name, method, build, args.iterations, args.warmup, args.concurrency)
+            results["scenarios"][name] = stats
+            failed = failed or bool(stats["errors"])
+            print(f"{'❌' if stats['errors'] else '✅'} {name:<26} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                  f"{stats['throughput_rps']:>8} {stats['queries_p50']:>8}  {stats['errors'] or ''}")
+    finally:
+        cleanup(args.tenant_db)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{args.label or commit}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"\nResults written to {path}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        if regressions:
+            print(f"❌ Regressed over {args.max_regression}%: {', '.join(regressions)}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
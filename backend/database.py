@@ -1,12 +1,20 @@
 # database.py
 import os
+import asyncio
+import contextvars
+import functools
+import threading
 import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator
 from fastapi import Header
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import logging
 
+from utils.metrics import instrument_engine
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
@@ -32,6 +40,7 @@ master_engine = create_engine(
     pool_pre_ping=True,
     future=True
 )
+instrument_engine(master_engine)
 
 MasterSessionLocal = sessionmaker(bind=master_engine, autoflush=False, autocommit=False)
 
@@ -65,17 +74,93 @@ def create_tenant_database(db_name: str):
     seed_tenant(db_name)
 
 
-# TENANT ENGINE
-def get_tenant_engine(db_name: str):
-    url = (
+# TENANT ENGINE REGISTRY
+# One pooled engine per tenant DB, created lazily and reused across requests.
+TENANT_POOL_SIZE = int(os.getenv("TENANT_POOL_SIZE", 5))
+TENANT_MAX_OVERFLOW = int(os.getenv("TENANT_MAX_OVERFLOW", 10))
+TENANT_POOL_RECYCLE = int(os.getenv("TENANT_POOL_RECYCLE", 1800))
+TENANT_POOL_TIMEOUT = int(os.getenv("TENANT_POOL_TIMEOUT", 30))
+TENANT_ENGINE_CACHE_SIZE = int(os.getenv("TENANT_ENGINE_CACHE_SIZE", 50))
+
+
+def tenant_database_url(db_name: str) -> str:
+    return (
         f"mysql+pymysql://{DB_USER}:{urllib.parse.quote_plus(DB_PASSWORD)}"
         f"@{DB_HOST}:{DB_PORT}/{db_name}"
     )
-    return create_engine(url, pool_pre_ping=True, future=True)
 
 
-# TENANT DB SESSION (for dependency injection)
-def get_tenant_db(Authorization: str = Header(None)) -> Generator:
+class TenantEngineRegistry:
+    """Process-wide cache of tenant engines with an LRU cap on idle tenants"""
+
+    def __init__(self, max_engines: int = TENANT_ENGINE_CACHE_SIZE):
+        self.max_engines = max_engines
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_engine(self, db_name: str):
+        with self._lock:
+            engine = self._engines.get(db_name)
+            if engine is not None:
+                self._engines.move_to_end(db_name)
+                return engine
+
+            logger.info(f"Creating pooled engine for tenant DB: {db_name}")
+            engine = create_engine(
+                tenant_database_url(db_name),
+                pool_pre_ping=True,
+                pool_size=TENANT_POOL_SIZE,
+                max_overflow=TENANT_MAX_OVERFLOW,
+                pool_recycle=TENANT_POOL_RECYCLE,
+                pool_timeout=TENANT_POOL_TIMEOUT,
+                future=True
+            )
+            instrument_engine(engine)
+            self._engines[db_name] = engine
+            self._evict_idle()
+            return engine
+
+    def _evict_idle(self):
+        # Walk from least to most recently used and drop engines with nothing checked out
+        if len(self._engines) <= self.max_engines:
+            return
+        for db_name in list(self._engines.keys()):
+            if len(self._engines) <= self.max_engines:
+                break
+            engine = self._engines[db_name]
+            checked_out = getattr(engine.pool, "checkedout", lambda: 0)()
+            if checked_out:
+                continue
+            logger.info(f"Evicting idle tenant engine: {db_name}")
+            del self._engines[db_name]
+            engine.dispose()
+
+    def dispose(self, db_name: str | None = None):
+        with self._lock:
+            names = [db_name] if db_name else list(self._engines.keys())
+            for name in names:
+                engine = self._engines.pop(name, None)
+                if engine is not None:
+                    engine.dispose()
+
+
+tenant_engines = TenantEngineRegistry()
+
+
+def get_tenant_engine(db_name: str):
+    return tenant_engines.get_engine(db_name)
+
+
+def open_tenant_session(db_name: str, **kwargs) -> Session:
+    """Open a session on the pooled engine for a tenant DB, provisioning it on first use"""
+    from utils.tenant_bootstrap import ensure_tenant_ready
+
+    ensure_tenant_ready(db_name)
+    return Session(bind=get_tenant_engine(db_name), **kwargs)
+
+
+def resolve_tenant_db_name(Authorization: str | None) -> str:
+    """Tenant DB named in the bearer token, or DEFAULT_TENANT_DB"""
     from utils.token import verify_token
     
     # Try to get tenant DB from Authorization header
@@ -95,11 +180,55 @@ def get_tenant_db(Authorization: str = Header(None)) -> Generator:
             logger.warning(f"Error parsing Authorization header, using default tenant DB: {tenant_db_name}. Error: {str(e)}")
     else:
         logger.info(f"No Authorization header provided, using default tenant DB: {tenant_db_name}")
-    
-    engine = get_tenant_engine(tenant_db_name)
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-    db = SessionLocal()
+
+    return tenant_db_name
+
+
+# TENANT DB SESSION (for dependency injection)
+def get_tenant_db(Authorization: str = Header(None)) -> Generator:
+    db = open_tenant_session(resolve_tenant_db_name(Authorization), autoflush=False)
     try:
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------------------------
+# Async access: blocking SQLAlchemy work runs on a dedicated thread pool so
+# async handlers never block the event loop on a query.
+# ---------------------------------------------------------------------------
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", TENANT_POOL_SIZE + TENANT_MAX_OVERFLOW))
+
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking DB call on the DB thread pool and await its result"""
+    loop = asyncio.get_running_loop()
+    # carry context vars (per-request SQL stats) into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(db_executor, context.run, functools.partial(fn, *args, **kwargs))
+
+
+class AsyncTenantSession:
+    """Tenant session for async handlers; all work on it goes through run()"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run(self, fn, *args, **kwargs):
+        """Call fn(session, *args, **kwargs) on the DB thread pool"""
+        return await run_db(fn, self.session, *args, **kwargs)
+
+    async def close(self):
+        await run_db(self.session.close)
+
+
+async def get_tenant_db_async(Authorization: str = Header(None)):
+    tenant_db_name = resolve_tenant_db_name(Authorization)
+    session = await run_db(open_tenant_session, tenant_db_name, autoflush=False)
+    db = AsyncTenantSession(session)
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+Maintenance Script: Generate Synthetic Tenant Data
+Populates a tenant database with deterministic, realistic-looking HR data
+(employees, rosters, punches, leave/OD, regularizations, salaries, payroll,
+candidates and goals) for load testing. The same arguments always produce
+the same rows; previously generated rows are removed first.
+
+Usage: python generate_tenant_data.py <tenant_db> [--employees 200] [--months 3] [--seed 42] [--reset-only]
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.synthetic_data import (
+    DEFAULT_UNTIL, GeneratorConfig, generate_tenant_data, reset_synthetic_data
+)
+from database import MasterSessionLocal, open_tenant_session
+from models.models_master import Hospital
+from utils.user_directory import rebuild_tenant_entries
+
+
+def reindex_users(tenant_db: str) -> int:
+    """Login finds a tenant only through the user directory, so it follows every bulk write of users"""
+    with MasterSessionLocal() as master:
+        hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
+        return rebuild_tenant_entries(master, hospital) if hospital is not None else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic data in a tenant database")
+    parser.add_argument("tenant_db")
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--months", type=int, default=3, help="months of rosters/punches/payroll")
+    parser.add_argument("--departments", type=int, default=8)
+    parser.add_argument("--grades", type=int, default=5)
+    parser.add_argument("--candidates", type=int, help="default: employees / 2")
+    parser.add_argument("--goals-per-employee", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--until", type=date.fromisoformat, default=DEFAULT_UNTIL,
+                        help="last generated day, YYYY-MM-DD")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT")
+    parser.add_argument("--reset-only", action="store_true", help="remove generated rows and exit")
+    args = parser.parse_args()
+
+    if args.reset_only:
+        with open_tenant_session(args.tenant_db) as db:
+            removed = reset_synthetic_data(db, args.batch_size)
+        reindex_users(args.tenant_db)
+        print(f"✅ Removed {removed} synthetic employees and their data from {args.tenant_db}")
+        return
+
+    config = GeneratorConfig(
+        employees=args.employees, months=args.months, departments=args.departments, grades=args.grades,
+        candidates=args.candidates, goals_per_employee=args.goals_per_employee, seed=args.seed,
+        until=args.until, batch_size=args.batch_size
+    )
+
+    start = time.perf_counter()
+    counts = generate_tenant_data(args.tenant_db, config, progress=print)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ {args.tenant_db}: {config.start} → {config.until}, seed {config.seed}")
+    for table, count in counts.items():
+        print(f"   {table:<28} {count:>10}")
+    print(f"   {'total':<28} {sum(counts.values()):>10}  ({elapsed:.1f}s)")
+    print(f"   {'user directory':<28} {reindex_users(args.tenant_db):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from io import BytesIO
 from database import master_engine, logger
 from utils.audit_logger import log_audit, log_error
 from utils.email import send_email
+from utils.metrics import MetricsMiddleware, render_metrics
 
 import models.models_master as models_master
 import models.models_tenant as models_tenant
@@ -115,6 +116,9 @@ from routes.compliance.nabh_compliance import router as nabh_compliance_router
 # ======================= 🔥 EXIT MANAGEMENT ROUTERS =======================
 from routes.exit.exit_management import router as exit_management_router
 
+# ======================= 🔥 BACKGROUND JOBS ROUTERS =======================
+from routes.jobs import router as jobs_router
+
 # ============================================================
 
 app = FastAPI(title="Nutryah HRM - Multi Tenant Backend")
@@ -161,6 +165,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---------------- METRICS ----------------
+app.add_middleware(MetricsMiddleware)
+
 # ---------------- DIRECTORIES ----------------
 Path("uploads/policies").mkdir(parents=True, exist_ok=True)
 Path("uploads/resumes").mkdir(parents=True, exist_ok=True)
@@ -175,26 +182,40 @@ def create_tables():
     models_master.MasterBase.metadata.create_all(bind=master_engine)
     logger.info("Master tables created.")
 
-    try:
-        from database import create_tenant_database, get_tenant_engine, get_master_db
+    # Tenant DBs are verified in the background and provisioned on first use
+    from utils.tenant_bootstrap import start_tenant_bootstrap
+
+    start_tenant_bootstrap()
+
+
+@app.on_event("startup")
+def start_audit_writer():
+    from utils.audit_writer import audit_writer
 
-        master_db = next(get_master_db())
-        hospitals = master_db.query(models_master.Hospital).all()
+    audit_writer.start()
 
-        for hospital in hospitals:
-            try:
-                logger.info(f"Ensuring tenant database exists: {hospital.db_name}")
-                create_tenant_database(hospital.db_name)
 
-                tenant_engine = get_tenant_engine(hospital.db_name)
-                models_tenant.MasterBase.metadata.create_all(bind=tenant_engine)
-                logger.info(f"Tenant tables created/verified for {hospital.db_name}")
-            except Exception as e:
-                logger.error(f"Error creating tenant DB {hospital.db_name}: {str(e)}")
+@app.on_event("startup")
+def start_job_runner():
+    from utils.jobs import start_job_runner as start_runner
 
-        master_db.close()
+    try:
+        start_runner()
     except Exception as e:
-        logger.error(f"Error during tenant database setup: {str(e)}")
+        logger.error(f"Error starting background job runner: {str(e)}")
+
+
+@app.on_event("shutdown")
+def stop_background_services():
+    from database import tenant_engines
+    from utils.audit_writer import audit_writer
+    from utils.jobs import stop_job_runner
+
+    # Jobs may still write audit rows, and both need the engine pools
+    stop_job_runner()
+    audit_writer.stop()
+    tenant_engines.dispose()
+    logger.info("Tenant engine pools disposed.")
 
 # ---------------- REGISTER ROUTERS ----------------
 app.include_router(hospital_router, prefix="/auth", tags=["Hospitals"])
@@ -292,6 +313,9 @@ app.include_router(nabh_compliance_router, prefix="/api")
 # ======================= 🔥 EXIT MANAGEMENT MODULE =======================
 app.include_router(exit_management_router, prefix="/api")
 
+# ======================= 🔥 BACKGROUND JOBS MODULE =======================
+app.include_router(jobs_router, prefix="/api")
+
 logger.info("All routers loaded successfully")
 
 # ======================= 📧 EMAIL ENDPOINT =======================
@@ -567,6 +591,11 @@ def send_email_endpoint(email_request: EmailRequest):
         logger.error(f"Email endpoint error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ---------------- METRICS ----------------
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # ---------------- ROOT ----------------
 @app.get("/")
 def root():
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+Tenant Schema Migration
+Upgrades every hospital database (or the ones named) to the latest tenant
+migration in alembic/tenant, several tenants at a time, and records each
+tenant's revision in the master tenant_schema_versions table.
+
+Usage: python migrate_tenants.py [tenant_db ...] [--workers N] [--all] [--revision REV]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.tenant_migrations import MIGRATION_WORKERS, head_revision, migrate_tenants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate tenant databases")
+    parser.add_argument("tenants", nargs="*", help="tenant DB names (default: all hospitals)")
+    parser.add_argument("--workers", type=int, default=MIGRATION_WORKERS)
+    parser.add_argument("--all", action="store_true", help="also run tenants already recorded at head")
+    parser.add_argument("--revision", default="head")
+    args = parser.parse_args()
+
+    print(f"Target revision: {args.revision} (head is {head_revision()})")
+    summary = migrate_tenants(
+        args.tenants or None,
+        workers=args.workers,
+        revision=args.revision,
+        only_outdated=not args.all
+    )
+
+    if not summary:
+        print("✅ Every tenant is already at head")
+        return
+
+    failed = [name for name, result in summary.items() if result["status"] == "failed"]
+    for name, result in sorted(summary.items()):
+        mark = "✅" if result["status"] == "current" else "❌"
+        print(f"{mark} {name}: {result['revision'] or result['error']}")
+
+    if failed:
+        print(f"\n{len(failed)} of {len(summary)} tenants failed")
+        sys.exit(1)
+    print(f"\nMigrated {len(summary)} tenants")
+
+
+if __name__ == "__main__":
+    main()
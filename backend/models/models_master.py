@@ -68,3 +68,51 @@ class ErrorLog(MasterBase):
     user_id = Column(Integer, nullable=True)
     ip_address = Column(String(45), nullable=True)
     created_at = Column(DateTime, default=func.now())
+
+
+class TenantUserDirectory(MasterBase):
+    """Email → tenant lookup so login only opens the tenant DB that owns the user"""
+    __tablename__ = "tenant_user_directory"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String(191), unique=True, index=True, nullable=False)
+    hospital_id = Column(Integer, ForeignKey("hospitals.id", ondelete="CASCADE"), nullable=False)
+    db_name = Column(String(150), index=True, nullable=False)
+    tenant_user_id = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class BackgroundJob(MasterBase):
+    __tablename__ = "background_jobs"
+
+    id = Column(String(36), primary_key=True)
+    tenant_id = Column(String(150), index=True, nullable=False)
+    job_type = Column(String(100), nullable=False)
+    status = Column(String(20), default="queued", index=True)  # queued/running/succeeded/failed
+    progress = Column(Integer, default=0)
+    message = Column(String(255), nullable=True)
+    params = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    result_path = Column(String(512), nullable=True)
+    result_filename = Column(String(255), nullable=True)
+    result_media_type = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(String(191), nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # process running the job and when it last reported in; stale running jobs are failed
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+
+class TenantSchemaVersion(MasterBase):
+    """Alembic revision each tenant DB was last migrated to"""
+    __tablename__ = "tenant_schema_versions"
+
+    db_name = Column(String(150), primary_key=True)
+    revision = Column(String(32), nullable=True)
+    fingerprint = Column(String(64), nullable=True)  # schema_fingerprint() when last provisioned
+    status = Column(String(20), default="pending")  # pending/migrating/current/failed
+    error = Column(Text, nullable=True)
+    migrated_at = Column(DateTime, nullable=True)
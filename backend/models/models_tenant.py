@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean,Text, DateTime,Float,JSON,Date, Time, ForeignKey, func, LargeBinary
+from sqlalchemy import Column, Integer, String, Boolean,Text, DateTime,Float,JSON,Date, Time, ForeignKey, func, LargeBinary, Index, UniqueConstraint
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -785,6 +785,11 @@ class EmployeeExit(MasterBase):
 # ------------------------------
 class EmployeeRoster(MasterBase):
     __tablename__ = "employee_roster"
+    __table_args__ = (
+        # one roster entry per employee per day; copies and rotations skip days already set
+        UniqueConstraint("employee_id", "date", name="uq_employee_roster_employee_date"),
+        Index("ix_employee_roster_date", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, nullable=False)
@@ -852,6 +857,10 @@ class EmployeeReporting(MasterBase):
 # =====================================================
 class AttendanceRegularization(MasterBase):
     __tablename__ = "attendance_regularizations"
+    __table_args__ = (
+        Index("ix_attendance_regularizations_employee_date_status", "employee_id", "punch_date", "status"),
+        Index("ix_attendance_regularizations_punch_date", "punch_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -870,6 +879,10 @@ class AttendanceRegularization(MasterBase):
 # =====================================================
 class ODApplication(MasterBase):
     __tablename__ = "od_applications"
+    __table_args__ = (
+        Index("ix_od_applications_employee_date_status", "employee_id", "od_date", "status"),
+        Index("ix_od_applications_od_date", "od_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -918,6 +931,10 @@ class AttendanceLocation(MasterBase):
 # =====================================================
 class AttendancePunch(MasterBase):
     __tablename__ = "attendance_punches"
+    __table_args__ = (
+        Index("ix_attendance_punches_employee_date", "employee_id", "date"),
+        Index("ix_attendance_punches_date_status", "date", "status", "employee_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -937,6 +954,43 @@ class AttendancePunch(MasterBase):
 
     created_at = Column(DateTime, server_default=func.now())
 
+
+# Derived from attendance_punches; refreshed per employee-month by punch writes (utils/attendance_summary.py)
+class AttendanceMonthlySummary(MasterBase):
+    __tablename__ = "attendance_monthly_summary"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "year", "month", name="uq_attendance_monthly_summary_employee_month"),
+        Index("ix_attendance_monthly_summary_month", "year", "month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+
+    present_days = Column(Integer, nullable=False, default=0)
+    late_days = Column(Integer, nullable=False, default=0)
+    early_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    punched_days = Column(Integer, nullable=False, default=0)
+    worked_minutes = Column(Integer, nullable=False, default=0)
+    ot_minutes = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, server_default=func.now())
+
+
+class AttendanceDailyTotals(MasterBase):
+    """Punches per day and status across the tenant, kept with attendance_monthly_summary"""
+    __tablename__ = "attendance_daily_totals"
+    __table_args__ = (
+        UniqueConstraint("date", "status", name="uq_attendance_daily_totals_date_status"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+    status = Column(String(50), nullable=False)
+    punches = Column(Integer, nullable=False, default=0)
+
 # =========================
 # LEAVE MANAGEMENT TABLES
 # =========================
@@ -990,6 +1044,10 @@ class LeaveRule(MasterBase):
 # ------------------------------
 class LeaveApplication(MasterBase):
     __tablename__ = "leave_applications"
+    __table_args__ = (
+        Index("ix_leave_applications_employee_status_dates", "employee_id", "status", "from_date", "to_date"),
+        Index("ix_leave_applications_to_date", "to_date", "from_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
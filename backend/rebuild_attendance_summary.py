@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Maintenance Script: Rebuild Attendance Monthly Summary
+Recomputes attendance_monthly_summary and attendance_daily_totals from
+attendance_punches for every hospital database (or the ones named), for all
+months or a month range.
+With --check nothing is written; employee-months whose stored totals differ
+from the punches are listed and the script exits 1.
+
+Usage: python rebuild_attendance_summary.py [tenant_db ...] [--from YYYY-MM] [--to YYYY-MM] [--check]
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import MasterSessionLocal, open_tenant_session
+from models.models_master import Hospital
+from utils.attendance_summary import rebuild_attendance_summary, rebuild_daily_totals, summary_drift
+
+
+def month(value: str):
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the monthly attendance summary")
+    parser.add_argument("tenants", nargs="*", help="tenant DB names (default: all hospitals)")
+    parser.add_argument("--from", dest="start", type=month, help="first month, YYYY-MM")
+    parser.add_argument("--to", dest="end", type=month, help="last month, YYYY-MM")
+    parser.add_argument("--check", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+
+    tenants = args.tenants
+    if not tenants:
+        with MasterSessionLocal() as master:
+            tenants = [str(h.db_name) for h in master.query(Hospital.db_name).order_by(Hospital.id)]
+
+    failed = False
+    for tenant_db in tenants:
+        try:
+            with open_tenant_session(tenant_db) as db:
+                if args.check:
+                    drift = summary_drift(db, args.start, args.end)
+                    failed = failed or bool(drift)
+                    print(f"{'❌' if drift else '✅'} {tenant_db}: {len(drift)} employee-months out of date")
+                    for row in drift[:10]:
+                        print(f"     employee {row['employee_id']} {row['year']}-{row['month']:02d}: "
+                              f"stored {row['stored']} expected {row['expected']}")
+                    continue
+
+                rows = rebuild_attendance_summary(db, args.start, args.end)
+                days = rebuild_daily_totals(db, args.start, args.end)
+                db.commit()
+                print(f"✅ {tenant_db}: {rows} employee-months and {days} day/status totals rebuilt")
+        except Exception as e:
+            failed = True
+            print(f"❌ {tenant_db}: {e}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+"""
+Maintenance Script: Rebuild Tenant User Directory
+Backfills the master-side email → tenant index used by login from every
+tenant database (or only the tenant DBs given on the command line).
+
+Usage: python rebuild_user_directory.py [tenant_db ...]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import MasterSessionLocal, master_engine
+from models.models_master import TenantUserDirectory
+from utils.user_directory import rebuild_user_directory
+
+
+def main():
+    db_names = sys.argv[1:] or None
+
+    TenantUserDirectory.__table__.create(bind=master_engine, checkfirst=True)
+
+    with MasterSessionLocal() as master_db:
+        summary = rebuild_user_directory(master_db, db_names)
+
+    failed = [name for name, count in summary.items() if count is None]
+    for name, count in summary.items():
+        status = "❌ failed" if count is None else f"✅ {count} users"
+        print(f"{name}: {status}")
+
+    print(f"\nIndexed {sum(c for c in summary.values() if c)} users across {len(summary) - len(failed)} tenants")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
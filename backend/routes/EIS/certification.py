@@ -8,28 +8,12 @@ import os
 import uuid
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_tenant_session, get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeCertifications
 from schemas.schemas_tenant import CertificationCreate, CertificationOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/certifications", tags=["Employee Certifications"])
 
 
@@ -44,9 +28,9 @@ async def add_certification(
     expiry: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         file_path = None
         file_name = None
@@ -95,9 +79,7 @@ async def add_certification(
 # 2. LIST CERTIFICATIONS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_certifications(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def get_certifications(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     return (
         db.query(EmployeeCertifications)
         .filter(EmployeeCertifications.employee_id == employee_id)
@@ -117,10 +99,9 @@ async def update_certification(
     expiry: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-
     cert = db.query(EmployeeCertifications).filter(EmployeeCertifications.id == cert_id).first()
     if not cert:
         raise HTTPException(404, "Certification not found")
@@ -167,9 +148,9 @@ def view_certificate(cert_id: int, token: str = Query(None)):
     if not user:
         raise HTTPException(401, "Invalid or expired token")
     
-    db = get_tenant_session(user)
-    
-    cert = db.query(EmployeeCertifications).filter(EmployeeCertifications.id == cert_id).first()
+    # the session is only needed to find the file; close it before streaming
+    with get_tenant_session(user) as db:
+        cert = db.query(EmployeeCertifications).filter(EmployeeCertifications.id == cert_id).first()
     if not cert or not cert.certificate_file:
         raise HTTPException(404, "Certificate not found")
     
@@ -199,9 +180,7 @@ def view_certificate(cert_id: int, token: str = Query(None)):
 # 5. DELETE CERTIFICATION
 # -------------------------------------------------------------------------
 @router.delete("/{cert_id}")
-def delete_certification(cert_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_certification(cert_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     cert = db.query(EmployeeCertifications).filter(EmployeeCertifications.id == cert_id).first()
     if not cert:
         raise HTTPException(404, "Certification not found")
@@ -5,27 +5,12 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeDocuments
 from schemas.schemas_tenant import DocumentCreate, DocumentOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 router = APIRouter(prefix="/employee/documents", tags=["Employee Documents"])
 
 
@@ -39,10 +24,9 @@ async def upload_document(
     document_name: str = Form(...),
     file: UploadFile = File(...),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-    
     file_content = await file.read()
     
     document = EmployeeDocuments(
@@ -64,9 +48,7 @@ async def upload_document(
 # 2. GET DOCUMENTS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_documents(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def get_documents(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     return (
         db.query(EmployeeDocuments)
         .filter(EmployeeDocuments.employee_id == employee_id)
@@ -78,9 +60,7 @@ def get_documents(employee_id: int, user=Depends(get_current_user)):
 # 3. DELETE DOCUMENT
 # -------------------------------------------------------------------------
 @router.delete("/{document_id}")
-def delete_document(document_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_document(document_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     document = db.query(EmployeeDocuments).filter(EmployeeDocuments.id == document_id).first()
     if not document:
         raise HTTPException(404, "Document not found")
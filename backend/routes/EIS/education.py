@@ -8,24 +8,10 @@ import os
 import uuid
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_tenant_session, get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeEducation
 from schemas.schemas_tenant import EducationCreate, EducationOut
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
 
 router = APIRouter(prefix="/employee/education", tags=["Employee Education"])
 
@@ -49,10 +35,9 @@ async def add_education(
     year: str = Form(""),  # Keep for backward compatibility
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-    
     file_path = None
     file_name = None
     if file:
@@ -101,9 +86,8 @@ async def add_education(
 # 2. GET EDUCATION RECORDS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_education(employee_id: int, user=Depends(get_current_user)):
+def get_education(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
-        db = get_tenant_session(user)
         print(f"Fetching education for employee_id: {employee_id}")
 
         records = (
@@ -170,10 +154,9 @@ async def update_education(
     year: str = Form(""),  # Keep for backward compatibility
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-
     education = db.query(EmployeeEducation).filter(EmployeeEducation.id == education_id).first()
     if not education:
         raise HTTPException(404, "Education record not found")
@@ -228,9 +211,9 @@ def view_certificate(education_id: int, token: str = Query(None)):
     if not user:
         raise HTTPException(401, "Invalid or expired token")
     
-    db = get_tenant_session(user)
-    
-    education = db.query(EmployeeEducation).filter(EmployeeEducation.id == education_id).first()
+    # the session is only needed to find the file; close it before streaming
+    with get_tenant_session(user) as db:
+        education = db.query(EmployeeEducation).filter(EmployeeEducation.id == education_id).first()
     if not education or not getattr(education, 'certificate', None):
         raise HTTPException(404, "Certificate not found")
     
@@ -261,8 +244,7 @@ def view_certificate(education_id: int, token: str = Query(None)):
 # 4.5. DEBUG EDUCATION DATA
 # -------------------------------------------------------------------------
 @router.get("/debug/{education_id}")
-def debug_education(education_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def debug_education(education_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     education = db.query(EmployeeEducation).filter(EmployeeEducation.id == education_id).first()
     
     if not education:
@@ -282,9 +264,7 @@ def debug_education(education_id: int, user=Depends(get_current_user)):
 # 5. DELETE EDUCATION RECORD
 # -------------------------------------------------------------------------
 @router.delete("/{education_id}")
-def delete_education(education_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_education(education_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     education = db.query(EmployeeEducation).filter(EmployeeEducation.id == education_id).first()
     if not education:
         raise HTTPException(404, "Education record not found")
@@ -6,33 +6,16 @@ from typing import List
 from utils.audit_logger import audit_crud
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from schemas.schemas_tenant import ExitCreate, ExitOut
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 router = APIRouter(prefix="/employee", tags=["Employee Management"])
 
 # -------------------------------------------------------------------------
 # 1. GET EMPLOYEE PROFILE
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}/profile")
-def get_employee_profile(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def get_employee_profile(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     # Get employee from onboarding records
     from models.models_tenant import OnboardingCandidate, Candidate
     
@@ -66,9 +49,7 @@ def get_employee_profile(employee_id: int, user=Depends(get_current_user)):
 # 2. ADD EXIT DETAILS
 # -------------------------------------------------------------------------
 @router.post("/exit/add")
-def add_exit_details(data: ExitCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def add_exit_details(data: ExitCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     from models.models_tenant import EmployeeExit
     
     # Check if exit record already exists
@@ -106,9 +87,7 @@ def add_exit_details(data: ExitCreate, request: Request, user=Depends(get_curren
 # 3. GET EXIT DETAILS
 # -------------------------------------------------------------------------
 @router.get("/exit/{employee_id}", response_model=ExitOut)
-def get_exit_details(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def get_exit_details(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     from models.models_tenant import EmployeeExit
     
     exit_record = db.query(EmployeeExit).filter(
@@ -125,9 +104,7 @@ def get_exit_details(employee_id: int, user=Depends(get_current_user)):
 # 5. VALIDATE EMPLOYEE CODE
 # -------------------------------------------------------------------------
 @router.get("/validate/{employee_code}")
-def validate_employee_code(employee_code: str, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def validate_employee_code(employee_code: str, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     from models.models_tenant import User, OnboardingCandidate
     
     # Check in user management
@@ -151,10 +128,9 @@ def convert_user_to_employee(
     user_id: int,
     payload: dict,
     request: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-    
     from models.models_tenant import User
     
     existing_user = db.query(User).filter(User.id == user_id).first()
@@ -4,28 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeExit, User
 from schemas.schemas_tenant import ExitCreate, ExitOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/exit", tags=["Employee Exit & Separation"])
 
 
@@ -33,9 +17,7 @@ router = APIRouter(prefix="/employee/exit", tags=["Employee Exit & Separation"])
 # 1. ADD EXIT DETAILS
 # -------------------------------------------------------------------------
 @router.post("/add", response_model=ExitOut)
-def add_exit(data: ExitCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def add_exit(data: ExitCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     emp = db.query(User).filter(User.id == data.employee_id).first()
     if not emp:
         raise HTTPException(404, "Employee not found")
@@ -69,9 +51,7 @@ def add_exit(data: ExitCreate, request: Request, user=Depends(get_current_user))
 # 2. GET EXIT DETAILS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}", response_model=ExitOut)
-def get_exit(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def get_exit(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     exit_data = db.query(EmployeeExit).filter(EmployeeExit.employee_id == employee_id).first()
     if not exit_data:
         raise HTTPException(404, "No exit data found")
@@ -83,9 +63,7 @@ def get_exit(employee_id: int, user=Depends(get_current_user)):
 # 3. UPDATE EXIT DETAILS
 # -------------------------------------------------------------------------
 @router.put("/{employee_id}", response_model=ExitOut)
-def update_exit(employee_id: int, data: ExitCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def update_exit(employee_id: int, data: ExitCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     exit_data = db.query(EmployeeExit).filter(EmployeeExit.employee_id == employee_id).first()
     if not exit_data:
         raise HTTPException(404, "Exit record not found")
@@ -120,9 +98,7 @@ def update_exit(employee_id: int, data: ExitCreate, request: Request, user=Depen
 # 4. CHANGE CLEARANCE STATUS ONLY
 # -------------------------------------------------------------------------
 @router.post("/clearance/{employee_id}")
-def update_clearance(employee_id: int, status: str, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def update_clearance(employee_id: int, status: str, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     exit_data = db.query(EmployeeExit).filter(EmployeeExit.employee_id == employee_id).first()
     if not exit_data:
         raise HTTPException(404, "Exit record not found")
@@ -8,28 +8,12 @@ import os
 import uuid
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_tenant_session, get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeExperience
 from schemas.schemas_tenant import ExperienceCreate, ExperienceOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/experience", tags=["Employee Experience Details"])
 
 
@@ -59,9 +43,9 @@ async def add_experience(
     to_year: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         file_path = None
         file_name = None
@@ -122,9 +106,8 @@ async def add_experience(
 # 2. LIST EXPERIENCE RECORDS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_experience_list(employee_id: int, user=Depends(get_current_user)):
+def get_experience_list(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
-        db = get_tenant_session(user)
         print(f"Fetching experience for employee_id: {employee_id}")
 
         records = (
@@ -199,10 +182,9 @@ async def update_experience(
     manager_contact: str = Form(""),
     file: Optional[UploadFile] = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-
     exp = db.query(EmployeeExperience).filter(EmployeeExperience.id == experience_id).first()
     if not exp:
         raise HTTPException(404, "Experience record not found")
@@ -280,9 +262,9 @@ def view_document(experience_id: int, token: Optional[str] = Query(None), Author
     else:
         raise HTTPException(401, "Token required")
     
-    db = get_tenant_session(user)
-    
-    exp = db.query(EmployeeExperience).filter(EmployeeExperience.id == experience_id).first()
+    # the session is only needed to find the file; close it before streaming
+    with get_tenant_session(user) as db:
+        exp = db.query(EmployeeExperience).filter(EmployeeExperience.id == experience_id).first()
     if not exp or not getattr(exp, 'relieving_doc', None):
         raise HTTPException(404, "Document not found")
     
@@ -313,9 +295,7 @@ def view_document(experience_id: int, token: Optional[str] = Query(None), Author
 # 5. DELETE EXPERIENCE RECORD
 # -------------------------------------------------------------------------
 @router.delete("/{experience_id}")
-def delete_experience(experience_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_experience(experience_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     exp = db.query(EmployeeExperience).filter(EmployeeExperience.id == experience_id).first()
     if not exp:
         raise HTTPException(404, "Experience record not found")
@@ -5,28 +5,12 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeFamily
 from schemas.schemas_tenant import FamilyCreate, FamilyOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/family", tags=["Employee Family Details"])
 
 
@@ -34,8 +18,7 @@ router = APIRouter(prefix="/employee/family", tags=["Employee Family Details"])
 # 1. ADD FAMILY MEMBER
 # -------------------------------------------------------------------------
 @router.post("/add", response_model=FamilyOut)
-def add_family_member(data: FamilyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def add_family_member(data: FamilyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         new_member = EmployeeFamily(
             employee_id=data.employee_id,
@@ -64,8 +47,7 @@ def add_family_member(data: FamilyCreate, request: Request, user=Depends(get_cur
 # 2. GET FAMILY DETAILS FOR EMPLOYEE
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}", response_model=List[FamilyOut])
-def get_family_list(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_family_list(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         return (
             db.query(EmployeeFamily)
@@ -81,8 +63,7 @@ def get_family_list(employee_id: int, user=Depends(get_current_user)):
 # 3. UPDATE FAMILY MEMBER
 # -------------------------------------------------------------------------
 @router.put("/{family_id}", response_model=FamilyOut)
-def update_family_member(family_id: int, data: FamilyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_family_member(family_id: int, data: FamilyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         member = db.query(EmployeeFamily).filter(EmployeeFamily.id == family_id).first()
         if not member:
@@ -114,8 +95,7 @@ def update_family_member(family_id: int, data: FamilyCreate, request: Request, u
 # 4. DELETE FAMILY MEMBER
 # -------------------------------------------------------------------------
 @router.delete("/{family_id}")
-def delete_family_member(family_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_family_member(family_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         member = db.query(EmployeeFamily).filter(EmployeeFamily.id == family_id).first()
         if not member:
@@ -8,28 +8,12 @@ import os
 import uuid
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_tenant_session, get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeIDDocs
 from schemas.schemas_tenant import IDDocCreate, IDDocOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/id-docs", tags=["Employee ID & Verification"])
 
 
@@ -42,9 +26,9 @@ async def upload_id_doc(
     document_type: str = Form(...),
     file: UploadFile = File(...),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         # Create uploads directory if it doesn't exist
         os.makedirs("uploads", exist_ok=True)
@@ -86,9 +70,7 @@ async def upload_id_doc(
 # 2. GET ALL ID DOCUMENTS FOR EMPLOYEE
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_id_docs(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def get_id_docs(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     return (
         db.query(EmployeeIDDocs)
         .filter(EmployeeIDDocs.employee_id == employee_id)
@@ -105,10 +87,9 @@ async def update_id_doc(
     doc_id: int,
     file: UploadFile = File(...),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-
     doc = db.query(EmployeeIDDocs).filter(EmployeeIDDocs.id == doc_id).first()
     if not doc:
         raise HTTPException(404, "Document not found")
@@ -151,9 +132,9 @@ def view_document(doc_id: int, token: str = Query(None)):
     if not user:
         raise HTTPException(401, "Invalid or expired token")
     
-    db = get_tenant_session(user)
-    
-    doc = db.query(EmployeeIDDocs).filter(EmployeeIDDocs.id == doc_id).first()
+    # the session is only needed to find the file; close it before streaming
+    with get_tenant_session(user) as db:
+        doc = db.query(EmployeeIDDocs).filter(EmployeeIDDocs.id == doc_id).first()
     if not doc or not doc.file:
         raise HTTPException(404, "Document not found")
     
@@ -183,9 +164,7 @@ def view_document(doc_id: int, token: str = Query(None)):
 # 5. VERIFY / REJECT DOCUMENT
 # -------------------------------------------------------------------------
 @router.post("/verify/{doc_id}")
-def verify_doc(doc_id: int, action: str, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def verify_doc(doc_id: int, action: str, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     doc = db.query(EmployeeIDDocs).filter(EmployeeIDDocs.id == doc_id).first()
     if not doc:
         raise HTTPException(404, "Document not found")
@@ -204,9 +183,7 @@ def verify_doc(doc_id: int, action: str, request: Request, user=Depends(get_curr
 # 6. DELETE DOCUMENT
 # -------------------------------------------------------------------------
 @router.delete("/{doc_id}")
-def delete_id_doc(doc_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_id_doc(doc_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     doc = db.query(EmployeeIDDocs).filter(EmployeeIDDocs.id == doc_id).first()
     if not doc:
         raise HTTPException(404, "Document not found")
@@ -8,28 +8,12 @@ import uuid
 import json
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_tenant_session, get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeMedical
 from schemas.schemas_tenant import MedicalCreate, MedicalOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/medical", tags=["Employee Medical Details"])
 
 
@@ -60,13 +44,13 @@ async def add_medical(
     remarks: str = Form(None),
     file: UploadFile = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     print(f"DEBUG: Received license_alert_enabled: {license_alert_enabled} (type: {type(license_alert_enabled)})")
     print(f"DEBUG: Received license_alert_days: {license_alert_days} (type: {type(license_alert_days)})")
     print(f"DEBUG: Received employee_id: {employee_id} (type: {type(employee_id)})")
     
-    db = get_tenant_session(user)
     try:
         # Extract numeric ID if it has 'user_' prefix
         if isinstance(employee_id, str) and employee_id.startswith('user_'):
@@ -145,9 +129,8 @@ async def add_medical(
 # 6. GET LICENSE RENEWAL ALERTS
 # -------------------------------------------------------------------------
 @router.get("/license-alerts")
-def get_license_alerts(user=Depends(get_current_user)):
+def get_license_alerts(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     """Get all employees with licenses expiring soon"""
-    db = get_tenant_session(user)
     from datetime import datetime, timedelta
     
     try:
@@ -194,14 +177,12 @@ def get_license_alerts(user=Depends(get_current_user)):
 # 2. GET MEDICAL DETAILS
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}", response_model=MedicalOut)
-def get_medical(employee_id: str, user=Depends(get_current_user)):
+def get_medical(employee_id: str, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     # Extract numeric ID if it has 'user_' prefix
     if employee_id.startswith('user_'):
         employee_id = int(employee_id.replace('user_', ''))
     else:
         employee_id = int(employee_id)
-    
-    db = get_tenant_session(user)
 
     med = db.query(EmployeeMedical).filter(EmployeeMedical.employee_id == employee_id).first()
     if not med:
@@ -237,7 +218,8 @@ async def update_medical(
     remarks: str = Form(None),
     file: UploadFile = File(None),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     # Extract numeric ID if it has 'user_' prefix
     if employee_id.startswith('user_'):
@@ -245,7 +227,6 @@ async def update_medical(
     else:
         employee_id = int(employee_id)
     
-    db = get_tenant_session(user)
     try:
         med = db.query(EmployeeMedical).filter(EmployeeMedical.employee_id == employee_id).first()
         if not med:
@@ -316,9 +297,9 @@ def view_certificate(employee_id: int, token: str = Query(None)):
     if not user:
         raise HTTPException(401, "Invalid or expired token")
     
-    db = get_tenant_session(user)
-    
-    med = db.query(EmployeeMedical).filter(EmployeeMedical.employee_id == employee_id).first()
+    # the session is only needed to find the file; close it before streaming
+    with get_tenant_session(user) as db:
+        med = db.query(EmployeeMedical).filter(EmployeeMedical.employee_id == employee_id).first()
     if not med or not med.medical_certificate:
         raise HTTPException(404, "Medical certificate not found")
     
@@ -348,9 +329,7 @@ def view_certificate(employee_id: int, token: str = Query(None)):
 # 7. DELETE MEDICAL RECORD
 # -------------------------------------------------------------------------
 @router.delete("/{employee_id}")
-def delete_medical(employee_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-
+def delete_medical(employee_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     med = db.query(EmployeeMedical).filter(EmployeeMedical.employee_id == employee_id).first()
     if not med:
         raise HTTPException(404, "Medical record not found")
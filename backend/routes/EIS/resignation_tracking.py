@@ -6,41 +6,27 @@ from typing import List
 from datetime import date
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeExit, User
 from schemas.schemas_tenant import ExitOut, ExitCreate
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 router = APIRouter(prefix="/resignation", tags=["Resignation Tracking"])
 
 # -------------------------------------------------------------------------
 # 1. LIST ALL RESIGNATIONS
 # -------------------------------------------------------------------------
 @router.get("/list")
-def list_resignations(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def list_resignations(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         resignations = db.query(EmployeeExit).all()
+
+        employee_ids = {r.employee_id for r in resignations}
+        employees = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))} if employee_ids else {}
         
         result = []
         for resignation in resignations:
-            employee = db.query(User).filter(User.id == resignation.employee_id).first()
+            employee = employees.get(resignation.employee_id)
             
             result.append({
                 "id": resignation.id,
@@ -73,9 +59,7 @@ def list_resignations(user=Depends(get_current_user)):
 # 2. APPLY RESIGNATION
 # -------------------------------------------------------------------------
 @router.post("/apply")
-def apply_resignation(data: ExitCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def apply_resignation(data: ExitCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         print(f"DEBUG: Received resignation data: {data.dict()}")
         
@@ -133,10 +117,9 @@ def update_resignation_status(
     status_field: str,
     status_value: str,
     request: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-    
     resignation = db.query(EmployeeExit).filter(EmployeeExit.id == resignation_id).first()
     if not resignation:
         raise HTTPException(404, "Resignation not found")
@@ -169,10 +152,9 @@ def conduct_exit_interview(
     resignation_id: int,
     interview_data: dict,
     request: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
-    
     resignation = db.query(EmployeeExit).filter(EmployeeExit.id == resignation_id).first()
     if not resignation:
         raise HTTPException(404, "Resignation not found")
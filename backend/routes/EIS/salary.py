@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Form, Request
 from sqlalchemy.orm import Session
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from models.models_tenant import EmployeeSalary, Grade
 from schemas.schemas_tenant import SalaryCreate, SalaryOut
 from pydantic import BaseModel
@@ -18,22 +18,6 @@ class SimpleSalaryCreate(BaseModel):
     grade: Optional[str] = None
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/salary", tags=["Employee Salary Structure"])
 
 
@@ -61,13 +45,10 @@ async def add_salary(
     pf_eligible: str = Form("true"),
     esi_eligible: str = Form("true"),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = None
     try:
-        db = get_tenant_session(user)
-        print(f"DEBUG: Database session created successfully")
-        
         # Convert string values to proper types
         # Handle both numeric and user_X format employee IDs
         if employee_id.startswith('user_'):
@@ -152,8 +133,7 @@ async def add_salary(
 # 2. GET EMPLOYEE SALARY
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}")
-def get_salary(employee_id: str, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_salary(employee_id: str, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         # Handle both numeric and user_X format employee IDs
         if employee_id.startswith('user_'):
@@ -174,8 +154,7 @@ def get_salary(employee_id: str, user=Depends(get_current_user)):
 # 3. UPDATE SALARY STRUCTURE
 # -------------------------------------------------------------------------
 @router.put("/{employee_id}", response_model=SalaryOut)
-def update_salary(employee_id: int, data: SalaryCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_salary(employee_id: int, data: SalaryCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         sal = db.query(EmployeeSalary).filter(EmployeeSalary.employee_id == employee_id).first()
         if not sal:
@@ -216,9 +195,7 @@ def update_salary(employee_id: int, data: SalaryCreate, request: Request, user=D
 # 4. SIMPLE SALARY CREATION (MINIMAL INPUT)
 # -------------------------------------------------------------------------
 @router.post("/create-simple", response_model=SalaryOut)
-def create_simple_salary(data: SimpleSalaryCreate, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def create_simple_salary(data: SimpleSalaryCreate, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         # Check if salary already exists
         existing = db.query(EmployeeSalary).filter(EmployeeSalary.employee_id == data.employee_id).first()
@@ -5,28 +5,12 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeSkills
 from schemas.schemas_tenant import SkillCreate, SkillOut
 
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
-
 router = APIRouter(prefix="/employee/skills", tags=["Employee Skills & Competencies"])
 
 
@@ -34,8 +18,7 @@ router = APIRouter(prefix="/employee/skills", tags=["Employee Skills & Competenc
 # 1. ADD SKILL
 # -------------------------------------------------------------------------
 @router.post("/add", response_model=SkillOut)
-def add_skill(data: SkillCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def add_skill(data: SkillCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         new_skill = EmployeeSkills(
             employee_id=data.employee_id,
@@ -67,8 +50,7 @@ def add_skill(data: SkillCreate, request: Request, user=Depends(get_current_user
 # 2. LIST SKILLS FOR EMPLOYEE
 # -------------------------------------------------------------------------
 @router.get("/{employee_id}", response_model=List[SkillOut])
-def get_skills(employee_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_skills(employee_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         skills = (
             db.query(EmployeeSkills)
@@ -93,8 +75,7 @@ def get_skills(employee_id: int, user=Depends(get_current_user)):
 # 3. UPDATE SKILL
 # -------------------------------------------------------------------------
 @router.put("/{skill_id}", response_model=SkillOut)
-def update_skill(skill_id: int, data: SkillCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_skill(skill_id: int, data: SkillCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         sk = db.query(EmployeeSkills).filter(EmployeeSkills.id == skill_id).first()
         if not sk:
@@ -128,8 +109,7 @@ def update_skill(skill_id: int, data: SkillCreate, request: Request, user=Depend
 # 4. DELETE SKILL
 # -------------------------------------------------------------------------
 @router.delete("/{skill_id}")
-def delete_skill(skill_id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_skill(skill_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         sk = db.query(EmployeeSkills).filter(EmployeeSkills.id == skill_id).first()
         if not sk:
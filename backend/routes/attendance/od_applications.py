@@ -5,6 +5,7 @@ from database import get_tenant_db
 from typing import List
 from datetime import date
 from pydantic import BaseModel
+from utils.attendance_summary import refresh_attendance_summary
 
 router = APIRouter(prefix="/attendance/od-applications", tags=["OD Applications"])
 
@@ -146,6 +147,7 @@ def approve_od_application(od_id: int, db: Session = Depends(get_tenant_db)):
                 'to_time': od_app.to_time
             })
         
+        refresh_attendance_summary(db, [(od_app.employee_id, od_app.od_date)])
         db.commit()
         return {"message": "OD application approved and attendance marked as present"}
         
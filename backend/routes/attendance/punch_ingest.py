@@ -0,0 +1,265 @@
+"""
+Bulk attendance punch ingestion.
+
+Biometric devices sync thousands of punches at shift change. A batch is parsed
+and grouped per (employee, date) in memory, repeated device punches are folded
+into one record (earliest IN, latest OUT), stored punches and rosters are loaded
+once for the whole batch, shifts and rules come from the per-tenant reference
+cache, and statuses are computed with the same pure function as single punches.
+New records go out as one multi-row INSERT ... ON DUPLICATE KEY UPDATE per chunk
+and changed ones as one executemany UPDATE per chunk; the employee-months touched
+are refreshed in attendance_monthly_summary in the same transaction. Every input
+row gets a result entry.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, func, or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from models.models_tenant import AttendancePunch, EmployeeRoster, User
+from utils.attendance_reference import attendance_status, session_attendance_reference
+from utils.attendance_summary import refresh_attendance_summary
+
+punches_table = AttendancePunch.__table__
+
+TEXT_FIELDS = ("location", "device_info")
+
+
+class PunchPayloadError(ValueError):
+    """The batch as a whole could not be read"""
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+def parse_punch_payload(body: bytes, content_type: str) -> List[Dict]:
+    """Rows from a JSON array / {"punches": [...]} body or a CSV body with a header row"""
+    text = body.decode("utf-8-sig")
+    if "csv" in content_type or (content_type.startswith("text/") and not text.lstrip().startswith(("[", "{"))):
+        reader = csv.DictReader(io.StringIO(text))
+        return [{k.strip(): v.strip() for k, v in row.items() if k and v is not None and v.strip()} for row in reader]
+
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise PunchPayloadError(f"Invalid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get("punches")
+    if not isinstance(data, list):
+        raise PunchPayloadError("Expected a JSON array of punches or {\"punches\": [...]}")
+    return data
+
+
+def _parse_time(value) -> Optional[time]:
+    if value in (None, ""):
+        return None
+    value = str(value)
+    return time.fromisoformat(value if value.count(":") > 1 or len(value) > 5 else value + ":00")
+
+
+def _parse_row(raw) -> Dict:
+    """Normalised punch dict; raises ValueError with a per-row message"""
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+
+    punch_time = raw.get("punch_time")
+    if punch_time not in (None, ""):
+        punch_time = datetime.fromisoformat(str(punch_time).replace("Z", "+00:00"))
+    else:
+        punch_time = None
+
+    raw_date = raw.get("date")
+    punch_date = date.fromisoformat(str(raw_date)[:10]) if raw_date not in (None, "") else None
+    if punch_date is None and punch_time is not None:
+        punch_date = punch_time.date()
+    if punch_date is None:
+        raise ValueError("date or punch_time is required")
+
+    in_time, out_time = _parse_time(raw.get("in_time")), _parse_time(raw.get("out_time"))
+    if in_time is None and out_time is None and punch_time is None:
+        raise ValueError("in_time, out_time or punch_time is required")
+
+    employee_id = raw.get("employee_id")
+    employee_code = raw.get("employee_code")
+    if employee_id in (None, "") and not employee_code:
+        raise ValueError("employee_id or employee_code is required")
+
+    row = {
+        "employee_id": int(employee_id) if employee_id not in (None, "") else None,
+        "employee_code": str(employee_code) if employee_code else None,
+        "date": punch_date,
+        "in_time": in_time,
+        "out_time": out_time,
+        "event": punch_time.time().replace(tzinfo=None, microsecond=0) if punch_time else None,
+        "source": str(raw.get("source") or "BIOMETRIC")[:20],
+        "latitude": float(raw["latitude"]) if raw.get("latitude") not in (None, "") else None,
+        "longitude": float(raw["longitude"]) if raw.get("longitude") not in (None, "") else None,
+    }
+    for field in TEXT_FIELDS:
+        row[field] = str(raw[field]) if raw.get(field) not in (None, "") else None
+    return row
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+def _resolve_employees(db: Session, rows: List[Dict]) -> tuple:
+    ids = {r["employee_id"] for r in rows if r["employee_id"] is not None}
+    codes = {r["employee_code"] for r in rows if r["employee_id"] is None}
+    if not ids and not codes:
+        return set(), {}
+    filters = []
+    if ids:
+        filters.append(User.id.in_(ids))
+    if codes:
+        filters.append(User.employee_code.in_(codes))
+    known_ids, by_code = set(), {}
+    for user_id, code in db.query(User.id, User.employee_code).filter(or_(*filters)):
+        known_ids.add(user_id)
+        if code:
+            by_code[code] = user_id
+    return known_ids, by_code
+
+
+def _merge(rows: List[Dict], existing: Optional[AttendancePunch]) -> tuple:
+    """Earliest IN and latest OUT across the group's rows and any stored punch"""
+    ins = [r["in_time"] for r in rows if r["in_time"]]
+    outs = [r["out_time"] for r in rows if r["out_time"]]
+    # raw device events: the first of the day is the IN, anything later an OUT
+    events = sorted({r["event"] for r in rows if r["event"]})
+    if events:
+        ins.append(events[0])
+        outs.extend(events[1:])
+    if existing is not None:
+        if existing.in_time:
+            ins.append(existing.in_time)
+        if existing.out_time:
+            outs.append(existing.out_time)
+    return (min(ins) if ins else None), (max(outs) if outs else None)
+
+
+def ingest_punches(db: Session, raw_rows: List, chunk_size: int = 1000) -> Dict:
+    """Upsert a batch of device punches; caller commits"""
+    results: List[Optional[Dict]] = [None] * len(raw_rows)
+    parsed = {}
+    for index, raw in enumerate(raw_rows):
+        try:
+            parsed[index] = _parse_row(raw)
+        except (ValueError, TypeError) as e:
+            results[index] = {"row": index, "result": "error", "error": str(e)}
+
+    known_ids, by_code = _resolve_employees(db, list(parsed.values()))
+
+    # group per (employee, date); identical repeats are reported as duplicates
+    groups = defaultdict(list)
+    seen = set()
+    for index, row in parsed.items():
+        employee_id = row["employee_id"] if row["employee_id"] is not None else by_code.get(row["employee_code"])
+        if employee_id is None or employee_id not in known_ids:
+            results[index] = {"row": index, "result": "error", "error": "Employee not found"}
+            continue
+        row["employee_id"] = employee_id
+        fingerprint = (employee_id, row["date"], row["in_time"], row["out_time"], row["event"])
+        if fingerprint in seen:
+            results[index] = {"row": index, "result": "duplicate", "employee_id": employee_id,
+                              "date": row["date"].isoformat()}
+            continue
+        seen.add(fingerprint)
+        groups[(employee_id, row["date"])].append((index, row))
+
+    summary = {"received": len(raw_rows), "created": 0, "updated": 0, "unchanged": 0,
+               "duplicates": sum(1 for r in results if r and r["result"] == "duplicate"),
+               "errors": sum(1 for r in results if r and r["result"] == "error")}
+    if not groups:
+        return {"summary": summary, "results": results}
+
+    # one query each for stored punches and rosters; shifts and rules are cached
+    employee_ids = {key[0] for key in groups}
+    first_day, last_day = min(key[1] for key in groups), max(key[1] for key in groups)
+    existing = {
+        (p.employee_id, p.date): p
+        for p in db.query(AttendancePunch).filter(
+            AttendancePunch.employee_id.in_(employee_ids),
+            AttendancePunch.date.between(first_day, last_day)
+        )
+        if (p.employee_id, p.date) in groups
+    }
+    roster_shift = {
+        (r.employee_id, r.date): r.shift_id
+        for r in db.query(EmployeeRoster.employee_id, EmployeeRoster.date, EmployeeRoster.shift_id).filter(
+            EmployeeRoster.employee_id.in_(employee_ids),
+            EmployeeRoster.date.between(first_day, last_day)
+        )
+    }
+    reference = session_attendance_reference(db)
+
+    inserts, updates, outcome, statuses = [], [], {}, {}
+    for key, members in groups.items():
+        stored = existing.get(key)
+        rows = [row for _, row in members]
+        in_time, out_time = _merge(rows, stored)
+
+        status = attendance_status(reference, roster_shift.get(key), in_time, out_time) if in_time else 'Present'
+        statuses[key] = status
+
+        if stored is None:
+            first = rows[0]
+            inserts.append({
+                "employee_id": key[0], "date": key[1], "in_time": in_time, "out_time": out_time,
+                "status": status, "source": first["source"], "location": first["location"],
+                "device_info": first["device_info"], "latitude": first["latitude"], "longitude": first["longitude"],
+            })
+            outcome[key] = "created"
+        elif (stored.in_time, stored.out_time, stored.status) == (in_time, out_time, status):
+            outcome[key] = "unchanged"
+        else:
+            updates.append({"punch_id": stored.id, "new_in_time": in_time, "new_out_time": out_time,
+                            "new_status": status})
+            outcome[key] = "updated"
+
+    for i in range(0, len(inserts), chunk_size):
+        stmt = mysql_insert(punches_table).values(inserts[i:i + chunk_size])
+        # a concurrent sync may have created the row since the prefetch; fold into it (earliest IN, latest OUT)
+        stored, new = punches_table.c, stmt.inserted
+        stmt = stmt.on_duplicate_key_update(
+            in_time=func.least(func.coalesce(stored.in_time, new.in_time), func.coalesce(new.in_time, stored.in_time)),
+            out_time=func.greatest(func.coalesce(stored.out_time, new.out_time),
+                                   func.coalesce(new.out_time, stored.out_time)),
+            status=new.status
+        )
+        db.execute(stmt)
+
+    if updates:
+        update_stmt = punches_table.update().where(punches_table.c.id == bindparam("punch_id")).values(
+            in_time=bindparam("new_in_time"), out_time=bindparam("new_out_time"), status=bindparam("new_status")
+        )
+        for i in range(0, len(updates), chunk_size):
+            db.execute(update_stmt, updates[i:i + chunk_size])
+
+    refresh_attendance_summary(db, [key for key, result in outcome.items() if result != "unchanged"])
+
+    ids = {key: p.id for key, p in existing.items()}
+    if inserts:
+        created_keys = {(r["employee_id"], r["date"]) for r in inserts}
+        ids.update({
+            (p.employee_id, p.date): p.id
+            for p in db.query(AttendancePunch.id, AttendancePunch.employee_id, AttendancePunch.date).filter(
+                AttendancePunch.employee_id.in_({k[0] for k in created_keys}),
+                AttendancePunch.date.between(first_day, last_day)
+            )
+            if (p.employee_id, p.date) in created_keys
+        })
+
+    for key, members in groups.items():
+        summary[outcome[key]] += 1
+        for index, _ in members:
+            results[index] = {"row": index, "result": outcome[key], "punch_id": ids.get(key),
+                              "employee_id": key[0], "date": key[1].isoformat(), "status": statuses[key]}
+
+    return {"summary": summary, "results": results}
@@ -1,12 +1,15 @@
 # type: ignore[misc]
+import os
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from database import get_tenant_db
-from datetime import datetime, time
+from database import AsyncTenantSession, get_tenant_db, get_tenant_db_async
+from datetime import time
 from typing import Optional
 from utils.audit_logger import audit_crud
+from utils.attendance_reference import attendance_status, session_attendance_reference
+from utils.attendance_summary import refresh_attendance_summary
 
-from models.models_tenant import AttendancePunch, AttendanceRule, Shift, EmployeeRoster
+from models.models_tenant import AttendancePunch, EmployeeRoster
 from schemas.schemas_tenant import AttendancePunchCreate, AttendancePunchOut
 
 router = APIRouter(
@@ -14,6 +17,9 @@ router = APIRouter(
     tags=["Attendance - Punch Logs"]
 )
 
+PUNCH_INGEST_MAX_ROWS = int(os.getenv("PUNCH_INGEST_MAX_ROWS", 20000))
+PUNCH_INGEST_CHUNK_SIZE = int(os.getenv("PUNCH_INGEST_CHUNK_SIZE", 1000))
+
 def calculate_attendance_status(employee_id: int, punch_date: str, in_time: time, out_time: Optional[time], db: Session) -> str:
     """Calculate attendance status based on shift timings and rules"""
     try:
@@ -26,50 +32,8 @@ def calculate_attendance_status(employee_id: int, punch_date: str, in_time: time
         if not roster:
             return 'Present'  # Default if no roster
         
-        shift = db.query(Shift).filter(Shift.id == roster.shift_id).first()
-        if not shift:
-            return 'Present'
-        
-        # Parse shift timings with error handling
-        try:
-            shift_start = datetime.strptime(str(shift.start_time), '%H:%M').time()
-            shift_end = datetime.strptime(str(shift.end_time), '%H:%M').time()
-        except (ValueError, TypeError):
-            return 'Present'  # Default if time format is invalid
-        
-        # Get active rules
-        late_rule = db.query(AttendanceRule).filter(
-            AttendanceRule.rule_type == 'Late',
-            AttendanceRule.is_active.is_(True)  # type: ignore
-        ).first()
-        
-        early_rule = db.query(AttendanceRule).filter(
-            AttendanceRule.rule_type == 'Early',
-            AttendanceRule.is_active.is_(True)  # type: ignore
-        ).first()
-        
-        # Convert to minutes for comparison
-        def to_minutes(t: time) -> int:
-            return t.hour * 60 + t.minute
-        
-        in_minutes = to_minutes(in_time) if in_time else None
-        out_minutes = to_minutes(out_time) if out_time else None
-        shift_start_minutes = to_minutes(shift_start)
-        shift_end_minutes = to_minutes(shift_end)
-        
-        # Check Late (check-in after shift start + grace)
-        if in_minutes is not None and late_rule is not None:  # type: ignore
-            late_threshold = shift_start_minutes + late_rule.value
-            if in_minutes > late_threshold:
-                return 'Late'
-        
-        # Check Early (check-out before shift end - grace)
-        if out_minutes is not None and early_rule is not None:  # type: ignore
-            early_threshold = shift_end_minutes - early_rule.value
-            if out_minutes < early_threshold:
-                return 'Early'
-        
-        return 'Present'
+        # Shifts and rules come from the per-tenant reference cache
+        return attendance_status(session_attendance_reference(db), roster.shift_id, in_time, out_time)
     
     except Exception:
         return 'Present'  # Safe default on any error
@@ -100,6 +64,8 @@ def create_punch(
         
         punch = AttendancePunch(**punch_data)
         db.add(punch)
+        db.flush()
+        refresh_attendance_summary(db, [(punch.employee_id, punch.date)])
         db.commit()
         db.refresh(punch)
         
@@ -115,6 +81,54 @@ def create_punch(
         raise HTTPException(status_code=500, detail=f"Failed to create punch record: {str(e)}")
 
 
+@router.post("/bulk")
+async def ingest_punch_batch(
+    request: Request,
+    db: AsyncTenantSession = Depends(get_tenant_db_async)
+):
+    """
+    Device sync: a JSON array (or {"punches": [...]}) or CSV with a header row.
+    Rows carry employee_id or employee_code, and date with in_time/out_time or a
+    raw punch_time. Summary counts are per punch record; results are per input row.
+    """
+    from .punch_ingest import PunchPayloadError, parse_punch_payload
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        upload = (await request.form()).get("file")
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Upload the batch as 'file'")
+        body = await upload.read()
+        content_type = "text/csv" if (upload.filename or "").lower().endswith(".csv") else "application/json"
+    else:
+        body = await request.body()
+
+    try:
+        rows = parse_punch_payload(body, content_type)
+    except (PunchPayloadError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(rows) > PUNCH_INGEST_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {PUNCH_INGEST_MAX_ROWS} punches per batch")
+
+    return await db.run(_ingest_punch_batch, rows, request)
+
+
+def _ingest_punch_batch(db: Session, rows: list, request: Request):
+    from .punch_ingest import ingest_punches
+
+    try:
+        result = ingest_punches(db, rows, chunk_size=PUNCH_INGEST_CHUNK_SIZE)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to ingest punches: {str(e)}")
+
+    # one audit row per batch instead of one per punch
+    audit_crud(request, "nutryah", {"id": 1}, "BULK_INGEST_ATTENDANCE_PUNCHES", "attendance_punches", None, None, result["summary"])
+
+    return result
+
+
 @router.get("/", response_model=list[AttendancePunchOut])
 def get_all_punches(
     limit: int = 100,
@@ -163,9 +177,14 @@ def update_punch(
                 db
             )
     
+    # the summary rows of both the old and the new employee-month can change
+    summary_keys = [(punch.employee_id, punch.date)]
     for key, value in update_data.items():
         setattr(punch, key, value)
+    summary_keys.append((punch.employee_id, punch.date))
     
+    db.flush()
+    refresh_attendance_summary(db, summary_keys)
     db.commit()
     db.refresh(punch)
     
@@ -3,13 +3,13 @@ from sqlalchemy.orm import Session
 from database import get_tenant_db
 from utils.audit_logger import audit_crud
 
-from models.models_tenant import AttendanceRegularization, AttendancePunch, PayrollRun
+from models.models_tenant import AttendanceRegularization, PayrollRun
+from utils.attendance_summary import employee_month_attendance
 from schemas.schemas_tenant import (
     AttendanceRegularizationCreate,
     AttendanceRegularizationOut
 )
 from datetime import datetime
-from sqlalchemy import func
 
 router = APIRouter(
     prefix="/attendance/regularizations",
@@ -79,13 +79,8 @@ def sync_attendance_to_payroll(db: Session, employee_id: int, date):
     """Auto sync attendance data to payroll"""
     month = f"{date.year}-{date.month:02d}"
     
-    # Count present days for the month
-    present_count = db.query(func.count(AttendancePunch.id)).filter(
-        AttendancePunch.employee_id == employee_id,
-        func.extract('year', AttendancePunch.date) == date.year,
-        func.extract('month', AttendancePunch.date) == date.month,
-        AttendancePunch.status.in_(['Present', 'Late'])
-    ).scalar()
+    # Present and Late days for the month, from the monthly summary
+    present_count = employee_month_attendance(db, employee_id, date.year, date.month)["attended_days"]
     
     # Update or create payroll run
     payroll = db.query(PayrollRun).filter(
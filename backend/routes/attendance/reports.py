@@ -1,46 +1,246 @@
-from fastapi import APIRouter, Depends
+import os
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, tuple_
 from database import get_tenant_db
 
-from models.models_tenant import AttendancePunch
+from typing import Optional
+
+from models.models_tenant import AttendanceDailyTotals, AttendanceMonthlySummary, AttendancePunch, User
+from utils.pagination import page_limit
 
 router = APIRouter(
     prefix="/attendance/reports",
     tags=["Attendance - Reports"]
 )
 
+DAILY_REPORT_MAX_DAYS = int(os.getenv("DAILY_REPORT_MAX_DAYS", 366))
+DAILY_REPORT_PAGE_SIZE = 200
+
+DAILY_REPORT_COLUMNS = ["id", "employee_id", "date", "in_time", "out_time", "location", "source", "status"]
+
+
+# -------------------------------------------------------------------------
+# DAILY REPORT
+# -------------------------------------------------------------------------
+def report_range(start_date: Optional[str], end_date: Optional[str]) -> tuple:
+    """Parse the requested range; defaults to today and is capped at DAILY_REPORT_MAX_DAYS"""
+    try:
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else date.today()
+        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else end
+    except ValueError:
+        raise HTTPException(400, "Dates must be YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(400, "start_date must not be after end_date")
+    if (end - start).days >= DAILY_REPORT_MAX_DAYS:
+        raise HTTPException(400, f"Date range is limited to {DAILY_REPORT_MAX_DAYS} days")
+    return start, end
+
+
+def report_filters(start: date, end: date, department_id: Optional[int] = None,
+                   status: Optional[str] = None, employee_id: Optional[int] = None) -> list:
+    conditions = [AttendancePunch.date.between(start, end)]
+    if employee_id is not None:
+        conditions.append(AttendancePunch.employee_id == employee_id)
+    if status:
+        conditions.append(AttendancePunch.status == status)
+    if department_id is not None:
+        conditions.append(AttendancePunch.employee_id.in_(
+            select(User.id).where(User.department_id == department_id)
+        ))
+    return conditions
+
+
+def parse_cursor(after: Optional[str]) -> Optional[tuple]:
+    """'YYYY-MM-DD:employee_id:id' as returned in next_cursor"""
+    if not after:
+        return None
+    try:
+        day, employee_id, punch_id = after.split(":")
+        return datetime.strptime(day, "%Y-%m-%d").date(), int(employee_id), int(punch_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+
+def daily_rows_query(conditions: list, after: Optional[tuple] = None, limit: Optional[int] = None):
+    """Punch rows in (date, employee_id, id) order, continuing after a keyset cursor"""
+    query = select(*(getattr(AttendancePunch, name) for name in DAILY_REPORT_COLUMNS)).where(*conditions)
+    key = (AttendancePunch.date, AttendancePunch.employee_id, AttendancePunch.id)
+    if after is not None:
+        query = query.where(tuple_(*key) > tuple_(*after))
+    query = query.order_by(*key)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def daily_row(row) -> dict:
+    return {
+        "id": row.id,
+        "employee_id": row.employee_id,
+        "date": row.date.isoformat() if row.date is not None else None,
+        "in_time": row.in_time.strftime("%H:%M:%S") if row.in_time is not None else None,
+        "out_time": row.out_time.strftime("%H:%M:%S") if row.out_time is not None else None,
+        "location": row.location,
+        "source": row.source,
+        "status": row.status
+    }
+
+
+def daily_totals(db: Session, start: date, end: date, status: Optional[str] = None,
+                 scope: Optional[list] = None) -> list:
+    """Punch counts per day and status.
+
+    Tenant-wide ranges read the precomputed attendance_daily_totals rows. An
+    employee or department scope (the report conditions) has no stored totals,
+    so its punches are grouped in the database from the (date, status) index.
+    """
+    if scope is None:
+        query = select(AttendanceDailyTotals.date, AttendanceDailyTotals.status,
+                       AttendanceDailyTotals.punches).where(AttendanceDailyTotals.date.between(start, end))
+        if status:
+            query = query.where(AttendanceDailyTotals.status == status)
+        rows = db.execute(query.order_by(AttendanceDailyTotals.date))
+    else:
+        rows = db.execute(
+            select(AttendancePunch.date, AttendancePunch.status, func.count().label("punches"))
+            .where(*scope)
+            .group_by(AttendancePunch.date, AttendancePunch.status)
+            .order_by(AttendancePunch.date)
+        )
+    days = {}
+    for row in rows:
+        day = days.setdefault(row.date, {"date": row.date.isoformat(), "total": 0, "by_status": {}})
+        day["total"] += row.punches
+        day["by_status"][row.status or "Unknown"] = row.punches
+    return list(days.values())
+
+
+def totals_scope(conditions: list, department_id: Optional[int], employee_id: Optional[int]) -> Optional[list]:
+    """The report conditions when they narrow below the whole tenant, else None"""
+    return conditions if department_id is not None or employee_id is not None else None
+
+
+def iter_daily_report(db: Session, conditions: list, fmt: str, batch_size: int = 1000):
+    """Yield the filtered rows as NDJSON or CSV, reading through a server-side cursor"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(DAILY_REPORT_COLUMNS)
+
+    # Own connection so the stream does not depend on the request session staying open
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(
+            daily_rows_query(conditions)
+        )
+        for partition in result.partitions(batch_size):
+            for row in partition:
+                item = daily_row(row)
+                if fmt == "csv":
+                    writer.writerow([item[name] for name in DAILY_REPORT_COLUMNS])
+                else:
+                    buffer.write(json.dumps(item) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
 
 @router.get("/daily")
 def daily_report(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    department_id: Optional[int] = None,
+    status: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    fmt: str = Query("json", alias="format"),
     db: Session = Depends(get_tenant_db)
 ):
-    punches = db.query(AttendancePunch).all()
-    return [{
-        "id": p.id,
-        "employee_id": p.employee_id,
-        "date": p.date.isoformat() if p.date is not None else None,
-        "in_time": p.in_time.strftime("%H:%M:%S") if p.in_time is not None else None,
-        "out_time": p.out_time.strftime("%H:%M:%S") if p.out_time is not None else None,
-        "location": p.location,
-        "source": p.source,
-        "status": p.status
-    } for p in punches]
+    """Punch rows for a date range, a page at a time; format=ndjson|csv streams the whole range"""
+    if fmt not in ("json", "ndjson", "csv"):
+        raise HTTPException(400, "format must be json, ndjson or csv")
+    start, end = report_range(start_date, end_date)
+    conditions = report_filters(start, end, department_id, status, employee_id)
+
+    if fmt != "json":
+        filename = f"attendance_daily_{start}_{end}.{fmt}"
+        return StreamingResponse(
+            iter_daily_report(db, conditions, fmt),
+            media_type="text/csv" if fmt == "csv" else "application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    limit = page_limit(limit or DAILY_REPORT_PAGE_SIZE)
+    cursor = parse_cursor(after)
+    rows = db.execute(daily_rows_query(conditions, cursor, limit)).all()
+
+    response = {
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "rows": [daily_row(r) for r in rows],
+        "next_cursor": f"{rows[-1].date}:{rows[-1].employee_id}:{rows[-1].id}" if len(rows) == limit else None,
+    }
+    # totals cover the whole range, so only the first page carries them
+    if cursor is None:
+        response["days"] = daily_totals(db, start, end, status, totals_scope(conditions, department_id, employee_id))
+    return response
+
+
+@router.get("/daily/totals")
+def daily_report_totals(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    department_id: Optional[int] = None,
+    status: Optional[str] = None,
+    employee_id: Optional[int] = None,
+    db: Session = Depends(get_tenant_db)
+):
+    """Per-day punch counts by status, without the rows"""
+    start, end = report_range(start_date, end_date)
+    conditions = report_filters(start, end, department_id, status, employee_id)
+    days = daily_totals(db, start, end, status, totals_scope(conditions, department_id, employee_id))
+    return {"start_date": start.isoformat(), "end_date": end.isoformat(), "days": days}
 
 
 @router.get("/monthly")
 def monthly_summary(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
     db: Session = Depends(get_tenant_db)
 ):
-    results = (
-        db.query(
-            AttendancePunch.employee_id,
-            func.count(AttendancePunch.id).label("total_days")
-        )
-        .group_by(AttendancePunch.employee_id)
-        .all()
+    """Per-employee totals from attendance_monthly_summary, for one month/year or all time"""
+    query = db.query(
+        AttendanceMonthlySummary.employee_id,
+        func.sum(AttendanceMonthlySummary.punched_days).label("total_days"),
+        func.sum(AttendanceMonthlySummary.present_days).label("present_days"),
+        func.sum(AttendanceMonthlySummary.late_days).label("late_days"),
+        func.sum(AttendanceMonthlySummary.early_days).label("early_days"),
+        func.sum(AttendanceMonthlySummary.absent_days).label("absent_days"),
+        func.sum(AttendanceMonthlySummary.worked_minutes).label("worked_minutes"),
+        func.sum(AttendanceMonthlySummary.ot_minutes).label("ot_minutes"),
     )
+    if year is not None:
+        query = query.filter(AttendanceMonthlySummary.year == year)
+    if month is not None:
+        query = query.filter(AttendanceMonthlySummary.month == month)
+
+    results = query.group_by(AttendanceMonthlySummary.employee_id).all()
     return [{
         "employee_id": r.employee_id,
-        "total_days": r.total_days
+        "total_days": int(r.total_days or 0),
+        "present_days": int(r.present_days or 0),
+        "late_days": int(r.late_days or 0),
+        "early_days": int(r.early_days or 0),
+        "absent_days": int(r.absent_days or 0),
+        "worked_hours": round((r.worked_minutes or 0) / 60, 2),
+        "ot_hours": round((r.ot_minutes or 0) / 60, 2),
     } for r in results]
@@ -1,29 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import exists, or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
-from models.models_tenant import EmployeeRoster, NightShiftRule, Shift, Employee, User, OnCallDuty, EmergencyCallLog
+from utils.pagination import page_limit, keyset_page
+from .roster_engine import RosterGenerationError, copy_roster, expand_blocks, generate_rotation
+from models.models_tenant import (
+    Department, EmployeeRoster, NightShiftRule, Shift, Employee, User, OnCallDuty, EmergencyCallLog
+)
 
 router = APIRouter(prefix="/roster", tags=["Roster Management"])
 
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 # Note: Shifts are fetched from /shifts/{tenant}/list endpoint (organization setup)
 # No need to duplicate shift fetching here
 
@@ -33,9 +24,9 @@ def get_tenant_session(user):
 @router.get("/employees")
 def get_employees(
     department: Optional[str] = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         query = db.query(Employee).filter(Employee.status == "Active")
         if department:
@@ -51,61 +42,103 @@ def get_employees(
 # -------------------------------------------------------------------------
 # 3. GET ROSTER FOR DATE RANGE
 # -------------------------------------------------------------------------
+def roster_grid(db: Session, start_dt: date, end_dt: date, department: Optional[str] = None,
+                after_id: Optional[int] = None, limit: Optional[int] = None) -> tuple:
+    """Rostered employees (keyset by id) and a date-indexed [(shift_id, status) | None] row for each"""
+    rostered = exists().where(
+        EmployeeRoster.employee_id == User.id,
+        EmployeeRoster.date.between(start_dt, end_dt)
+    )
+    emp_query = db.query(User.id, User.name, Department.name.label("department")).outerjoin(
+        Department, Department.id == User.department_id
+    ).filter(rostered).order_by(User.id)
+    if department:
+        emp_query = emp_query.filter(User.department_id == int(department))
+    if after_id is not None:
+        emp_query = emp_query.filter(User.id > after_id)
+    if limit is not None:
+        emp_query = emp_query.limit(limit)
+    employees = emp_query.all()
+
+    days = (end_dt - start_dt).days + 1
+    grid = {emp.id: [None] * days for emp in employees}
+    if grid:
+        entries = db.query(
+            EmployeeRoster.employee_id, EmployeeRoster.date, EmployeeRoster.shift_id, EmployeeRoster.status
+        ).filter(
+            EmployeeRoster.employee_id.in_(list(grid)),
+            EmployeeRoster.date.between(start_dt, end_dt)
+        )
+        # single pass: each entry lands directly in its employee's day slot
+        for employee_id, roster_date, shift_id, status in entries:
+            grid[employee_id][(roster_date - start_dt).days] = (shift_id, status)
+    return employees, grid
+
+
 @router.get("/schedule")
 def get_roster_schedule(
     start_date: str,
     end_date: str,
     department: Optional[str] = None,
-    user=Depends(get_current_user)
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    format: str = "full",
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         # Convert string dates to date objects
         start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
         end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
-        
-        # Get roster data first
-        roster_data = db.query(EmployeeRoster).filter(
-            EmployeeRoster.date >= start_dt,
-            EmployeeRoster.date <= end_dt
-        ).all()
-        
-        # Get unique employee IDs from roster data
-        employee_ids = list(set([r.employee_id for r in roster_data]))
-        
-        # Get only users who have roster entries
-        if employee_ids:
-            emp_query = db.query(User).filter(User.id.in_(employee_ids))
-            if department:
-                emp_query = emp_query.filter(User.department_id == int(department))
-            employees = emp_query.all()
-        else:
-            employees = []
-        
-        # Get shifts from organization setup
-        shifts = db.query(Shift).all()
-        shift_map = {shift.id: shift for shift in shifts}
-        
-        # Organize data by employee
+        if start_dt > end_dt:
+            raise HTTPException(400, "start_date must not be after end_date")
+        if format not in ("full", "compact"):
+            raise HTTPException(400, "format must be full or compact")
+
+        limit = page_limit(limit)
+        employees, grid = roster_grid(db, start_dt, end_dt, department, after_id, limit)
+        page = keyset_page([{"id": emp.id} for emp in employees], limit)
+
+        shift_ids = {cell[0] for row in grid.values() for cell in row if cell is not None}
+        shift_map = {}
+        if shift_ids:
+            shift_map = {shift.id: shift for shift in db.query(Shift).filter(Shift.id.in_(shift_ids))}
+        days = (end_dt - start_dt).days + 1
+        dates = [(start_dt + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days)]
+
+        if format == "compact":
+            # one shift id per employee per day; statuses other than Scheduled are listed sparsely
+            return {
+                "dates": dates,
+                "shifts": {
+                    shift_id: {"name": shift.name, "start_time": shift.start_time, "end_time": shift.end_time}
+                    for shift_id, shift in shift_map.items()
+                },
+                "employees": [
+                    {"employee_id": emp.id, "employee_name": emp.name, "department": emp.department or "Unknown"}
+                    for emp in employees
+                ],
+                "matrix": [[cell[0] if cell else None for cell in grid[emp.id]] for emp in employees],
+                "statuses": [
+                    [row, col, cell[1]]
+                    for row, emp in enumerate(employees)
+                    for col, cell in enumerate(grid[emp.id])
+                    if cell is not None and cell[1] != "Scheduled"
+                ],
+                **page
+            }
+
         result = []
         for emp in employees:
-            emp_roster = [r for r in roster_data if r.employee_id == emp.id]
-            roster_dict = {r.date.strftime("%Y-%m-%d"): r for r in emp_roster}
-            
-            # Generate date range
-            current_date = start_dt
             schedule = []
-            while current_date <= end_dt:
-                date_str = current_date.strftime("%Y-%m-%d")
-                roster_entry = roster_dict.get(date_str)
-                
-                if roster_entry:
-                    shift_info = shift_map.get(roster_entry.shift_id)
+            for date_str, cell in zip(dates, grid[emp.id]):
+                if cell:
+                    shift_info = shift_map.get(cell[0])
                     schedule.append({
                         "date": date_str,
-                        "shift_id": roster_entry.shift_id,
+                        "shift_id": cell[0],
                         "shift_name": shift_info.name if shift_info else "Unknown",
-                        "status": roster_entry.status
+                        "status": cell[1]
                     })
                 else:
                     schedule.append({
@@ -114,18 +147,18 @@ def get_roster_schedule(
                         "shift_name": "Not Assigned",
                         "status": "Unscheduled"
                     })
-                
-                current_date += timedelta(days=1)
-            
+
             result.append({
                 "employee_id": emp.id,
                 "employee_name": emp.name,
-                "department": emp.department.name if emp.department else "Unknown",
+                "department": emp.department or "Unknown",
                 "schedule": schedule
             })
-        
-        return {"roster": result}
-        
+
+        return {"roster": result, **page}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Error fetching roster: {str(e)}")
     finally:
@@ -142,6 +175,28 @@ class RosterEntryRequest(BaseModel):
     shift_id: Optional[int] = None
     status: str = "Scheduled"
 
+class RosterCopyRequest(BaseModel):
+    source_start: str
+    source_end: str
+    target_start: str
+    target_end: Optional[str] = None
+    employee_ids: Optional[List[int]] = None
+    department_id: Optional[int] = None
+    overwrite: bool = False
+
+class RotationBlock(BaseModel):
+    shift_id: Optional[int] = None  # None = days off
+    days: int
+
+class RosterRotationRequest(BaseModel):
+    blocks: List[RotationBlock]
+    start_date: str
+    end_date: str
+    employee_ids: Optional[List[int]] = None
+    department_id: Optional[int] = None
+    stagger_days: int = 0
+    overwrite: bool = False
+
 class NightShiftRulesRequest(BaseModel):
     applicable_shifts: List[int]
     punch_out_rule: str
@@ -172,9 +227,9 @@ class EmergencyCallRequest(BaseModel):
 def save_roster_entry(
     request: RosterEntryRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         print(f"DEBUG: Saving roster entry: {request.dict()}")
         roster_date = datetime.strptime(request.date, "%Y-%m-%d").date()
@@ -225,42 +280,19 @@ def save_roster_entry(
 def copy_last_week_roster(
     start_date: str,
     request: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         current_start = datetime.strptime(start_date, "%Y-%m-%d").date()
-        last_week_start = current_start - timedelta(days=7)
-        last_week_end = current_start - timedelta(days=1)
-        
-        # Get last week's roster
-        last_week_roster = db.query(EmployeeRoster).filter(
-            EmployeeRoster.date >= last_week_start,
-            EmployeeRoster.date <= last_week_end
-        ).all()
-        
-        # Copy to current week
-        for entry in last_week_roster:
-            new_date = entry.date + timedelta(days=7)
-            
-            # Check if entry already exists
-            existing = db.query(EmployeeRoster).filter(
-                EmployeeRoster.employee_id == entry.employee_id,
-                EmployeeRoster.date == new_date
-            ).first()
-            
-            if not existing:
-                new_entry = EmployeeRoster(
-                    employee_id=entry.employee_id,
-                    shift_id=entry.shift_id,
-                    date=new_date,
-                    status=entry.status
-                )
-                db.add(new_entry)
-        
+
+        # days already rostered in the current week are kept
+        inserted = copy_roster(db, current_start - timedelta(days=7), current_start - timedelta(days=1), current_start)
+
         db.commit()
-        audit_crud(request, user.get("tenant_db"), user, "CREATE", "employee_roster", None, None, {"action": "copy_last_week", "start_date": start_date})
-        return {"message": "Last week roster copied successfully"}
+        audit_crud(request, user.get("tenant_db"), user, "CREATE", "employee_roster", None, None,
+                   {"action": "copy_last_week", "start_date": start_date, "inserted": inserted})
+        return {"message": "Last week roster copied successfully", "inserted": inserted}
         
     except Exception as e:
         db.rollback()
@@ -268,12 +300,107 @@ def copy_last_week_roster(
     finally:
         db.close()
 
+# -------------------------------------------------------------------------
+# 5a. COPY ANY RANGE / GENERATE ROTATION
+# -------------------------------------------------------------------------
+def parse_roster_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(400, f"Invalid date {value}, expected YYYY-MM-DD")
+
+
+@router.post("/copy")
+def copy_roster_range(
+    payload: RosterCopyRequest,
+    request: Request,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
+):
+    """Repeat a source range over a target range in one statement; rostered target days are skipped"""
+    try:
+        inserted = copy_roster(
+            db,
+            parse_roster_date(payload.source_start),
+            parse_roster_date(payload.source_end),
+            parse_roster_date(payload.target_start),
+            parse_roster_date(payload.target_end) if payload.target_end else None,
+            payload.employee_ids,
+            payload.department_id,
+            payload.overwrite
+        )
+        db.commit()
+        audit_crud(request, user.get("tenant_db"), user, "CREATE", "employee_roster", None, None,
+                   {"action": "copy", **payload.dict(exclude={"employee_ids"}), "inserted": inserted})
+        return {"message": "Roster copied successfully", "inserted": inserted}
+
+    except RosterGenerationError as e:
+        db.rollback()
+        raise HTTPException(400, str(e))
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(500, f"Error copying roster: {str(e)}")
+    finally:
+        db.close()
+
+
+@router.post("/rotation")
+def generate_roster_rotation(
+    payload: RosterRotationRequest,
+    request: Request,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
+):
+    """Roster employees on a repeating template, e.g. 4 days on / 2 off, written in bulk"""
+    try:
+        start_dt = parse_roster_date(payload.start_date)
+        end_dt = parse_roster_date(payload.end_date)
+        pattern = expand_blocks((block.shift_id, block.days) for block in payload.blocks)
+
+        shift_ids = {shift_id for shift_id in pattern if shift_id is not None}
+        known = {shift_id for (shift_id,) in db.query(Shift.id).filter(Shift.id.in_(shift_ids))}
+        if shift_ids - known:
+            raise HTTPException(400, f"Unknown shift ids: {sorted(shift_ids - known)}")
+
+        if payload.employee_ids:
+            employee_ids = list(dict.fromkeys(payload.employee_ids))
+        elif payload.department_id is not None:
+            employee_ids = [emp_id for (emp_id,) in db.query(User.id).filter(
+                User.department_id == payload.department_id,
+                or_(User.status.is_(None), User.status == "Active")
+            ).order_by(User.id)]
+        else:
+            raise HTTPException(400, "employee_ids or department_id is required")
+
+        inserted = generate_rotation(db, pattern, employee_ids, start_dt, end_dt, payload.stagger_days,
+                                     payload.overwrite)
+        db.commit()
+        audit_crud(request, user.get("tenant_db"), user, "CREATE", "employee_roster", None, None, {
+            "action": "rotation", **payload.dict(exclude={"employee_ids"}),
+            "employees": len(employee_ids), "inserted": inserted
+        })
+        return {"message": "Rotation generated successfully", "employees": len(employee_ids), "inserted": inserted}
+
+    except RosterGenerationError as e:
+        db.rollback()
+        raise HTTPException(400, str(e))
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(500, f"Error generating rotation: {str(e)}")
+    finally:
+        db.close()
+
 # -------------------------------------------------------------------------
 # 6. NIGHT SHIFT RULES
 # -------------------------------------------------------------------------
 @router.get("/night-shift-rules")
-def get_night_shift_rules(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_night_shift_rules(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         rules = db.query(NightShiftRule).first()
         if not rules:
@@ -293,9 +420,9 @@ def get_night_shift_rules(user=Depends(get_current_user)):
 def save_night_shift_rules(
     request: NightShiftRulesRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         rules = db.query(NightShiftRule).first()
         if rules:
@@ -325,9 +452,8 @@ def save_night_shift_rules(
         db.close()
 
 @router.get("/night-shift-rules/list")
-def list_night_shift_rules(user=Depends(get_current_user)):
+def list_night_shift_rules(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     """Get all night shift rules"""
-    db = get_tenant_session(user)
     try:
         rules = db.query(NightShiftRule).all()
         return {"rules": rules}
@@ -337,9 +463,8 @@ def list_night_shift_rules(user=Depends(get_current_user)):
         db.close()
 
 @router.get("/night-shift-rules/{rule_id}")
-def get_night_shift_rule(rule_id: int, user=Depends(get_current_user)):
+def get_night_shift_rule(rule_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     """Get specific night shift rule by ID"""
-    db = get_tenant_session(user)
     try:
         rule = db.query(NightShiftRule).filter(NightShiftRule.id == rule_id).first()
         if not rule:
@@ -357,10 +482,10 @@ def update_night_shift_rule(
     rule_id: int,
     request: NightShiftRulesRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Update specific night shift rule"""
-    db = get_tenant_session(user)
     try:
         rule = db.query(NightShiftRule).filter(NightShiftRule.id == rule_id).first()
         if not rule:
@@ -385,9 +510,8 @@ def update_night_shift_rule(
         db.close()
 
 @router.delete("/night-shift-rules/{rule_id}")
-def delete_night_shift_rule(rule_id: int, request: Request, user=Depends(get_current_user)):
+def delete_night_shift_rule(rule_id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     """Delete specific night shift rule"""
-    db = get_tenant_session(user)
     try:
         rule = db.query(NightShiftRule).filter(NightShiftRule.id == rule_id).first()
         if not rule:
@@ -411,8 +535,7 @@ def delete_night_shift_rule(rule_id: int, request: Request, user=Depends(get_cur
 # DEBUG: CHECK ROSTER TABLE
 # -------------------------------------------------------------------------
 @router.get("/debug/roster-table")
-def debug_roster_table(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def debug_roster_table(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         # Get all roster entries
         roster_entries = db.query(EmployeeRoster).all()
@@ -444,10 +567,10 @@ def debug_roster_table(user=Depends(get_current_user)):
 def get_on_call_duties(
     date: Optional[str] = None,
     department_id: Optional[int] = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Get on-call duties for a specific date or date range"""
-    db = get_tenant_session(user)
     try:
         query = db.query(OnCallDuty)
         
@@ -461,9 +584,11 @@ def get_on_call_duties(
         duties = query.all()
         
         # Get employee details
+        employee_ids = {duty.employee_id for duty in duties}
+        employees = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))} if employee_ids else {}
         result = []
         for duty in duties:
-            employee = db.query(User).filter(User.id == duty.employee_id).first()
+            employee = employees.get(duty.employee_id)
             result.append({
                 "id": duty.id,
                 "employee_id": duty.employee_id,
@@ -488,10 +613,10 @@ def get_on_call_duties(
 def create_on_call_duty(
     request: OnCallDutyRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Create new on-call duty assignment"""
-    db = get_tenant_session(user)
     try:
         duty_date = datetime.strptime(request.date, "%Y-%m-%d").date()
         from_time = datetime.strptime(request.from_time, "%H:%M").time()
@@ -527,10 +652,10 @@ def update_on_call_duty(
     duty_id: int,
     request: OnCallDutyRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Update on-call duty"""
-    db = get_tenant_session(user)
     try:
         duty = db.query(OnCallDuty).filter(OnCallDuty.id == duty_id).first()
         if not duty:
@@ -566,10 +691,10 @@ def update_on_call_duty(
 def delete_on_call_duty(
     duty_id: int,
     request: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Delete on-call duty"""
-    db = get_tenant_session(user)
     try:
         duty = db.query(OnCallDuty).filter(OnCallDuty.id == duty_id).first()
         if not duty:
@@ -597,10 +722,10 @@ def delete_on_call_duty(
 def log_emergency_call(
     request: EmergencyCallRequest,
     req: Request,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Log an emergency call"""
-    db = get_tenant_session(user)
     try:
         call_time = datetime.strptime(request.call_time, "%Y-%m-%d %H:%M:%S")
         
@@ -630,10 +755,10 @@ def log_emergency_call(
 def get_emergency_calls(
     duty_id: Optional[int] = None,
     employee_id: Optional[int] = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
     """Get emergency call logs"""
-    db = get_tenant_session(user)
     try:
         query = db.query(EmergencyCallLog)
         
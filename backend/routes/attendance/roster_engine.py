@@ -0,0 +1,146 @@
+"""
+Roster generation.
+
+Copies and rotation templates write employee_roster in bulk. A copy maps a
+source date range onto a target range and tiles it when the target is longer.
+It runs as one INSERT IGNORE ... SELECT inside the database, so the unique
+(employee_id, date) key skips days that are already rostered. A rotation
+template is a repeating list of shift ids, with None for days off. It is
+expanded per employee, optionally staggered, and streamed out as multi-row
+INSERTs, so only one chunk of rows is held in memory. With overwrite the
+target days of the employees in scope are cleared first. Callers commit.
+"""
+import math
+from itertools import islice
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from models.models_tenant import EmployeeRoster
+
+roster_table = EmployeeRoster.__table__
+
+# Days a single copy or rotation may write
+ROSTER_GENERATE_MAX_DAYS = 366
+ROSTER_INSERT_CHUNK = 5000
+
+
+class RosterGenerationError(ValueError):
+    """The requested copy or rotation cannot be generated"""
+
+
+def _scope(column: str, employee_ids: Optional[Sequence[int]], department_id: Optional[int]) -> tuple:
+    """SQL condition limiting a roster statement to the requested employees"""
+    if employee_ids:
+        return f"AND {column} IN :employee_ids", {"employee_ids": list(employee_ids)}
+    if department_id is not None:
+        return (f"AND {column} IN (SELECT id FROM users WHERE department_id = :department_id)",
+                {"department_id": department_id})
+    return "", {}
+
+
+def _statement(sql: str, params: dict):
+    stmt = text(sql)
+    if "employee_ids" in params:
+        stmt = stmt.bindparams(bindparam("employee_ids", expanding=True))
+    return stmt
+
+
+def clear_roster(db: Session, start: date, end: date, employee_ids: Optional[Sequence[int]] = None,
+                 department_id: Optional[int] = None) -> int:
+    """Delete roster days in [start, end] for the employees in scope"""
+    scope, params = _scope("employee_id", employee_ids, department_id)
+    result = db.execute(
+        _statement(f"DELETE FROM employee_roster WHERE date BETWEEN :start AND :end {scope}", params),
+        {**params, "start": start, "end": end}
+    )
+    return result.rowcount
+
+
+def copy_roster(db: Session, source_start: date, source_end: date, target_start: date,
+                target_end: Optional[date] = None, employee_ids: Optional[Sequence[int]] = None,
+                department_id: Optional[int] = None, overwrite: bool = False) -> int:
+    """Repeat the source range over the target range (default: same length); returns rows inserted"""
+    period = (source_end - source_start).days + 1
+    if period < 1:
+        raise RosterGenerationError("source_end must not be before source_start")
+    target_end = target_end or target_start + timedelta(days=period - 1)
+    target_days = (target_end - target_start).days + 1
+    if target_days < 1:
+        raise RosterGenerationError("target_end must not be before target_start")
+    if target_days > ROSTER_GENERATE_MAX_DAYS:
+        raise RosterGenerationError(f"Target range is limited to {ROSTER_GENERATE_MAX_DAYS} days")
+    if target_start <= source_end and source_start <= target_end:
+        raise RosterGenerationError("Source and target ranges must not overlap")
+
+    if overwrite:
+        clear_roster(db, target_start, target_end, employee_ids, department_id)
+
+    # one row per repetition of the source range, cross joined with the source rows
+    repeats = " UNION ALL ".join(f"SELECT {k} AS k" for k in range(math.ceil(target_days / period)))
+    scope, params = _scope("r.employee_id", employee_ids, department_id)
+    result = db.execute(_statement(f"""
+        INSERT IGNORE INTO employee_roster (employee_id, shift_id, date, status, created_at)
+        SELECT r.employee_id, r.shift_id, DATE_ADD(r.date, INTERVAL :offset + reps.k * :period DAY), r.status, NOW()
+        FROM employee_roster r
+        CROSS JOIN ({repeats}) reps
+        WHERE r.date BETWEEN :source_start AND :source_end
+          AND DATE_ADD(r.date, INTERVAL :offset + reps.k * :period DAY) BETWEEN :target_start AND :target_end
+          {scope}
+    """, params), {
+        **params,
+        "offset": (target_start - source_start).days, "period": period,
+        "source_start": source_start, "source_end": source_end,
+        "target_start": target_start, "target_end": target_end,
+    })
+    return result.rowcount
+
+
+def expand_blocks(blocks: Iterable[tuple]) -> List[Optional[int]]:
+    """[(shift_id, days), ...] -> one shift id (or None for off) per day of the cycle"""
+    pattern = []
+    for shift_id, days in blocks:
+        if days < 1:
+            raise RosterGenerationError("Every rotation block needs at least one day")
+        pattern.extend([shift_id] * days)
+    if not any(shift_id is not None for shift_id in pattern):
+        raise RosterGenerationError("Rotation has no working days")
+    return pattern
+
+
+def rotation_rows(pattern: Sequence[Optional[int]], employee_ids: Sequence[int], start: date, end: date,
+                  stagger_days: int = 0, status: str = "Scheduled") -> Iterator[dict]:
+    """Roster rows for each employee following the pattern from start, shifted by stagger_days per employee"""
+    period = len(pattern)
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    for index, employee_id in enumerate(employee_ids):
+        phase = index * stagger_days
+        for offset, day in enumerate(days):
+            shift_id = pattern[(offset + phase) % period]
+            if shift_id is not None:
+                yield {"employee_id": employee_id, "shift_id": shift_id, "date": day, "status": status}
+
+
+def generate_rotation(db: Session, pattern: Sequence[Optional[int]], employee_ids: Sequence[int],
+                      start: date, end: date, stagger_days: int = 0, overwrite: bool = False,
+                      chunk_size: int = ROSTER_INSERT_CHUNK) -> int:
+    """Write a rotation for the employees over [start, end]; returns rows inserted"""
+    if end < start:
+        raise RosterGenerationError("end_date must not be before start_date")
+    if (end - start).days + 1 > ROSTER_GENERATE_MAX_DAYS:
+        raise RosterGenerationError(f"Date range is limited to {ROSTER_GENERATE_MAX_DAYS} days")
+    if not employee_ids:
+        return 0
+
+    if overwrite:
+        clear_roster(db, start, end, employee_ids)
+
+    rows = rotation_rows(pattern, employee_ids, start, end, stagger_days)
+    insert = roster_table.insert().prefix_with("IGNORE")
+    inserted = 0
+    # pymysql sends each chunk as one multi-row INSERT
+    while chunk := list(islice(rows, chunk_size)):
+        inserted += db.execute(insert, chunk).rowcount
+    return inserted
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from database import get_tenant_db
 from utils.audit_logger import audit_crud
+from utils.attendance_reference import invalidate_attendance_reference
 
 from models.models_tenant import AttendanceRule
 from schemas.schemas_tenant import AttendanceRuleCreate, AttendanceRuleOut
@@ -12,6 +13,11 @@ router = APIRouter(
 )
 
 
+def _invalidate_rules(db: Session):
+    """Punch status calculation caches active rules per tenant"""
+    invalidate_attendance_reference(str(db.get_bind().url.database))
+
+
 @router.post("/", response_model=AttendanceRuleOut)
 def create_rule(
     data: AttendanceRuleCreate,
@@ -22,6 +28,7 @@ def create_rule(
     db.add(rule)
     db.commit()
     db.refresh(rule)
+    _invalidate_rules(db)
     audit_crud(request, "tenant_db", {"email": "system"}, "CREATE", "attendance_rules", rule.id, None, rule.__dict__)
     return rule
 
@@ -46,6 +53,7 @@ def toggle_rule(
     setattr(rule, 'is_active', not getattr(rule, 'is_active'))
     db.commit()
     db.refresh(rule)
+    _invalidate_rules(db)
     audit_crud(request, "tenant_db", {"email": "system"}, "UPDATE", "attendance_rules", rule_id, None, rule.__dict__)
     return rule
 
@@ -63,6 +71,7 @@ def delete_rule(
     old_values = rule.__dict__.copy()
     db.delete(rule)
     db.commit()
+    _invalidate_rules(db)
     audit_crud(request, "tenant_db", {"email": "system"}, "DELETE", "attendance_rules", rule_id, old_values, None)
     return {"message": "Rule deleted"}
 
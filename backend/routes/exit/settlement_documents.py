@@ -7,24 +7,9 @@ from datetime import date, datetime
 from pydantic import BaseModel
 
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from models.models_tenant import EmployeeSettlement, ExperienceLetter, EmployeeExit, User
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 router = APIRouter(prefix="/settlement", tags=["Settlement & Documents"])
 
 # ---------------------- SCHEMAS ----------------------
@@ -62,9 +47,7 @@ class ExperienceLetterCreate(BaseModel):
 # 1. CALCULATE & SAVE SETTLEMENT
 # -------------------------------------------------------------------------
 @router.post("/calculate")
-def calculate_settlement(data: SettlementCreate, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def calculate_settlement(data: SettlementCreate, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         # Check if settlement already exists
         existing = db.query(EmployeeSettlement).filter(
@@ -100,9 +83,7 @@ def calculate_settlement(data: SettlementCreate, user=Depends(get_current_user))
 # 2. APPROVE SETTLEMENT
 # -------------------------------------------------------------------------
 @router.put("/approve/{settlement_id}")
-def approve_settlement(settlement_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def approve_settlement(settlement_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     settlement = db.query(EmployeeSettlement).filter(EmployeeSettlement.id == settlement_id).first()
     if not settlement:
         raise HTTPException(404, "Settlement not found")
@@ -118,9 +99,7 @@ def approve_settlement(settlement_id: int, user=Depends(get_current_user)):
 # 3. GENERATE & SAVE EXPERIENCE LETTER
 # -------------------------------------------------------------------------
 @router.post("/experience-letter")
-def generate_experience_letter(data: ExperienceLetterCreate, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def generate_experience_letter(data: ExperienceLetterCreate, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         # Check if experience letter already exists
         existing = db.query(ExperienceLetter).filter(
@@ -156,9 +135,7 @@ def generate_experience_letter(data: ExperienceLetterCreate, user=Depends(get_cu
 # 4. UPDATE EMAIL STATUS
 # -------------------------------------------------------------------------
 @router.put("/experience-letter/{letter_id}/email")
-def update_email_status(letter_id: int, email_to: str, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def update_email_status(letter_id: int, email_to: str, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     letter = db.query(ExperienceLetter).filter(ExperienceLetter.id == letter_id).first()
     if not letter:
         raise HTTPException(404, "Experience letter not found")
@@ -175,9 +152,7 @@ def update_email_status(letter_id: int, email_to: str, user=Depends(get_current_
 # 5. GET SETTLEMENT BY RESIGNATION ID
 # -------------------------------------------------------------------------
 @router.get("/by-resignation/{resignation_id}")
-def get_settlement_by_resignation(resignation_id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
-    
+def get_settlement_by_resignation(resignation_id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     settlement = db.query(EmployeeSettlement).filter(
         EmployeeSettlement.resignation_id == resignation_id
     ).first()
@@ -74,6 +74,9 @@ from schemas.schemas_tenant import (
 import database
 from utils.token import create_access_token, create_refresh_token, verify_token
 from utils.audit_logger import log_error
+from utils.user_directory import find_user_tenant
+from utils.permissions import role_permissions
+from utils.tenant_bootstrap import provision_tenant
 
 router = APIRouter()
 
@@ -108,7 +111,11 @@ def check_permission(required_permission: str):
         if user.get('role') == 'admin':
             return user
         
-        user_permissions = user.get('permissions', [])
+        # Resolve from the role so permission changes apply without re-login
+        if user.get('role_id') is not None and user.get('tenant_db'):
+            user_permissions = role_permissions(user['tenant_db'], user['role_id'])
+        else:
+            user_permissions = user.get('permissions', [])
         if required_permission not in user_permissions:
             logger.warning(f"User {user.get('email')} lacks permission: {required_permission}")
             raise HTTPException(403, f"Permission denied: {required_permission} required")
@@ -156,9 +163,8 @@ def register_hospital(payload: HospitalRegister, db: Session = Depends(database.
         logger.info(f"Creating tenant database: {payload.tenant_db}")
         database.create_tenant_database(payload.tenant_db)
 
-        engine = database.get_tenant_engine(payload.tenant_db)
-        MasterBase.metadata.create_all(bind=engine)
-        logger.info("Tenant DB tables created")
+        provision_tenant(payload.tenant_db)
+        logger.info("Tenant DB tables created and migrated")
 
         seed_tenant(payload.tenant_db)
         logger.info("Tenant DB seeded successfully")
@@ -196,6 +202,10 @@ def register_hospital(payload: HospitalRegister, db: Session = Depends(database.
         db.refresh(hospital)
         logger.info(f"Hospital added to master DB with ID={hospital.id}")
 
+        # Drop any cached metadata left for this db_name by an earlier hospital
+        from utils.tenant_resolver import invalidate_tenant
+        invalidate_tenant(payload.tenant_db)
+
         admin = MasterUser(
             hospital_id=hospital.id,
             email=payload.email,
@@ -442,10 +452,10 @@ def login(response: Response, payload: AdminAuth, db: Session = Depends(database
             "permissions": []
         }
 
-    # TENANT USER LOGIN
-    hospitals = db.query(Hospital).all()
+    # TENANT USER LOGIN — the directory names the one tenant DB that owns this email
+    hosp = find_user_tenant(db, payload.email)
 
-    for hosp in hospitals:
+    if hosp:
         logger.info(f"Checking tenant DB {hosp.db_name} for user {payload.email}")
 
         engine = database.get_tenant_engine(str(hosp.db_name))
@@ -458,12 +468,7 @@ def login(response: Response, payload: AdminAuth, db: Session = Depends(database
                 logger.info(f"Tenant user login successful for {payload.email} in DB {hosp.db_name}")
 
                 # Get user permissions
-                role_permissions = tdb.query(RolePermission).filter(RolePermission.role_id == user.role_id).all()
-                permissions = []
-                for rp in role_permissions:
-                    perm = tdb.query(Permission).filter(Permission.id == rp.permission_id).first()
-                    if perm:
-                        permissions.append(str(perm.name))
+                permissions = sorted(role_permissions(str(hosp.db_name), user.role_id, tdb))
 
                 access = create_access_token({
                     "email": user.email,
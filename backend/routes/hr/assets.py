@@ -4,7 +4,7 @@ from typing import List, Optional
 import logging
 from datetime import datetime
 
-from database import get_tenant_db
+from database import AsyncTenantSession, get_tenant_db_async
 from utils.audit_logger import audit_crud
 from models.models_tenant import AssetAssignment
 from utils.email import send_email
@@ -15,9 +15,7 @@ router = APIRouter(prefix="/hr/assets", tags=["HR Assets"])
 
 
 
-@router.post("/pending")
-async def create_pending_asset(asset_data: dict, request: Request, db: Session = Depends(get_tenant_db)):
-    """Create a pending asset assignment request"""
+def _create_pending_asset(db: Session, asset_data: dict, request: Request):
     try:
         # Find user by employee_code
         from models.models_tenant import User
@@ -62,27 +60,39 @@ async def create_pending_asset(asset_data: dict, request: Request, db: Session =
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/pending")
-async def get_pending_assets(db: Session = Depends(get_tenant_db)):
-    """Get all pending asset assignments"""
+@router.post("/pending")
+async def create_pending_asset(asset_data: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Create a pending asset assignment request"""
+    return await db.run(_create_pending_asset, asset_data, request)
+
+def _get_pending_assets(db: Session):
     try:
         from models.models_tenant import User
         
         assets = db.query(AssetAssignment).filter(
             AssetAssignment.status == 'Pending'
         ).all()
+
+        employee_ids = {asset.employee_id for asset in assets}
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))} if employee_ids else {}
+        # Employees not found by id may have been stored by employee_code
+        missing_codes = {str(i) for i in employee_ids if i not in users}
+        users_by_code = {}
+        if missing_codes:
+            for u in db.query(User).filter(User.employee_code.in_(missing_codes)).order_by(User.id):
+                users_by_code.setdefault(u.employee_code, u)
         
         result = []
         for asset in assets:
             # Get employee details
-            user = db.query(User).filter(User.id == asset.employee_id).first()
+            user = users.get(asset.employee_id)
             
             if user:
                 employee_name = user.name
                 employee_code = user.employee_code
             else:
                 # Try to find by employee_code if stored as string
-                user_by_code = db.query(User).filter(User.employee_code == str(asset.employee_id)).first()
+                user_by_code = users_by_code.get(str(asset.employee_id))
                 if user_by_code:
                     employee_name = user_by_code.name
                     employee_code = user_by_code.employee_code
@@ -116,9 +126,12 @@ async def get_pending_assets(db: Session = Depends(get_tenant_db)):
         logger.error(f"❌ Error fetching pending assets: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/approve")
-async def approve_asset(approval_data: dict, request: Request, db: Session = Depends(get_tenant_db)):
-    """Approve or reject asset assignment"""
+@router.get("/pending")
+async def get_pending_assets(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Get all pending asset assignments"""
+    return await db.run(_get_pending_assets)
+
+def _approve_asset(db: Session, approval_data: dict, request: Request):
     try:
         from models.models_tenant import User
         
@@ -165,9 +178,12 @@ async def approve_asset(approval_data: dict, request: Request, db: Session = Dep
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/")
-async def get_approved_assets(db: Session = Depends(get_tenant_db)):
-    """Get all approved assets"""
+@router.post("/approve")
+async def approve_asset(approval_data: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Approve or reject asset assignment"""
+    return await db.run(_approve_asset, approval_data, request)
+
+def _get_approved_assets(db: Session):
     try:
         from models.models_tenant import User
         
@@ -204,9 +220,12 @@ async def get_approved_assets(db: Session = Depends(get_tenant_db)):
         logger.error(f"❌ Error fetching approved assets: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/")
-async def create_asset(asset_data: dict, request: Request, db: Session = Depends(get_tenant_db)):
-    """Create asset directly (legacy endpoint)"""
+@router.get("/")
+async def get_approved_assets(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Get all approved assets"""
+    return await db.run(_get_approved_assets)
+
+def _create_asset(db: Session, asset_data: dict, request: Request):
     try:
         asset_assignment = AssetAssignment(
             employee_id=int(asset_data.get('employeeId')) if asset_data.get('employeeId') else None,
@@ -238,4 +257,9 @@ async def create_asset(asset_data: dict, request: Request, db: Session = Depends
     except Exception as e:
         logger.error(f"❌ Error creating asset: {e}")
         db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/")
+async def create_asset(asset_data: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Create asset directly (legacy endpoint)"""
+    return await db.run(_create_asset, asset_data, request)
\ No newline at end of file
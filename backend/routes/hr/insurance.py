@@ -4,7 +4,7 @@ from typing import List, Optional
 import logging
 from datetime import datetime, date, timedelta
 
-from database import get_tenant_db
+from database import AsyncTenantSession, get_tenant_db_async
 from utils.audit_logger import audit_crud
 from models.models_tenant import EmployeeInsurance
 
@@ -12,9 +12,7 @@ logger = logging.getLogger("HRM")
 
 router = APIRouter(prefix="/hr/insurance", tags=["HR Insurance"])
 
-@router.post("/")
-async def create_insurance_policy(policy_data: dict, request: Request, db: Session = Depends(get_tenant_db)):
-    """Create a new insurance policy"""
+def _create_insurance_policy(db: Session, policy_data: dict, request: Request):
     try:
         # Find user by employee_code
         from models.models_tenant import User
@@ -54,9 +52,12 @@ async def create_insurance_policy(policy_data: dict, request: Request, db: Sessi
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/stats")
-async def get_insurance_stats(db: Session = Depends(get_tenant_db)):
-    """Get insurance statistics"""
+@router.post("/")
+async def create_insurance_policy(policy_data: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Create a new insurance policy"""
+    return await db.run(_create_insurance_policy, policy_data, request)
+
+def _get_insurance_stats(db: Session):
     try:
         today = date.today()
         thirty_days = today + timedelta(days=30)
@@ -86,18 +87,24 @@ async def get_insurance_stats(db: Session = Depends(get_tenant_db)):
         logger.error(f"❌ Error fetching insurance stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/")
-async def get_insurance_policies(db: Session = Depends(get_tenant_db)):
-    """Get all insurance policies"""
+@router.get("/stats")
+async def get_insurance_stats(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Get insurance statistics"""
+    return await db.run(_get_insurance_stats)
+
+def _get_insurance_policies(db: Session):
     try:
         from models.models_tenant import User
         
         policies = db.query(EmployeeInsurance).all()
+
+        employee_ids = {policy.employee_id for policy in policies}
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))} if employee_ids else {}
         
         result = []
         for policy in policies:
             # Get employee details
-            user = db.query(User).filter(User.id == policy.employee_id).first()
+            user = users.get(policy.employee_id)
             
             result.append({
                 "id": policy.id,
@@ -117,9 +124,12 @@ async def get_insurance_policies(db: Session = Depends(get_tenant_db)):
         logger.error(f"❌ Error fetching insurance policies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{policy_id}")
-async def delete_insurance_policy(policy_id: int, request: Request, db: Session = Depends(get_tenant_db)):
-    """Delete an insurance policy"""
+@router.get("/")
+async def get_insurance_policies(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Get all insurance policies"""
+    return await db.run(_get_insurance_policies)
+
+def _delete_insurance_policy(db: Session, policy_id: int, request: Request):
     try:
         policy = db.query(EmployeeInsurance).filter(EmployeeInsurance.id == policy_id).first()
         
@@ -136,3 +146,8 @@ async def delete_insurance_policy(policy_id: int, request: Request, db: Session
         logger.error(f"❌ Error deleting insurance policy: {e}")
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/{policy_id}")
+async def delete_insurance_policy(policy_id: int, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    """Delete an insurance policy"""
+    return await db.run(_delete_insurance_policy, policy_id, request)
@@ -0,0 +1,158 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel
+from typing import List
+import os
+
+from database import get_master_db, logger
+from models.models_master import BackgroundJob
+from routes.hospital import get_current_user
+from utils.jobs import job_handler, submit_job
+from routes.payroll.validation import validate_payroll_readiness
+from routes.payroll import payroll_run
+
+router = APIRouter(prefix="/jobs", tags=["Background Jobs"])
+
+
+def export_runs_csv(db):
+    return Response(
+        content="".join(payroll_run.iter_payroll_runs_csv(db)),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=payroll_runs_export.csv"}
+    )
+
+
+# Long-running payroll reports that can be produced in the background
+PAYROLL_REPORTS = {
+    "pf-challan": payroll_run.download_pf_challan_pdf,
+    "esi-challan": payroll_run.download_esi_challan_pdf,
+    "bank-transfer": payroll_run.download_bank_transfer_pdf,
+    "tds": payroll_run.download_tds_report,
+    "department-wise": payroll_run.download_department_wise_report,
+    "grade-wise": payroll_run.download_grade_wise_report,
+    "attendance-payroll": payroll_run.download_attendance_payroll_report,
+    "form16": payroll_run.download_form16_report,
+    "payroll-summary": payroll_run.download_payroll_summary_report,
+    "runs-export": export_runs_csv,
+}
+
+
+# -------------------------------------------------------------------------
+# JOB HANDLERS
+# -------------------------------------------------------------------------
+@job_handler("payroll_validation")
+def run_payroll_validation(ctx, month: int, year: int):
+    ctx.progress(5, "Loading attendance data")
+    with ctx.tenant_session() as db:
+        result = validate_payroll_readiness(month, year, db)
+    return result.dict()
+
+
+@job_handler("payslip_bulk_email")
+def run_payslip_bulk_email(ctx, payslip_ids: list):
+    with ctx.tenant_session() as db:
+        return payroll_run.send_bulk_payslips(db, payslip_ids, progress=ctx.progress)
+
+
+@job_handler("payroll_report")
+def run_payroll_report(ctx, report: str):
+    ctx.progress(5, f"Generating {report} report")
+    with ctx.tenant_session() as db:
+        response = PAYROLL_REPORTS[report](db)
+
+    disposition = response.headers.get("content-disposition", "")
+    filename = disposition.split("filename=")[-1].strip('"') if "filename=" in disposition else f"{report}.pdf"
+    ctx.save_file(response.body, filename, response.media_type or "application/octet-stream")
+    return {"filename": filename, "size": len(response.body)}
+
+
+# -------------------------------------------------------------------------
+# SERIALIZATION
+# -------------------------------------------------------------------------
+def job_to_dict(job: BackgroundJob):
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "result": job.result,
+        "error": job.error,
+        "has_file": bool(job.result_path),
+        "download_url": f"/api/jobs/{job.id}/download" if job.result_path else None,
+        "created_by": job.created_by,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+
+
+def submit_for_user(user, job_type: str, params: dict):
+    tenant_db = user.get("tenant_db")
+    if not tenant_db:
+        raise HTTPException(400, "Token has no tenant")
+    job = submit_job(job_type, tenant_db, params, user.get("email"))
+    logger.info(f"Queued job {job.id} ({job_type}) for tenant {tenant_db}")
+    return {"job_id": job.id, "status": job.status, "status_url": f"/api/jobs/{job.id}"}
+
+
+def get_tenant_job(db, job_id: str, user) -> BackgroundJob:
+    job = db.query(BackgroundJob).filter(
+        BackgroundJob.id == job_id,
+        BackgroundJob.tenant_id == user.get("tenant_db")
+    ).first()
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+# -------------------------------------------------------------------------
+# SUBMIT
+# -------------------------------------------------------------------------
+@router.post("/payroll/validation/{month}/{year}", status_code=202)
+def submit_payroll_validation(month: int, year: int, user=Depends(get_current_user)):
+    return submit_for_user(user, "payroll_validation", {"month": month, "year": year})
+
+
+class BulkPayslipEmailJob(BaseModel):
+    payslip_ids: List[int]
+
+
+@router.post("/payroll/payslips/send-bulk-email", status_code=202)
+def submit_payslip_bulk_email(payload: BulkPayslipEmailJob, user=Depends(get_current_user)):
+    if not payload.payslip_ids:
+        raise HTTPException(400, "No payslips selected")
+    return submit_for_user(user, "payslip_bulk_email", {"payslip_ids": payload.payslip_ids})
+
+
+@router.post("/payroll/reports/{report}", status_code=202)
+def submit_payroll_report(report: str, user=Depends(get_current_user)):
+    if report not in PAYROLL_REPORTS:
+        raise HTTPException(404, f"Unknown report: {report}")
+    return submit_for_user(user, "payroll_report", {"report": report})
+
+
+# -------------------------------------------------------------------------
+# STATUS / RESULTS
+# -------------------------------------------------------------------------
+@router.get("/")
+def list_jobs(limit: int = 50, db=Depends(get_master_db), user=Depends(get_current_user)):
+    jobs = db.query(BackgroundJob).filter(
+        BackgroundJob.tenant_id == user.get("tenant_db")
+    ).order_by(BackgroundJob.created_at.desc()).limit(min(limit, 200)).all()
+    return [job_to_dict(job) for job in jobs]
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, db=Depends(get_master_db), user=Depends(get_current_user)):
+    return job_to_dict(get_tenant_job(db, job_id, user))
+
+
+@router.get("/{job_id}/download")
+def download_job_result(job_id: str, db=Depends(get_master_db), user=Depends(get_current_user)):
+    job = get_tenant_job(db, job_id, user)
+    if job.status != "succeeded" or not job.result_path:
+        raise HTTPException(409, f"Job has no downloadable result (status: {job.status})")
+    if not os.path.exists(job.result_path):
+        raise HTTPException(410, "Result file no longer available")
+    return FileResponse(job.result_path, media_type=job.result_media_type, filename=job.result_filename)
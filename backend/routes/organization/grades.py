@@ -2,30 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 
-from database import get_master_db, get_tenant_engine, logger
+from database import logger
 from utils.audit_logger import audit_crud
-from models.models_master import Hospital
 from models.models_tenant import Grade
 from schemas.schemas_tenant import GradeCreate, GradeOut, GradeUpdate
 from routes.hospital import get_current_user
+from utils.tenant_resolver import get_user_tenant_db
 
 router = APIRouter(prefix="/grades", tags=["Grade / Pay Structure"])
 
-def get_tenant_session(user):
-    tenant_db = user.get("tenant_db")
-    master_db = next(get_master_db())
-    hospital = master_db.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Hospital not found")
-    engine = get_tenant_engine(str(hospital.db_name))
-    return Session(bind=engine)
-
 # -------------------------------------------
 # CREATE GRADE
 # -------------------------------------------
 @router.post("/", response_model=GradeOut)
-def create_grade(data: GradeCreate, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_grade(data: GradeCreate, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[GRADE CREATE] Request received for code: {data.code}")
 
     # Check duplicate grade code
@@ -54,8 +44,7 @@ def create_grade(data: GradeCreate, request: Request, user = Depends(get_current
 # GET ALL GRADES
 # -------------------------------------------
 @router.get("/", response_model=List[GradeOut])
-def get_grades(user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_grades(user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info("[GRADE FETCH] Fetching all grades")
     return db.query(Grade).all()
 
@@ -64,8 +53,7 @@ def get_grades(user = Depends(get_current_user)):
 # GET SINGLE GRADE
 # -------------------------------------------
 @router.get("/{grade_id}", response_model=GradeOut)
-def get_grade_by_id(grade_id: int, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_grade_by_id(grade_id: int, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[GRADE FETCH] Fetch grade id: {grade_id}")
     grade = db.query(Grade).filter(Grade.id == grade_id).first()
 
@@ -80,8 +68,7 @@ def get_grade_by_id(grade_id: int, user = Depends(get_current_user)):
 # UPDATE GRADE
 # -------------------------------------------
 @router.put("/{grade_id}", response_model=GradeOut)
-def update_grade(grade_id: int, data: GradeUpdate, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_grade(grade_id: int, data: GradeUpdate, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[GRADE UPDATE] Request for grade id: {grade_id}")
 
     grade = db.query(Grade).filter(Grade.id == grade_id).first()
@@ -106,8 +93,7 @@ def update_grade(grade_id: int, data: GradeUpdate, request: Request, user = Depe
 # DELETE GRADE
 # -------------------------------------------
 @router.delete("/{grade_id}")
-def delete_grade(grade_id: int, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_grade(grade_id: int, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[GRADE DELETE] requested id={grade_id}")
 
     grade = db.query(Grade).filter(Grade.id == grade_id).first()
@@ -1,29 +1,19 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
-from database import get_master_db, get_tenant_engine, logger
+from database import logger
 from utils.audit_logger import audit_crud
 
-from models.models_master import Hospital
 from models.models_tenant import Holiday
 from schemas.schemas_tenant import HolidayCreate, HolidayOut
 from routes.hospital import get_current_user
+from utils.tenant_resolver import get_user_tenant_db
 from typing import List
 
 router = APIRouter(prefix="/holidays", tags=["Holiday Calendar"])
 
-def get_tenant_session(user):
-    tenant_db = user.get("tenant_db")
-    master_db = next(get_master_db())
-    hospital = master_db.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Hospital not found")
-    engine = get_tenant_engine(str(hospital.db_name))
-    return Session(bind=engine)
-
 # ---------------- CREATE ----------------
 @router.post("/create", response_model=HolidayOut)
-def create_holiday(data: HolidayCreate, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_holiday(data: HolidayCreate, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HOLIDAY CREATE] User:{user.get('email')} - {data.name}")
 
     # Duplicate same day check
@@ -42,16 +32,14 @@ def create_holiday(data: HolidayCreate, request: Request, user = Depends(get_cur
 
 # ---------------- LIST ----------------
 @router.get("/list", response_model=List[HolidayOut])
-def list_holidays(user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def list_holidays(user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HOLIDAY LIST] User:{user.get('email')}")
     return db.query(Holiday).order_by(Holiday.date.asc()).all()
 
 
 # ---------------- DELETE ----------------
 @router.delete("/delete/{id}")
-def delete_holiday(id: int, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_holiday(id: int, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HOLIDAY DELETE] ID:{id} User:{user.get('email')}")
 
     holiday = db.query(Holiday).filter(Holiday.id == id).first()
@@ -67,8 +55,7 @@ def delete_holiday(id: int, request: Request, user = Depends(get_current_user)):
 
 # ---------------- UPDATE (For Edit Later) ----------------
 @router.put("/update/{id}", response_model=HolidayOut)
-def update_holiday(id: int, data: HolidayCreate, request: Request, user = Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_holiday(id: int, data: HolidayCreate, request: Request, user = Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HOLIDAY UPDATE] ID:{id} User:{user.get('email')}")
 
     holiday = db.query(Holiday).filter(Holiday.id == id).first()
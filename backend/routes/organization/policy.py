@@ -1,12 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
 from sqlalchemy.orm import Session
-from database import get_master_db, get_tenant_engine, logger
+from database import logger
 from utils.audit_logger import audit_crud
 import os
 import shutil
 from pathlib import Path
 
-from models.models_master import Hospital
 from models.models_tenant import (
     HRPolicy, LeavePolicy, AttendancePolicy, OTPolicy
 )
@@ -19,33 +18,18 @@ from schemas.schemas_tenant import (
 )
 
 from routes.hospital import get_current_user
+from utils.tenant_resolver import get_user_tenant_db
 from typing import List
 
 
 router = APIRouter(prefix="/policies", tags=["Policy Setup"])
 
 
-# --------------------------------------------------------------------------------
-# Get Tenant Session
-# --------------------------------------------------------------------------------
-def get_tenant_session(user):
-    tenant_db = user.get("tenant_db")
-    master_db = next(get_master_db())
-    hospital = master_db.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-
-    if not hospital:
-        raise HTTPException(status_code=404, detail="Hospital not found")
-
-    engine = get_tenant_engine(str(hospital.db_name))
-    return Session(bind=engine)
-
-
 # =================================================================================
 # HR POLICY
 # =================================================================================
 @router.post("/hr/create", response_model=HRPolicyOut)
-def create_hr_policy(data: HRPolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_hr_policy(data: HRPolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY CREATE] {data.name}")
 
     policy = HRPolicy(**data.dict())
@@ -57,8 +41,7 @@ def create_hr_policy(data: HRPolicyCreate, request: Request, user=Depends(get_cu
 
 
 @router.get("/hr/list", response_model=List[HRPolicyOut])
-def list_hr_policies(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def list_hr_policies(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY LIST] Fetching all HR policies for user {user.get('email')}")
     policies = db.query(HRPolicy).order_by(HRPolicy.id.desc()).all()
     
@@ -72,8 +55,7 @@ def list_hr_policies(user=Depends(get_current_user)):
 
 
 @router.put("/hr/update/{id}", response_model=HRPolicyOut)
-def update_hr_policy(id: int, data: HRPolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_hr_policy(id: int, data: HRPolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY UPDATE] Updating policy id={id} by user {user.get('email')}")
     policy = db.query(HRPolicy).filter(HRPolicy.id == id).first()
 
@@ -93,8 +75,7 @@ def update_hr_policy(id: int, data: HRPolicyCreate, request: Request, user=Depen
 
 
 @router.delete("/hr/delete/{id}")
-def delete_hr_policy(id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_hr_policy(id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY DELETE] Deleting policy id={id} by user {user.get('email')}")
     policy = db.query(HRPolicy).filter(HRPolicy.id == id).first()
 
@@ -111,8 +92,7 @@ def delete_hr_policy(id: int, request: Request, user=Depends(get_current_user)):
 
 
 @router.post("/hr/upload/{id}")
-async def upload_hr_policy_document(id: int, file: UploadFile = File(...), user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+async def upload_hr_policy_document(id: int, file: UploadFile = File(...), user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY UPLOAD] Uploading document for policy id={id}")
     
     policy = db.query(HRPolicy).filter(HRPolicy.id == id).first()
@@ -139,8 +119,7 @@ async def upload_hr_policy_document(id: int, file: UploadFile = File(...), user=
 
 
 @router.get("/hr/view/{id}", response_model=HRPolicyOut)
-def view_hr_policy(id: int, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def view_hr_policy(id: int, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[HR POLICY VIEW] Viewing policy id={id}")
     
     policy = db.query(HRPolicy).filter(HRPolicy.id == id).first()
@@ -157,8 +136,7 @@ def view_hr_policy(id: int, user=Depends(get_current_user)):
 # LEAVE POLICY
 # =================================================================================
 @router.post("/leave/create", response_model=LeavePolicyOut)
-def create_leave_policy(data: LeavePolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_leave_policy(data: LeavePolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[LEAVE POLICY CREATE] {data.name}")
 
     policy = LeavePolicy(**data.dict())
@@ -170,15 +148,13 @@ def create_leave_policy(data: LeavePolicyCreate, request: Request, user=Depends(
 
 
 @router.get("/leave/list", response_model=List[LeavePolicyOut])
-def list_leave_policy(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def list_leave_policy(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[LEAVE POLICY LIST] Fetching all leave policies for user {user.get('email')}")
     return db.query(LeavePolicy).order_by(LeavePolicy.id.desc()).all()
 
 
 @router.put("/leave/update/{id}", response_model=LeavePolicyOut)
-def update_leave_policy(id: int, data: LeavePolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_leave_policy(id: int, data: LeavePolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[LEAVE POLICY UPDATE] Updating policy id={id} by user {user.get('email')}")
     policy = db.query(LeavePolicy).filter(LeavePolicy.id == id).first()
 
@@ -198,8 +174,7 @@ def update_leave_policy(id: int, data: LeavePolicyCreate, request: Request, user
 
 
 @router.delete("/leave/delete/{id}")
-def delete_leave_policy(id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_leave_policy(id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[LEAVE POLICY DELETE] Deleting policy id={id} by user {user.get('email')}")
     policy = db.query(LeavePolicy).filter(LeavePolicy.id == id).first()
 
@@ -219,8 +194,7 @@ def delete_leave_policy(id: int, request: Request, user=Depends(get_current_user
 # ATTENDANCE POLICY
 # =================================================================================
 @router.post("/attendance/create", response_model=AttendancePolicyOut)
-def create_attendance_policy(data: AttendancePolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_attendance_policy(data: AttendancePolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[ATTENDANCE POLICY CREATE] Creating policy by user {user.get('email')}")
 
     policy = AttendancePolicy(**data.dict())
@@ -232,15 +206,13 @@ def create_attendance_policy(data: AttendancePolicyCreate, request: Request, use
 
 
 @router.get("/attendance/list", response_model=List[AttendancePolicyOut])
-def list_attendance_policy(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def list_attendance_policy(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[ATTENDANCE POLICY LIST] Fetching all attendance policies for user {user.get('email')}")
     return db.query(AttendancePolicy).order_by(AttendancePolicy.id.desc()).all()
 
 
 @router.put("/attendance/update/{id}", response_model=AttendancePolicyOut)
-def update_attendance_policy(id: int, data: AttendancePolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_attendance_policy(id: int, data: AttendancePolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[ATTENDANCE POLICY UPDATE] Updating policy id={id} by user {user.get('email')}")
     policy = db.query(AttendancePolicy).filter(AttendancePolicy.id == id).first()
 
@@ -260,8 +232,7 @@ def update_attendance_policy(id: int, data: AttendancePolicyCreate, request: Req
 
 
 @router.delete("/attendance/delete/{id}")
-def delete_attendance_policy(id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_attendance_policy(id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[ATTENDANCE POLICY DELETE] Deleting policy id={id} by user {user.get('email')}")
     policy = db.query(AttendancePolicy).filter(AttendancePolicy.id == id).first()
 
@@ -281,8 +252,7 @@ def delete_attendance_policy(id: int, request: Request, user=Depends(get_current
 # OT POLICY
 # =================================================================================
 @router.post("/ot/create", response_model=OTPolicyOut)
-def create_ot_policy(data: OTPolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def create_ot_policy(data: OTPolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[OT POLICY CREATE] Creating policy by user {user.get('email')}")
 
     grades_str = ",".join(data.grades) if data.grades else ""
@@ -298,8 +268,7 @@ def create_ot_policy(data: OTPolicyCreate, request: Request, user=Depends(get_cu
 
 
 @router.get("/ot/list", response_model=List[OTPolicyOut])
-def list_ot_policy(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def list_ot_policy(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[OT POLICY LIST] Fetching all OT policies for user {user.get('email')}")
     items = db.query(OTPolicy).order_by(OTPolicy.id.desc()).all()
 
@@ -313,8 +282,7 @@ def list_ot_policy(user=Depends(get_current_user)):
 
 
 @router.put("/ot/update/{id}", response_model=OTPolicyOut)
-def update_ot_policy(id: int, data: OTPolicyCreate, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def update_ot_policy(id: int, data: OTPolicyCreate, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[OT POLICY UPDATE] Updating policy id={id} by user {user.get('email')}")
     policy = db.query(OTPolicy).filter(OTPolicy.id == id).first()
 
@@ -340,8 +308,7 @@ def update_ot_policy(id: int, data: OTPolicyCreate, request: Request, user=Depen
 
 
 @router.delete("/ot/delete/{id}")
-def delete_ot_policy(id: int, request: Request, user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def delete_ot_policy(id: int, request: Request, user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     logger.info(f"[OT POLICY DELETE] Deleting policy id={id} by user {user.get('email')}")
     policy = db.query(OTPolicy).filter(OTPolicy.id == id).first()
 
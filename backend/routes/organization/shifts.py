@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from database import get_tenant_engine, logger
 from utils.audit_logger import audit_crud
+from utils.attendance_reference import invalidate_attendance_reference
 from models.models_tenant import Shift
 from schemas.schemas_tenant import ShiftCreate, ShiftResponse
 
@@ -36,6 +37,7 @@ def create_shift(
         db.add(new_shift)
         db.commit()
         db.refresh(new_shift)
+        invalidate_attendance_reference(tenant)
         audit_crud(request, user.get("tenant_db"), user, "CREATE", "shifts", new_shift.id, None, new_shift.__dict__)
         logger.info(f"Shift '{payload.name}' created successfully with ID {new_shift.id}")
         return new_shift
@@ -86,6 +88,7 @@ def delete_shift(
         old_values = shift.__dict__.copy()
         db.delete(shift)
         db.commit()
+        invalidate_attendance_reference(tenant)
         audit_crud(request, user.get("tenant_db"), user, "DELETE", "shifts", shift_id, old_values, None)
         logger.info(f"Shift {shift_id} deleted successfully")
         return {"message": "Shift deleted successfully"}
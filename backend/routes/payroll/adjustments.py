@@ -18,28 +18,6 @@ async def add_adjustment(
         data = await request.json()
         print(f"Raw adjustment data: {data}")
         
-        # Create table if not exists
-        db.execute(text("""
-            CREATE TABLE IF NOT EXISTS payroll_adjustments (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id INT NOT NULL,
-                month VARCHAR(50) NOT NULL,
-                adjustment_type VARCHAR(50) NOT NULL,
-                amount DECIMAL(15,2) NOT NULL,
-                description TEXT,
-                status VARCHAR(50) DEFAULT 'Active',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
-        
-        # Add status column if it doesn't exist
-        try:
-            db.execute(text("ALTER TABLE payroll_adjustments ADD COLUMN status VARCHAR(50) DEFAULT 'Active'"))
-        except:
-            pass  # Column already exists
-            
-        db.commit()
-        
         # Insert adjustment
         db.execute(text("""
             INSERT INTO payroll_adjustments (employee_id, month, adjustment_type, amount, description, status)
@@ -67,27 +45,6 @@ def list_adjustments(
     db: Session = Depends(get_tenant_db)
 ):
     try:
-        # Create table if not exists
-        db.execute(text("""
-            CREATE TABLE IF NOT EXISTS payroll_adjustments (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id INT NOT NULL,
-                month VARCHAR(50) NOT NULL,
-                adjustment_type VARCHAR(50) NOT NULL,
-                amount DECIMAL(15,2) NOT NULL,
-                description TEXT,
-                status VARCHAR(50) DEFAULT 'Active',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """))
-        
-        # Add status column if it doesn't exist
-        try:
-            db.execute(text("ALTER TABLE payroll_adjustments ADD COLUMN status VARCHAR(50) DEFAULT 'Active'"))
-            db.commit()
-        except:
-            pass  # Column already exists
-        
         query = text("SELECT id, employee_id, month, adjustment_type, amount, description, COALESCE(status, 'Active') as status, created_at FROM payroll_adjustments ORDER BY created_at DESC")
         result = db.execute(query)
         adjustments = []
@@ -0,0 +1,195 @@
+"""
+Bulk payroll computation.
+
+Computes a month's payroll for every employee linked to a salary structure
+from the monthly attendance summary, approved leave and salary structures,
+using one query per source, and upserts the results into payroll_runs with one
+multi-row INSERT ... ON DUPLICATE KEY UPDATE per chunk. Like the payslip and bank
+transfer screens, payroll_adjustments are applied on top of the stored net
+salary rather than folded into it.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import bindparam, text, table, column
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from utils.attendance_summary import month_attendance
+
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+# payroll_runs as migrated in alembic/tenant (the ORM PayrollRun model predates these columns)
+payroll_runs_table = table(
+    "payroll_runs",
+    column("employee_id"),
+    column("employee_name"),
+    column("employee_code"),
+    column("month"),
+    column("year"),
+    column("present_days"),
+    column("leave_days"),
+    column("lop_days"),
+    column("basic_salary"),
+    column("hra_salary"),
+    column("allowances"),
+    column("gross_salary"),
+    column("lop_deduction"),
+    column("net_salary"),
+    column("status"),
+)
+
+UPSERT_COLUMNS = [
+    "employee_name", "employee_code", "present_days", "leave_days", "lop_days",
+    "basic_salary", "hra_salary", "allowances", "gross_salary", "lop_deduction",
+    "net_salary", "status",
+]
+
+
+def _structure_tokens(employee_ids: str) -> List[str]:
+    return [token.strip() for token in (employee_ids or "").split(",") if token.strip()]
+
+
+def link_employees_to_structures(users, structures) -> Dict[int, object]:
+    """Map users.id → first salary structure whose employee_ids lists the user"""
+    by_token = {}
+    for structure in structures:
+        for token in _structure_tokens(structure.employee_ids):
+            by_token.setdefault(token, structure)
+
+    linked = {}
+    for user in users:
+        structure = (
+            by_token.get(str(user.id))
+            or by_token.get(f"user_{user.id}")
+            or (by_token.get(user.employee_code) if user.employee_code else None)
+        )
+        if structure is not None:
+            linked[user.id] = structure
+    return linked
+
+
+def compute_employee_payroll(user, structure, month_name: str, year: int, days_in_month: int,
+                             present_days: int, leave_days: int) -> Dict:
+    """Same formula the payroll run screen used"""
+    lop_days = max(0, days_in_month - present_days - leave_days)
+
+    monthly_ctc = (structure.ctc or 0) / 12
+    basic_salary = monthly_ctc * (structure.basic_percent or 40) / 100
+    hra_salary = monthly_ctc * (structure.hra_percent or 20) / 100
+    allowances = monthly_ctc - basic_salary - hra_salary
+
+    gross_salary = monthly_ctc
+    lop_deduction = (gross_salary / 30) * lop_days
+    net_salary = gross_salary - lop_deduction
+
+    return {
+        "employee_id": str(user.id),
+        "employee_name": user.name,
+        "employee_code": user.employee_code or "",
+        "month": month_name,
+        "year": year,
+        "present_days": present_days,
+        "leave_days": leave_days,
+        "lop_days": lop_days,
+        "basic_salary": round(basic_salary, 2),
+        "hra_salary": round(hra_salary, 2),
+        "allowances": round(allowances, 2),
+        "gross_salary": round(gross_salary, 2),
+        "lop_deduction": round(lop_deduction, 2),
+        "net_salary": round(net_salary, 2),
+        "status": "Completed",
+    }
+
+
+def month_adjustment_totals(db: Session, month_name: str, employee_ids: List[int]) -> Dict[int, Dict[str, float]]:
+    """Active adjustments per employee of a run for a month, split into additions and deductions"""
+    totals = defaultdict(lambda: {"additions": 0.0, "deductions": 0.0})
+    if not employee_ids:
+        return totals
+    for row in db.execute(text("""
+        SELECT employee_id,
+               SUM(CASE WHEN adjustment_type != 'Deduction' THEN amount ELSE 0 END) AS additions,
+               SUM(CASE WHEN adjustment_type = 'Deduction' THEN amount ELSE 0 END) AS deductions
+        FROM payroll_adjustments
+        WHERE month = :month_name AND COALESCE(status, 'Active') = 'Active'
+          AND employee_id IN :employee_ids
+        GROUP BY employee_id
+    """).bindparams(bindparam("employee_ids", expanding=True)),
+            {"month_name": month_name, "employee_ids": list(employee_ids)}):
+        totals[row.employee_id]["additions"] += float(row.additions or 0)
+        totals[row.employee_id]["deductions"] += float(row.deductions or 0)
+    return totals
+
+
+def compute_month_payroll(db: Session, month: int, year: int) -> List[Dict]:
+    """Compute payroll rows for every linked employee with four bulk queries"""
+    month_name = MONTH_NAMES[month - 1]
+    days_in_month = calendar.monthrange(year, month)[1]
+    start_date = date(year, month, 1)
+    end_date = date(year, month, days_in_month)
+    params = {"start_date": start_date, "end_date": end_date}
+
+    users = db.execute(text("SELECT id, name, employee_code FROM users")).fetchall()
+    structures = db.execute(text("""
+        SELECT id, ctc, basic_percent, hra_percent, employee_ids
+        FROM salary_structures
+        WHERE employee_ids IS NOT NULL AND employee_ids != ''
+        ORDER BY id
+    """)).fetchall()
+    linked = link_employees_to_structures(users, structures)
+    if not linked:
+        return []
+
+    # Present + Late days per employee from the incrementally maintained monthly summary
+    present = {
+        str(employee_id): summary["attended_days"]
+        for employee_id, summary in month_attendance(db, year, month).items()
+    }
+
+    leave_days = defaultdict(int)
+    for row in db.execute(text("""
+        SELECT employee_id, from_date, to_date
+        FROM leave_applications
+        WHERE status = 'Approved'
+        AND from_date <= :end_date AND to_date >= :start_date
+    """), params):
+        clipped_from = max(row.from_date, start_date)
+        clipped_to = min(row.to_date, end_date)
+        leave_days[row.employee_id] += max(0, (clipped_to - clipped_from + timedelta(days=1)).days)
+
+    rows = []
+    for user in users:
+        structure = linked.get(user.id)
+        if structure is None:
+            continue
+        rows.append(compute_employee_payroll(
+            user, structure, month_name, year, days_in_month,
+            present.get(str(user.id), 0), leave_days.get(user.id, 0)
+        ))
+    return rows
+
+
+def upsert_payroll_rows(db: Session, rows: List[Dict], chunk_size: int = 500) -> Dict:
+    """Write payroll rows with one multi-row upsert per chunk; caller commits"""
+    if not rows:
+        return {"created": 0, "updated": 0}
+
+    month, year = rows[0]["month"], rows[0]["year"]
+    existing = {
+        row.employee_id
+        for row in db.execute(text("""
+            SELECT employee_id FROM payroll_runs WHERE month = :month AND year = :year
+        """), {"month": month, "year": year})
+    }
+
+    for i in range(0, len(rows), chunk_size):
+        stmt = mysql_insert(payroll_runs_table).values(rows[i:i + chunk_size])
+        stmt = stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in UPSERT_COLUMNS})
+        db.execute(stmt)
+
+    updated = sum(1 for row in rows if row["employee_id"] in existing)
+    return {"created": len(rows) - updated, "updated": updated}
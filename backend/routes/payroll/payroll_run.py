@@ -1,17 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from database import get_tenant_db
-from sqlalchemy import text
-from utils.email import send_email
+from database import AsyncTenantSession, get_tenant_db, get_tenant_db_async
+from sqlalchemy import text, bindparam
+from utils.email import send_email, build_message, SMTPConnectionPool
 from utils.audit_logger import audit_crud
 from datetime import datetime
+from collections import defaultdict
+from pydantic import BaseModel
+import time
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from io import BytesIO
+from fastapi.responses import StreamingResponse
+import csv
+import io
+import zlib
 from .validation import validate_payroll_readiness
+from .payroll_engine import MONTH_NAMES, compute_month_payroll, month_adjustment_totals, upsert_payroll_rows
 
 router = APIRouter(
     prefix="/payroll",
@@ -31,13 +39,60 @@ def validate_before_payroll_run(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
 
+def validation_failed_error(validation_result) -> HTTPException:
+    """Build the 400 response returned when payroll validation finds blocking issues"""
+    critical_issues = [issue for issue in validation_result.issues if issue.severity == "critical"]
+    warning_issues = [issue for issue in validation_result.issues if issue.severity == "warning"]
+
+    issue_summary = "; ".join([f"{issue.employee_name}: {issue.issue_description}" for issue in critical_issues[:3]])
+    if len(critical_issues) > 3:
+        issue_summary += f" and {len(critical_issues) - 3} more critical issues"
+
+    # Add warning summary if there are warnings
+    if warning_issues:
+        if issue_summary:
+            issue_summary += f"; {len(warning_issues)} absent days (warnings)"
+        else:
+            issue_summary = f"{len(warning_issues)} absent days (warnings)"
+
+    # Create proper error message based on issue types
+    if validation_result.critical_issues > 0:
+        error_message = f"Cannot run payroll due to {validation_result.critical_issues} critical issues that must be resolved."
+    else:
+        error_message = f"Payroll validation completed with {validation_result.warning_issues} warnings (absent days will result in LOP deductions)."
+
+    return HTTPException(
+        status_code=400,
+        detail={
+            "message": error_message,
+            "critical_issues": validation_result.critical_issues,
+            "warning_issues": validation_result.warning_issues,
+            "total_issues": validation_result.total_issues,
+            "summary": issue_summary,
+            "validation_required": True,
+            "issues": [{
+                "employee_id": issue.employee_id,
+                "employee_name": issue.employee_name,
+                "issue_type": issue.issue_type,
+                "issue_description": issue.issue_description,
+                "severity": issue.severity,
+                "action_required": issue.action_required
+            } for issue in validation_result.issues]
+        }
+    )
+
+
 @router.post("/runs")
 async def create_payroll_run(
     request: Request,
-    db: Session = Depends(get_tenant_db)
+    db: AsyncTenantSession = Depends(get_tenant_db_async)
 ):
+    data = await request.json()
+    return await db.run(_create_payroll_run, data, request)
+
+
+def _create_payroll_run(db: Session, data: dict, request: Request):
     try:
-        data = await request.json()
         print(f"Raw payroll data: {data}")
         
         # Extract month and year for validation
@@ -55,83 +110,19 @@ async def create_payroll_run(
         validation_result = validate_payroll_readiness(month_num, year, db)
         
         if not validation_result.can_run_payroll:
-            critical_issues = [issue for issue in validation_result.issues if issue.severity == "critical"]
-            warning_issues = [issue for issue in validation_result.issues if issue.severity == "warning"]
-            
-            issue_summary = "; ".join([f"{issue.employee_name}: {issue.issue_description}" for issue in critical_issues[:3]])
-            if len(critical_issues) > 3:
-                issue_summary += f" and {len(critical_issues) - 3} more critical issues"
-            
-            # Add warning summary if there are warnings
-            if warning_issues:
-                if issue_summary:
-                    issue_summary += f"; {len(warning_issues)} absent days (warnings)"
-                else:
-                    issue_summary = f"{len(warning_issues)} absent days (warnings)"
-            
-            # Create proper error message based on issue types
-            if validation_result.critical_issues > 0:
-                error_message = f"Cannot run payroll due to {validation_result.critical_issues} critical issues that must be resolved."
-            else:
-                error_message = f"Payroll validation completed with {validation_result.warning_issues} warnings (absent days will result in LOP deductions)."
-            
-            raise HTTPException(
-                status_code=400, 
-                detail={
-                    "message": error_message,
-                    "critical_issues": validation_result.critical_issues,
-                    "warning_issues": validation_result.warning_issues,
-                    "total_issues": validation_result.total_issues,
-                    "summary": issue_summary,
-                    "validation_required": True,
-                    "issues": [{
-                        "employee_id": issue.employee_id,
-                        "employee_name": issue.employee_name,
-                        "issue_type": issue.issue_type,
-                        "issue_description": issue.issue_description,
-                        "severity": issue.severity,
-                        "action_required": issue.action_required
-                    } for issue in validation_result.issues]
-                }
-            )
+            raise validation_failed_error(validation_result)
         
         # If validation passes, proceed with payroll creation
-        return await create_payroll_run_internal(data, request, db)
+        return create_payroll_run_internal(data, request, db)
         
     except Exception as e:
         db.rollback()
         print(f"Error creating payroll run: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def create_payroll_run_internal(data: dict, request: Request, db: Session):
+def create_payroll_run_internal(data: dict, request: Request, db: Session):
     """Internal function to handle payroll creation logic"""
     try:
-        create_table_query = text("""
-            CREATE TABLE IF NOT EXISTS payroll_runs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id VARCHAR(50),
-                employee_name VARCHAR(255),
-                employee_code VARCHAR(50),
-                month VARCHAR(20),
-                year INT,
-                present_days INT DEFAULT 0,
-                leave_days INT DEFAULT 0,
-                lop_days INT DEFAULT 0,
-                ot_hours FLOAT DEFAULT 0,
-                basic_salary DECIMAL(15,2) DEFAULT 0,
-                hra_salary DECIMAL(15,2) DEFAULT 0,
-                allowances DECIMAL(15,2) DEFAULT 0,
-                gross_salary DECIMAL(15,2) DEFAULT 0,
-                lop_deduction DECIMAL(15,2) DEFAULT 0,
-                net_salary DECIMAL(15,2) DEFAULT 0,
-                status VARCHAR(50) DEFAULT 'Completed',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_employee_month (employee_id, month, year)
-            )
-        """)
-        db.execute(create_table_query)
-        db.commit()
-        
         # Check for existing record
         check_query = text("""
             SELECT id FROM payroll_runs 
@@ -242,37 +233,72 @@ async def create_payroll_run_internal(data: dict, request: Request, db: Session)
 
 
 
+class BulkPayrollRunRequest(BaseModel):
+    month: str
+    year: int
+    skip_validation: bool = False
+    chunk_size: int = 500
+
+
+@router.post("/runs/bulk")
+def create_bulk_payroll_run(
+    payload: BulkPayrollRunRequest,
+    request: Request,
+    db: Session = Depends(get_tenant_db)
+):
+    """Compute and save payroll for every employee linked to a salary structure"""
+    started = time.perf_counter()
+
+    if payload.month.isdigit():
+        month_num = int(payload.month)
+    elif payload.month in MONTH_NAMES:
+        month_num = MONTH_NAMES.index(payload.month) + 1
+    else:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {payload.month}")
+    if not 1 <= month_num <= 12:
+        raise HTTPException(status_code=400, detail=f"Invalid month: {payload.month}")
+
+    if not payload.skip_validation:
+        validation_result = validate_payroll_readiness(month_num, payload.year, db)
+        if not validation_result.can_run_payroll:
+            raise validation_failed_error(validation_result)
+
+    try:
+        rows = compute_month_payroll(db, month_num, payload.year)
+        counts = upsert_payroll_rows(db, rows, max(1, payload.chunk_size))
+        adjustments = month_adjustment_totals(
+            db, MONTH_NAMES[month_num - 1], [int(r["employee_id"]) for r in rows]
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error running bulk payroll: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    summary = {
+        "message": f"Payroll processed for {len(rows)} employees",
+        "month": MONTH_NAMES[month_num - 1],
+        "year": payload.year,
+        "employees_processed": len(rows),
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "total_gross": round(sum(r["gross_salary"] for r in rows), 2),
+        "total_lop_deduction": round(sum(r["lop_deduction"] for r in rows), 2),
+        "total_net": round(sum(r["net_salary"] for r in rows), 2),
+        "total_adjustment_additions": round(sum(a["additions"] for a in adjustments.values()), 2),
+        "total_adjustment_deductions": round(sum(a["deductions"] for a in adjustments.values()), 2),
+        "total_lop_days": sum(r["lop_days"] for r in rows),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    audit_crud(request, "tenant", {"id": None}, "BULK_PAYROLL_RUN", "payroll_runs", None, None, summary)
+    return summary
+
+
 @router.get("/runs")
 def get_payroll_runs(
     db: Session = Depends(get_tenant_db)
 ):
     try:
-        create_table_query = text("""
-            CREATE TABLE IF NOT EXISTS payroll_runs (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id VARCHAR(50),
-                employee_name VARCHAR(255),
-                employee_code VARCHAR(50),
-                month VARCHAR(20),
-                year INT,
-                present_days INT DEFAULT 0,
-                leave_days INT DEFAULT 0,
-                lop_days INT DEFAULT 0,
-                ot_hours FLOAT DEFAULT 0,
-                basic_salary DECIMAL(15,2) DEFAULT 0,
-                hra_salary DECIMAL(15,2) DEFAULT 0,
-                allowances DECIMAL(15,2) DEFAULT 0,
-                gross_salary DECIMAL(15,2) DEFAULT 0,
-                lop_deduction DECIMAL(15,2) DEFAULT 0,
-                net_salary DECIMAL(15,2) DEFAULT 0,
-                status VARCHAR(50) DEFAULT 'Completed',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_employee_month (employee_id, month, year)
-            )
-        """)
-        db.execute(create_table_query)
-        db.commit()
-        
         query = text("""
             SELECT * FROM payroll_runs 
             GROUP BY employee_id, month, year
@@ -499,91 +525,121 @@ def download_payslip(
     except Exception as e:
         raise HTTPException(500, f"Download failed: {str(e)}")
 
+EXPORT_COLUMNS = [
+    ("Employee Name", "employee_name"), ("Employee Code", "employee_code"), ("Month", "month"),
+    ("Year", "year"), ("Present Days", "present_days"), ("Leave Days", "leave_days"),
+    ("LOP Days", "lop_days"), ("Basic Salary", "basic_salary"), ("HRA", "hra_salary"),
+    ("Allowances", "allowances"), ("Gross Salary", "gross_salary"), ("LOP Deduction", "lop_deduction"),
+    ("Net Salary", "net_salary"), ("Status", "status"), ("Processed Date", "created_at"),
+]
+
+
+def iter_payroll_runs_csv(db: Session, month: str | None = None, year: int | None = None,
+                          department: str | None = None, batch_size: int = 1000):
+    """Yield the payroll runs CSV in chunks, reading rows through a server-side cursor"""
+    conditions = []
+    params = {}
+    if month:
+        conditions.append("pr.month = :month")
+        params["month"] = MONTH_NAMES[int(month) - 1] if str(month).isdigit() else month
+    if year:
+        conditions.append("pr.year = :year")
+        params["year"] = year
+    joins = ""
+    if department:
+        joins = "JOIN users u ON u.id = pr.employee_id JOIN departments d ON d.id = u.department_id"
+        conditions.append("d.name = :department")
+        params["department"] = department
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    query = text(f"SELECT pr.* FROM payroll_runs pr {joins} {where} ORDER BY pr.created_at DESC")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+
+    # Own connection so the stream does not depend on the request session staying open
+    with db.get_bind().connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(query, params)
+        for partition in result.partitions(batch_size):
+            for row in partition:
+                writer.writerow([getattr(row, name) for _, name in EXPORT_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @router.get("/runs/export")
 def export_payroll_runs(
+    month: str | None = None,
+    year: int | None = None,
+    department: str | None = None,
+    compress: bool = False,
     db: Session = Depends(get_tenant_db)
 ):
-    try:
-        result = db.execute(text("SELECT * FROM payroll_runs ORDER BY created_at DESC"))
-        
-        csv_content = "Employee Name,Employee Code,Month,Year,Present Days,Leave Days,LOP Days,Basic Salary,HRA,Allowances,Gross Salary,LOP Deduction,Net Salary,Status,Processed Date\n"
-        
-        for row in result:
-            csv_content += f'"{row.employee_name}",{row.employee_code},{row.month},{row.year},{row.present_days},{row.leave_days},{row.lop_days},{row.basic_salary},{row.hra_salary},{row.allowances},{row.gross_salary},{row.lop_deduction},{row.net_salary},{row.status},{row.created_at}\n'
-        
-        filename = "payroll_runs_export.csv"
-        
-        return Response(
-            content=csv_content,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+    if month and str(month).isdigit() and not 1 <= int(month) <= 12:
+        raise HTTPException(400, "Month must be between 1 and 12")
+
+    filename = "payroll_runs_export.csv"
+    chunks = iter_payroll_runs_csv(db, month, year, department)
+    if compress:
+        return StreamingResponse(
+            gzip_chunks(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"}
         )
-        
-    except Exception as e:
-        raise HTTPException(500, f"Export failed: {str(e)}")
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
-@router.post("/payslip/{payroll_id}/send-email")
-async def send_payslip_email(
-    payroll_id: int,
-    request: Request,
-    db: Session = Depends(get_tenant_db)
-):
-    try:
-        data = await request.json()
-        employee_email = data.get('email')
-        
-        if not employee_email:
-            raise HTTPException(400, "Employee email is required")
-        
-        # Get payroll data
-        result = db.execute(text("SELECT * FROM payroll_runs WHERE id = :id"), {"id": payroll_id}).fetchone()
-        if not result:
-            raise HTTPException(404, "Payslip not found")
-        
-        # Generate HTML content (same as download)
-        basic_salary = float(result.basic_salary) if result.basic_salary else 0
-        hra_salary = float(result.hra_salary) if result.hra_salary else 0
-        allowances = float(result.allowances) if result.allowances else 0
-        gross_salary = float(result.gross_salary) if result.gross_salary else 0
-        lop_deduction = float(result.lop_deduction) if result.lop_deduction else 0
-        net_salary = float(result.net_salary) if result.net_salary else 0
-        
-        # Get adjustments
-        adjustments_query = text("""
-            SELECT adjustment_type, amount, description 
-            FROM payroll_adjustments 
-            WHERE employee_id = :emp_id AND month = :month AND status = 'Active'
-        """)
-        adjustments = db.execute(adjustments_query, {
-            "emp_id": int(result.employee_id),
-            "month": result.month
-        }).fetchall()
-        
-        # Calculate adjustments
-        total_additions = 0
-        total_adjustment_deductions = 0
-        earnings_adjustments = ""
-        deduction_adjustments = ""
-        
-        for adj in adjustments:
-            adj_type = adj.adjustment_type
-            adj_amount = float(adj.amount) if adj.amount else 0
-            adj_desc = adj.description or ""
-            
-            if adj_type == "Deduction":
-                total_adjustment_deductions += adj_amount
-                deduction_adjustments += f"<tr><td>{adj_type} - {adj_desc}</td><td>Rs.{adj_amount:,.2f}</td></tr>"
-            else:
-                total_additions += adj_amount
-                earnings_adjustments += f"<tr><td>{adj_type} - {adj_desc}</td><td>Rs.{adj_amount:,.2f}</td></tr>"
-        
-        pf_deduction = basic_salary * 0.12
-        esi_deduction = gross_salary * 0.0175
-        total_earnings = gross_salary + total_additions
-        total_deductions = lop_deduction + pf_deduction + esi_deduction + total_adjustment_deductions
-        final_net_salary = net_salary + total_additions - total_adjustment_deductions
-        
-        html_content = f"""<!DOCTYPE html>
+def render_payslip_html(result, adjustments) -> str:
+    """Payslip email body for one payroll_runs row and its active adjustments"""
+    basic_salary = float(result.basic_salary) if result.basic_salary else 0
+    hra_salary = float(result.hra_salary) if result.hra_salary else 0
+    allowances = float(result.allowances) if result.allowances else 0
+    gross_salary = float(result.gross_salary) if result.gross_salary else 0
+    lop_deduction = float(result.lop_deduction) if result.lop_deduction else 0
+    net_salary = float(result.net_salary) if result.net_salary else 0
+    
+    # Calculate adjustments
+    total_additions = 0
+    total_adjustment_deductions = 0
+    earnings_adjustments = ""
+    deduction_adjustments = ""
+    
+    for adj in adjustments:
+        adj_type = adj.adjustment_type
+        adj_amount = float(adj.amount) if adj.amount else 0
+        adj_desc = adj.description or ""
+        
+        if adj_type == "Deduction":
+            total_adjustment_deductions += adj_amount
+            deduction_adjustments += f"<tr><td>{adj_type} - {adj_desc}</td><td>Rs.{adj_amount:,.2f}</td></tr>"
+        else:
+            total_additions += adj_amount
+            earnings_adjustments += f"<tr><td>{adj_type} - {adj_desc}</td><td>Rs.{adj_amount:,.2f}</td></tr>"
+    
+    pf_deduction = basic_salary * 0.12
+    esi_deduction = gross_salary * 0.0175
+    total_earnings = gross_salary + total_additions
+    total_deductions = lop_deduction + pf_deduction + esi_deduction + total_adjustment_deductions
+    final_net_salary = net_salary + total_additions - total_adjustment_deductions
+    
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Payslip - {result.employee_name}</title>
@@ -657,23 +713,159 @@ async def send_payslip_email(
     </div>
 </body>
 </html>"""
+
+
+def send_single_payslip(db: Session, payroll_id: int, employee_email: str):
+    """Load one payslip with its active adjustments and email it; blocking"""
+    # Get payroll data
+    result = db.execute(text("SELECT * FROM payroll_runs WHERE id = :id"), {"id": payroll_id}).fetchone()
+    if not result:
+        raise HTTPException(404, "Payslip not found")
+    
+    # Get adjustments
+    adjustments_query = text("""
+        SELECT adjustment_type, amount, description 
+        FROM payroll_adjustments 
+        WHERE employee_id = :emp_id AND month = :month AND status = 'Active'
+    """)
+    adjustments = db.execute(adjustments_query, {
+        "emp_id": int(result.employee_id),
+        "month": result.month
+    }).fetchall()
+    
+    html_content = render_payslip_html(result, adjustments)
+    
+    # Send email
+    subject = f"Payslip for {result.month} {result.year} - {result.employee_name}"
+    success = send_email(employee_email, subject, html_content)
+    
+    if success:
+        return {"message": f"Payslip sent successfully to {employee_email}"}
+    else:
+        raise HTTPException(500, "Failed to send email")
+
+@router.post("/payslip/{payroll_id}/send-email")
+async def send_payslip_email(
+    payroll_id: int,
+    request: Request,
+    db: AsyncTenantSession = Depends(get_tenant_db_async)
+):
+    try:
+        data = await request.json()
+        employee_email = data.get('email')
         
-        # Send email
-        subject = f"Payslip for {result.month} {result.year} - {result.employee_name}"
-        success = send_email(employee_email, subject, html_content)
+        if not employee_email:
+            raise HTTPException(400, "Employee email is required")
         
-        if success:
-            return {"message": f"Payslip sent successfully to {employee_email}"}
-        else:
-            raise HTTPException(500, "Failed to send email")
+        # the DB load and SMTP send block; keep them off the event loop like the bulk send
+        return await db.run(send_single_payslip, payroll_id, employee_email)
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Email sending failed: {str(e)}")
 
+def load_payslip_batch(db: Session, payslip_ids: list):
+    """Payroll rows, active adjustments and recipient emails for many payslips in four queries"""
+    rows = db.execute(
+        text("SELECT * FROM payroll_runs WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(payslip_ids)}
+    ).fetchall()
+    if not rows:
+        return {}, {}, {}
+
+    employee_ids = sorted({int(row.employee_id) for row in rows if str(row.employee_id).isdigit()})
+    months = sorted({row.month for row in rows})
+
+    adjustments = defaultdict(list)
+    emails = {}
+    if employee_ids:
+        for adj in db.execute(
+            text("""
+                SELECT employee_id, month, adjustment_type, amount, description
+                FROM payroll_adjustments
+                WHERE employee_id IN :emp_ids AND month IN :months AND status = 'Active'
+            """).bindparams(bindparam("emp_ids", expanding=True), bindparam("months", expanding=True)),
+            {"emp_ids": employee_ids, "months": months}
+        ):
+            adjustments[(str(adj.employee_id), adj.month)].append(adj)
+
+        # Employee directory first, users table as fallback (same order as the single send)
+        for table_name in ("users", "employees"):
+            for row in db.execute(
+                text(f"SELECT id, email FROM {table_name} WHERE id IN :emp_ids").bindparams(
+                    bindparam("emp_ids", expanding=True)
+                ),
+                {"emp_ids": employee_ids}
+            ):
+                if row.email:
+                    emails[str(row.id)] = row.email
+
+    return {row.id: row for row in rows}, adjustments, emails
+
+
+def send_bulk_payslips(db: Session, payslip_ids: list, progress=None, pool: SMTPConnectionPool | None = None) -> dict:
+    """
+    Email payslips for the given payroll run ids over a pool of reused SMTP connections.
+    progress(percent) is called as messages complete; returns per-recipient status.
+    """
+    payslip_ids = [int(payroll_id) for payroll_id in payslip_ids]
+    total = len(payslip_ids)
+    rows, adjustments, emails = load_payslip_batch(db, payslip_ids)
+
+    results = []
+    messages = []
+    for payroll_id in payslip_ids:
+        result = rows.get(payroll_id)
+        if not result:
+            results.append({"payroll_id": payroll_id, "email": None, "status": "skipped", "error": "Payslip not found", "attempts": 0})
+            continue
+        employee_email = emails.get(str(result.employee_id))
+        if not employee_email:
+            results.append({"payroll_id": payroll_id, "email": None, "status": "skipped", "error": "No email on file", "attempts": 0})
+            continue
+        try:
+            html_content = render_payslip_html(result, adjustments.get((str(result.employee_id), result.month), []))
+            subject = f"Payslip for {result.month} {result.year} - {result.employee_name}"
+            messages.append((payroll_id, build_message(employee_email, subject, html_content)))
+        except Exception as e:
+            print(f"Failed to render payslip for payroll ID {payroll_id}: {str(e)}")
+            results.append({"payroll_id": payroll_id, "email": employee_email, "status": "failed", "error": str(e), "attempts": 0})
+
+    done = [len(results)]
+
+    def on_result(payroll_id, status):
+        done[0] += 1
+        if progress:
+            progress(done[0] * 100 // total)
+
+    if progress and results:
+        progress(len(results) * 100 // total)
+
+    if messages:
+        pool = pool or SMTPConnectionPool()
+        for status in pool.send_many(messages, on_result=on_result):
+            results.append({
+                "payroll_id": status["key"],
+                "email": status["email"],
+                "status": status["status"],
+                "error": status["error"],
+                "attempts": status["attempts"]
+            })
+
+    success_count = sum(1 for r in results if r["status"] == "sent")
+    failed_count = len(results) - success_count
+    return {
+        "message": f"Bulk email completed. Sent: {success_count}, Failed: {failed_count}",
+        "success_count": success_count,
+        "failed_count": failed_count,
+        "results": results
+    }
+
 @router.post("/payslips/send-bulk-email")
 async def send_bulk_payslip_emails(
     request: Request,
-    db: Session = Depends(get_tenant_db)
+    db: AsyncTenantSession = Depends(get_tenant_db_async)
 ):
     try:
         data = await request.json()
@@ -682,50 +874,11 @@ async def send_bulk_payslip_emails(
         if not payslip_ids:
             raise HTTPException(400, "No payslips selected")
         
-        success_count = 0
-        failed_count = 0
-        
-        for payroll_id in payslip_ids:
-            try:
-                # Get employee email from users table or employee directory
-                result = db.execute(text("SELECT * FROM payroll_runs WHERE id = :id"), {"id": payroll_id}).fetchone()
-                if not result:
-                    failed_count += 1
-                    continue
-                
-                # Try to get email from employee directory first
-                email_query = text("SELECT email FROM employees WHERE id = :emp_id")
-                email_result = db.execute(email_query, {"emp_id": result.employee_id}).fetchone()
-                
-                employee_email = None
-                if email_result:
-                    employee_email = email_result.email
-                else:
-                    # Fallback to users table
-                    user_email_query = text("SELECT email FROM users WHERE id = :emp_id")
-                    user_email_result = db.execute(user_email_query, {"emp_id": result.employee_id}).fetchone()
-                    if user_email_result:
-                        employee_email = user_email_result.email
-                
-                if not employee_email:
-                    failed_count += 1
-                    continue
-                
-                # Generate and send email (same logic as single email)
-                # ... (HTML generation code same as above)
-                
-                success_count += 1
-                
-            except Exception as e:
-                print(f"Failed to send email for payroll ID {payroll_id}: {str(e)}")
-                failed_count += 1
-        
-        return {
-            "message": f"Bulk email completed. Sent: {success_count}, Failed: {failed_count}",
-            "success_count": success_count,
-            "failed_count": failed_count
-        }
+        # SMTP sends, retries and DB reads block; keep them off the event loop
+        return await db.run(send_bulk_payslips, payslip_ids)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Bulk email failed: {str(e)}")
 
@@ -2,12 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from database import get_tenant_db
 from utils.audit_logger import audit_crud
+from utils.attendance_summary import employee_month_attendance
 from datetime import datetime
 from sqlalchemy import func
 
 from models.models_tenant import (
     PayrollRun, User, SalaryStructure, StatutoryRule, 
-    AttendancePunch, LeaveApplication, PayrollAdjustment,
+    LeaveApplication, PayrollAdjustment,
     Employee, EmployeeSalary, EmployeeBankDetails, Grade
 )
 
@@ -65,26 +66,10 @@ def get_attendance_data(db: Session, employee_id: int, year: int, month: int):
     # Get actual working days for the month
     working_days = monthrange(year, month)[1]
     
-    # Get present days (including late arrivals)
-    present_days = db.query(func.count(AttendancePunch.id)).filter(
-        AttendancePunch.employee_id == employee_id,
-        func.extract('year', AttendancePunch.date) == year,
-        func.extract('month', AttendancePunch.date) == month,
-        AttendancePunch.status.in_(['Present', 'Late'])
-    ).scalar() or 0
-    
-    # Get overtime hours
-    ot_hours = db.query(func.sum(
-        func.extract('hour', AttendancePunch.out_time) - func.extract('hour', AttendancePunch.in_time)
-    )).filter(
-        AttendancePunch.employee_id == employee_id,
-        func.extract('year', AttendancePunch.date) == year,
-        func.extract('month', AttendancePunch.date) == month,
-        AttendancePunch.out_time.isnot(None)
-    ).scalar() or 0
-    
-    # Calculate overtime beyond 8 hours per day
-    ot_hours = max(0, ot_hours - (present_days * 8))
+    # Present days (including late arrivals) and OT come from the monthly summary
+    summary = employee_month_attendance(db, employee_id, year, month)
+    present_days = summary["attended_days"]
+    ot_hours = round(summary["ot_minutes"] / 60, 2)
     
     return {
         "present_days": present_days, 
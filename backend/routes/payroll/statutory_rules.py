@@ -3,35 +3,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, Request
 from sqlalchemy.orm import Session
 from routes.hospital import get_current_user
-from database import get_tenant_engine
+from utils.tenant_resolver import get_user_tenant_db
 from utils.audit_logger import audit_crud
 from models.models_tenant import StatutoryRule
 from pydantic import BaseModel
 from typing import Optional
 
-# ---------------------- TENANT SESSION ----------------------
-def get_tenant_session(user):
-    from models.models_master import Hospital
-    from database import get_master_db
-
-    tenant_db = user.get("tenant_db")
-    master = next(get_master_db())
-
-    hospital = master.query(Hospital).filter(Hospital.db_name == tenant_db).first()
-    if not hospital:
-        raise HTTPException(404, "Tenant not found")
-
-    engine = get_tenant_engine(hospital.db_name)
-    return Session(bind=engine)
-
 router = APIRouter(prefix="/payroll/statutory", tags=["Statutory Rules"])
 
 # -------------------------------------------------------------------------
 # 1. GET STATUTORY RULES
 # -------------------------------------------------------------------------
 @router.get("/")
-def get_statutory_rules(user=Depends(get_current_user)):
-    db = get_tenant_session(user)
+def get_statutory_rules(user=Depends(get_current_user), db: Session = Depends(get_user_tenant_db)):
     try:
         rules = db.query(StatutoryRule).first()
         if not rules:
@@ -60,9 +44,9 @@ def update_statutory_rules(
     tds_enabled: str = Form("true"),
     tds_percent: str = Form("10"),
     request: Request = None,
-    user=Depends(get_current_user)
+    user=Depends(get_current_user),
+    db: Session = Depends(get_user_tenant_db)
 ):
-    db = get_tenant_session(user)
     try:
         # Get existing rules or create new
         rules = db.query(StatutoryRule).first()
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text, and_, or_
-from database import get_tenant_db
+from database import get_master_db, get_tenant_db
 from typing import List, Dict, Any
 from datetime import datetime, date
 from pydantic import BaseModel
+from utils.attendance_summary import refresh_attendance_summary
+from utils.user_directory import index_tenant_user
+from .validation_engine import compute_validation_issues
 
 router = APIRouter(prefix="/payroll/validation", tags=["Payroll Validation"])
 
@@ -35,70 +38,8 @@ def validate_payroll_readiness(
     - Blocks only for critical issues (pending approvals, incomplete punches without regularization)
     - Allows payroll with absent days (warnings)
     """
-    issues = []
-    
-    # Debug: Check salary structures and their employee links
-    ss_debug = text("SELECT id, name, employee_ids FROM salary_structures")
-    structures = db.execute(ss_debug).fetchall()
-    print(f"DEBUG: Salary structures:")
-    for ss in structures:
-        print(f"  - ID: {ss.id}, Name: {ss.name}, Employee IDs: {ss.employee_ids}")
-    
-    # Get employees linked to salary structures using precise matching
-    employees_query = text("""
-        SELECT DISTINCT u.id, u.employee_code, u.name, u.status
-        FROM users u
-        JOIN salary_structures ss ON (
-            CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,', u.id, ',%') OR 
-            CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,user_', u.id, ',%') OR
-            (u.employee_code IS NOT NULL AND CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,', u.employee_code, ',%'))
-        )
-    """)
-    employees = db.execute(employees_query).fetchall()
-    
-    print(f"DEBUG: Found {len(employees)} employees linked to salary structures for validation")
-    for emp in employees:
-        print(f"DEBUG: Employee - ID: {emp.id}, Code: {emp.employee_code}, Name: {emp.name}")
-    
-    # Debug: Check what's in attendance_punches table
-    punch_debug = text("SELECT employee_id, date, in_time, out_time FROM attendance_punches WHERE date >= '2025-12-01' ORDER BY date DESC LIMIT 10")
-    punch_records = db.execute(punch_debug).fetchall()
-    print(f"DEBUG: Recent punch records:")
-    for pr in punch_records:
-        print(f"  - employee_id: {pr.employee_id}, date: {pr.date}, in: {pr.in_time}, out: {pr.out_time}")
-    
-    # Debug: Check if employee 5 exists
-    emp5_debug = text("SELECT id, employee_code, name, status FROM users WHERE id = 5")
-    emp5 = db.execute(emp5_debug).fetchone()
-    print(f"DEBUG: Employee 5 details: {dict(emp5._mapping) if emp5 else 'NOT FOUND'}")
-    
-    for emp in employees:
-        emp_issues = []
-        print(f"\nDEBUG: Processing employee {emp.id} ({emp.name})")
-        
-        # 1. Check pending leave applications (CRITICAL)
-        pending_leaves = check_pending_leaves(db, emp.id, month, year)
-        emp_issues.extend(pending_leaves)
-        
-        # 2. Check comprehensive attendance (includes absent days as warnings)
-        attendance_issues = check_missing_attendance(db, emp.id, emp.employee_code, month, year)
-        emp_issues.extend(attendance_issues)
-        
-        # 3. Check pending OD approvals (CRITICAL)
-        pending_od = check_pending_od_approvals(db, emp.id, month, year)
-        emp_issues.extend(pending_od)
-        
-        # 4. Check pending regularization (CRITICAL)
-        pending_regularization = check_pending_regularization(db, emp.id, month, year)
-        emp_issues.extend(pending_regularization)
-        
-        # Add employee info to issues
-        for issue in emp_issues:
-            issue.update({
-                'employee_id': emp.employee_code or str(emp.id),
-                'employee_name': emp.name
-            })
-            issues.append(ValidationIssue(**issue))
+    # Bulk-load the month once and evaluate every employee in memory
+    issues = [ValidationIssue(**issue) for issue in compute_validation_issues(db, month, year)]
     
     # Count issues by severity
     critical_count = sum(1 for issue in issues if issue.severity == "critical")
@@ -496,7 +437,8 @@ def update_employee_name(
 @router.post("/test-data/{employee_code}")
 def create_test_data(
     employee_code: str,
-    db: Session = Depends(get_tenant_db)
+    db: Session = Depends(get_tenant_db),
+    master_db: Session = Depends(get_master_db)
 ):
     """Create test data for validation testing"""
     try:
@@ -522,6 +464,7 @@ def create_test_data(
             # Get the new user ID
             user_result = db.execute(user_query, {'emp_code': employee_code}).fetchone()
             user_id = user_result.id
+            index_tenant_user(master_db, db.get_bind().url.database, user_id, f'emp{employee_code}@company.com')
         else:
             user_id = existing_user.id
         
@@ -537,6 +480,7 @@ def create_test_data(
             'punch_date': '2025-12-23',
             'in_time': '23:12:18'
         })
+        refresh_attendance_summary(db, [(user_id, '2025-12-23')])
         db.commit()
         
         return {
@@ -0,0 +1,248 @@
+"""
+Set-based payroll validation.
+
+Loads a month's punches, leaves, OD applications, regularizations and holidays
+for every employee in a handful of bulk queries, then evaluates each employee
+against in-memory day bitmaps (bit N = day N of the month). Produces the same
+issue dicts as the per-employee checks in validation.py.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+LINKED_EMPLOYEES_QUERY = text("""
+    SELECT DISTINCT u.id, u.employee_code, u.name, u.status
+    FROM users u
+    JOIN salary_structures ss ON (
+        CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,', u.id, ',%') OR
+        CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,user_', u.id, ',%') OR
+        (u.employee_code IS NOT NULL AND CONCAT(',', ss.employee_ids, ',') LIKE CONCAT('%,', u.employee_code, ',%'))
+    )
+""")
+
+
+def _bit(day: date) -> int:
+    return 1 << day.day
+
+
+def _has_time(value) -> bool:
+    return value is not None and str(value).strip() != '' and str(value) != '-'
+
+
+class MonthSnapshot:
+    """All attendance-related rows for one month, indexed per employee"""
+
+    def __init__(self, month: int, year: int, today: date | None = None):
+        self.month = month
+        self.year = year
+        self.start_date = date(year, month, 1)
+        self.end_date = date(year, month, calendar.monthrange(year, month)[1])
+        self.today = today or date.today()
+
+        self.holidays = set()
+        # Day bitmaps keyed by users.id
+        self.approved_leave = defaultdict(int)
+        self.pending_leave = defaultdict(int)
+        self.approved_od = defaultdict(int)
+        self.pending_od = defaultdict(int)
+        self.approved_reg = defaultdict(int)
+        self.pending_reg = defaultdict(int)
+        # Punches keyed by the raw employee_id string (matches id or employee_code)
+        self.punches = defaultdict(dict)
+
+        # Rows needed to describe pending requests, in id order
+        self.pending_leave_rows = defaultdict(list)
+        self.pending_od_rows = defaultdict(list)
+        self.pending_reg_rows = defaultdict(list)
+
+    def working_days(self) -> List[date]:
+        days = []
+        current = self.start_date
+        while current <= self.end_date and current <= self.today:
+            if current.weekday() not in (5, 6) and current not in self.holidays:
+                days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    def _mark_range(self, bitmap: Dict[int, int], employee_id: int, from_date: date, to_date: date):
+        current = max(from_date, self.start_date)
+        last = min(to_date, self.end_date)
+        mask = 0
+        while current <= last:
+            mask |= _bit(current)
+            current += timedelta(days=1)
+        bitmap[employee_id] |= mask
+
+
+def load_month_snapshot(db: Session, month: int, year: int, today: date | None = None) -> MonthSnapshot:
+    """Fetch the month's attendance data for all employees in five queries"""
+    snapshot = MonthSnapshot(month, year, today)
+    params = {'start_date': snapshot.start_date, 'end_date': snapshot.end_date}
+
+    holidays = db.execute(text("""
+        SELECT date FROM holidays WHERE date BETWEEN :start_date AND :end_date
+    """), params).fetchall()
+    snapshot.holidays = {row.date for row in holidays}
+
+    leaves = db.execute(text("""
+        SELECT id, employee_id, from_date, to_date, status
+        FROM leave_applications
+        WHERE from_date <= :end_date AND to_date >= :start_date
+        AND LOWER(status) IN ('approved', 'pending')
+        ORDER BY id
+    """), params).fetchall()
+    for row in leaves:
+        if row.status.lower() == 'approved':
+            snapshot._mark_range(snapshot.approved_leave, row.employee_id, row.from_date, row.to_date)
+        else:
+            snapshot._mark_range(snapshot.pending_leave, row.employee_id, row.from_date, row.to_date)
+            snapshot.pending_leave_rows[row.employee_id].append(row)
+
+    ods = db.execute(text("""
+        SELECT id, employee_id, od_date, purpose, status
+        FROM od_applications
+        WHERE od_date BETWEEN :start_date AND :end_date
+        AND LOWER(status) IN ('approved', 'pending')
+        ORDER BY id
+    """), params).fetchall()
+    for row in ods:
+        if row.status.lower() == 'approved':
+            snapshot.approved_od[row.employee_id] |= _bit(row.od_date)
+        else:
+            snapshot.pending_od[row.employee_id] |= _bit(row.od_date)
+            snapshot.pending_od_rows[row.employee_id].append(row)
+
+    regs = db.execute(text("""
+        SELECT id, employee_id, punch_date, reason, status, issue_type
+        FROM attendance_regularizations
+        WHERE punch_date BETWEEN :start_date AND :end_date
+        AND LOWER(status) IN ('approved', 'pending')
+        ORDER BY id
+    """), params).fetchall()
+    for row in regs:
+        if row.status.lower() == 'approved':
+            snapshot.approved_reg[row.employee_id] |= _bit(row.punch_date)
+        else:
+            snapshot.pending_reg[row.employee_id] |= _bit(row.punch_date)
+            snapshot.pending_reg_rows[row.employee_id].append(row)
+
+    punches = db.execute(text("""
+        SELECT employee_id, date, in_time, out_time
+        FROM attendance_punches
+        WHERE date BETWEEN :start_date AND :end_date
+        ORDER BY id
+    """), params).fetchall()
+    for row in punches:
+        # Keep the first punch per employee/day, like the per-day fetchone() lookup
+        snapshot.punches[str(row.employee_id)].setdefault(row.date, row)
+
+    return snapshot
+
+
+def _employee_punches(snapshot: MonthSnapshot, employee_id: int, employee_code: str | None) -> Dict[date, object]:
+    by_id = snapshot.punches.get(str(employee_id), {})
+    by_code = snapshot.punches.get(employee_code, {}) if employee_code else {}
+    if not by_code:
+        return by_id
+    merged = dict(by_code)
+    merged.update(by_id)
+    return merged
+
+
+def employee_issues(snapshot: MonthSnapshot, working_days: List[date], employee_id: int, employee_code: str | None) -> List[Dict]:
+    """Evaluate one employee against the snapshot, in the same order as the legacy checks"""
+    issues = []
+
+    for row in snapshot.pending_leave_rows.get(employee_id, []):
+        issues.append({
+            'issue_type': 'Pending Leave Application',
+            'issue_description': f"Leave application from {row.from_date} to {row.to_date} is pending approval",
+            'date': str(row.from_date),
+            'severity': 'critical',
+            'action_required': 'Approve or reject leave application before running payroll'
+        })
+
+    approved_leave = snapshot.approved_leave.get(employee_id, 0)
+    approved_od = snapshot.approved_od.get(employee_id, 0)
+    approved_reg = snapshot.approved_reg.get(employee_id, 0)
+    pending_any = (
+        snapshot.pending_leave.get(employee_id, 0)
+        | snapshot.pending_od.get(employee_id, 0)
+        | snapshot.pending_reg.get(employee_id, 0)
+    )
+    punches = _employee_punches(snapshot, employee_id, employee_code)
+
+    for check_date in working_days:
+        bit = _bit(check_date)
+        date_str = str(check_date)
+
+        if (approved_leave | approved_od) & bit:
+            continue
+
+        punch = punches.get(check_date)
+        if punch is not None:
+            has_in_time = _has_time(punch.in_time)
+            has_out_time = _has_time(punch.out_time)
+            if (not has_in_time or not has_out_time) and not approved_reg & bit:
+                missing_type = "Missing OUT" if has_in_time else "Missing IN"
+                issues.append({
+                    'issue_type': 'Incomplete Punch',
+                    'issue_description': f"{missing_type} punch for {date_str} - requires regularization",
+                    'date': date_str,
+                    'severity': 'critical',
+                    'action_required': 'Apply for attendance regularization'
+                })
+            continue
+
+        if pending_any & bit:
+            continue
+
+        issues.append({
+            'issue_type': 'Absent',
+            'issue_description': f"No attendance record for {date_str} - marked as absent",
+            'date': date_str,
+            'severity': 'warning',
+            'action_required': 'Apply for leave, OD, or regularization if employee was present'
+        })
+
+    for row in snapshot.pending_od_rows.get(employee_id, []):
+        issues.append({
+            'issue_type': 'Pending OD Approval',
+            'issue_description': f"OD application for {row.od_date} is pending approval - {row.purpose}",
+            'date': str(row.od_date),
+            'severity': 'critical',
+            'action_required': 'Approve or reject OD application'
+        })
+
+    for row in snapshot.pending_reg_rows.get(employee_id, []):
+        issues.append({
+            'issue_type': 'Pending Regularization',
+            'issue_description': f"Attendance regularization for {row.punch_date} is pending - {row.issue_type}: {row.reason}",
+            'date': str(row.punch_date),
+            'severity': 'critical',
+            'action_required': 'Approve or reject regularization request'
+        })
+
+    return issues
+
+
+def compute_validation_issues(db: Session, month: int, year: int, today: date | None = None) -> List[Dict]:
+    """Validate every salary-structure-linked employee for a month"""
+    employees = db.execute(LINKED_EMPLOYEES_QUERY).fetchall()
+    snapshot = load_month_snapshot(db, month, year, today)
+    working_days = snapshot.working_days()
+
+    issues = []
+    for emp in employees:
+        for issue in employee_issues(snapshot, working_days, emp.id, emp.employee_code):
+            issue.update({
+                'employee_id': emp.employee_code or str(emp.id),
+                'employee_name': emp.name
+            })
+            issues.append(issue)
+    return issues
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from database import get_tenant_db
+from database import AsyncTenantSession, get_tenant_db_async
 from models.models_tenant import PMSAppraisal, User
 from pydantic import BaseModel
 from typing import Optional
@@ -22,8 +22,7 @@ class AppraisalCreate(BaseModel):
     effective_from: Optional[date] = None
     status: str = "Proposed"
 
-@router.post("/appraisals")
-async def create_appraisal(appraisal: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+def _create_appraisal(db: Session, appraisal: dict, request: Request, user):
     try:
         # Parse date if provided
         effective_from = None
@@ -60,8 +59,11 @@ async def create_appraisal(appraisal: dict, request: Request, db: Session = Depe
         print(f"Error creating appraisal: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error creating appraisal: {str(e)}")
 
-@router.get("/appraisals")
-async def get_appraisals(db: Session = Depends(get_tenant_db)):
+@router.post("/appraisals")
+async def create_appraisal(appraisal: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_create_appraisal, appraisal, request, user)
+
+def _get_appraisals(db: Session):
     try:
         appraisals = db.query(PMSAppraisal).all()
         
@@ -142,8 +144,11 @@ async def get_appraisals(db: Session = Depends(get_tenant_db)):
         print(f"Error fetching appraisals: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching appraisals: {str(e)}")
 
-@router.put("/appraisals/{appraisal_id}")
-async def update_appraisal(appraisal_id: int, appraisal: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.get("/appraisals")
+async def get_appraisals(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    return await db.run(_get_appraisals)
+
+def _update_appraisal(db: Session, appraisal_id: int, appraisal: dict, request: Request, user):
     try:
         db_appraisal = db.query(PMSAppraisal).filter(PMSAppraisal.id == appraisal_id).first()
         if not db_appraisal:
@@ -166,8 +171,11 @@ async def update_appraisal(appraisal_id: int, appraisal: dict, request: Request,
         print(f"Error updating appraisal: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error updating appraisal: {str(e)}")
 
-@router.delete("/appraisals/{appraisal_id}")
-async def delete_appraisal(appraisal_id: int, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.put("/appraisals/{appraisal_id}")
+async def update_appraisal(appraisal_id: int, appraisal: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_update_appraisal, appraisal_id, appraisal, request, user)
+
+def _delete_appraisal(db: Session, appraisal_id: int, request: Request, user):
     db_appraisal = db.query(PMSAppraisal).filter(PMSAppraisal.id == appraisal_id).first()
     if not db_appraisal:
         raise HTTPException(status_code=404, detail="Appraisal not found")
@@ -180,4 +188,8 @@ async def delete_appraisal(appraisal_id: int, request: Request, db: Session = De
     
     # Audit log
     audit_crud(request, "tenant", user, "DELETE_APPRAISAL", "pms_appraisals", str(appraisal_id), old_values, None)
-    return {"message": "Appraisal deleted successfully"}
\ No newline at end of file
+    return {"message": "Appraisal deleted successfully"}
+
+@router.delete("/appraisals/{appraisal_id}")
+async def delete_appraisal(appraisal_id: int, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_delete_appraisal, appraisal_id, request, user)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from database import get_tenant_db
+from database import AsyncTenantSession, get_tenant_db_async
 from models.models_tenant import PMSGoal, User
 from pydantic import BaseModel, validator
 from typing import Optional
@@ -11,8 +11,7 @@ from routes.hospital import get_current_user
 
 router = APIRouter()
 
-@router.get("/employees")
-async def get_employees(db: Session = Depends(get_tenant_db)):
+def _get_employees(db: Session):
     try:
         users = db.query(User).all()
         employees = []
@@ -29,10 +28,13 @@ async def get_employees(db: Session = Depends(get_tenant_db)):
         print(f"Error fetching employees: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching employees: {str(e)}")
 
+@router.get("/employees")
+async def get_employees(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    return await db.run(_get_employees)
 
 
-@router.get("/test-response")
-async def test_response(db: Session = Depends(get_tenant_db)):
+
+def _test_response(db: Session):
     try:
         goals = db.query(PMSGoal).limit(1).all()
         if goals:
@@ -63,8 +65,11 @@ async def test_response(db: Session = Depends(get_tenant_db)):
     except Exception as e:
         return {"error": str(e)}
 
-@router.post("/goals")
-async def create_goal(goal: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.get("/test-response")
+async def test_response(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    return await db.run(_test_response)
+
+def _create_goal(db: Session, goal: dict, request: Request, user):
     try:
         print(f"Received goal data: {goal}")
         
@@ -125,12 +130,18 @@ async def create_goal(goal: dict, request: Request, db: Session = Depends(get_te
         traceback.print_exc()
         raise HTTPException(status_code=422, detail=f"Error creating goal: {str(e)}")
 
-@router.get("/goals")
-async def get_goals(db: Session = Depends(get_tenant_db)):
+@router.post("/goals")
+async def create_goal(goal: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_create_goal, goal, request, user)
+
+def _get_goals(db: Session):
     try:
         print("Starting to fetch goals...")
         goals = db.query(PMSGoal).all()
         print(f"Found {len(goals)} goals")
+
+        employee_ids = {goal.employee_id for goal in goals if goal.employee_id is not None}
+        employees = {u.id: u for u in db.query(User).filter(User.id.in_(employee_ids))} if employee_ids else {}
         
         goals_data = []
         for goal in goals:
@@ -139,7 +150,7 @@ async def get_goals(db: Session = Depends(get_tenant_db)):
                 employee = None
                 employee_name = "Unknown"
                 if goal.employee_id is not None:
-                    employee = db.query(User).filter(User.id == goal.employee_id).first()
+                    employee = employees.get(goal.employee_id)
                     if employee:
                         employee_name = employee.name
                 
@@ -191,8 +202,11 @@ async def get_goals(db: Session = Depends(get_tenant_db)):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error fetching goals: {str(e)}")
 
-@router.put("/goals/{goal_id}")
-async def update_goal(goal_id: int, goal: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.get("/goals")
+async def get_goals(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    return await db.run(_get_goals)
+
+def _update_goal(db: Session, goal_id: int, goal: dict, request: Request, user):
     try:
         db_goal = db.query(PMSGoal).filter(PMSGoal.id == goal_id).first()
         if not db_goal:
@@ -258,8 +272,11 @@ async def update_goal(goal_id: int, goal: dict, request: Request, db: Session =
         print(f"Error updating goal: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error updating goal: {str(e)}")
 
-@router.delete("/goals/{goal_id}")
-async def delete_goal(goal_id: int, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.put("/goals/{goal_id}")
+async def update_goal(goal_id: int, goal: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_update_goal, goal_id, goal, request, user)
+
+def _delete_goal(db: Session, goal_id: int, request: Request, user):
     try:
         db_goal = db.query(PMSGoal).filter(PMSGoal.id == goal_id).first()
         if not db_goal:
@@ -280,3 +297,7 @@ async def delete_goal(goal_id: int, request: Request, db: Session = Depends(get_
         print(f"Error deleting goal: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error deleting goal: {str(e)}")
 
+@router.delete("/goals/{goal_id}")
+async def delete_goal(goal_id: int, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_delete_goal, goal_id, request, user)
+
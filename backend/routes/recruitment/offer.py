@@ -839,19 +839,31 @@ def reset_bgv_status(candidate_id: int, db: Session = Depends(get_tenant_db)):
 # -----------------------------------------------------------
 @router.get("/list")
 def list_offers(db: Session = Depends(get_tenant_db)):
+    from models.models_tenant import OnboardingCandidate
+
     offers = db.query(OfferLetter).all()
+
+    # BGV and onboarding rows for every candidate on the page, first match per candidate
+    candidate_ids = {offer.candidate_id for offer in offers if offer.candidate_id is not None}
+    bgv_by_candidate = {}
+    onboarded_candidates = set()
+    if candidate_ids:
+        for bgv in db.query(BGV).filter(BGV.candidate_id.in_(candidate_ids)).order_by(BGV.id):
+            bgv_by_candidate.setdefault(bgv.candidate_id, bgv)
+        onboarded_candidates = {
+            application_id for (application_id,) in db.query(OnboardingCandidate.application_id).filter(
+                OnboardingCandidate.application_id.in_(candidate_ids)
+            ).distinct()
+        }
     
     # Enrich offers with BGV information from database
     enriched_offers = []
     for offer in offers:
         # Get BGV record from database first
-        db_bgv = db.query(BGV).filter(BGV.candidate_id == offer.candidate_id).first()
+        db_bgv = bgv_by_candidate.get(offer.candidate_id)
         
         # Check if candidate has started onboarding
-        from models.models_tenant import OnboardingCandidate
-        onboarding_record = db.query(OnboardingCandidate).filter(
-            OnboardingCandidate.application_id == offer.candidate_id
-        ).first()
+        onboarding_record = offer.candidate_id in onboarded_candidates
         
         # Fallback to in-memory records if no database record
         candidate_bgv = None
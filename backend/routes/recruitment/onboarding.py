@@ -206,9 +206,11 @@ def list_onboarded_employees(db: Session = Depends(get_tenant_db)):
         employees = db.query(OnboardingCandidate).all()
         
         # Get candidate email from Candidate table
+        application_ids = {emp.application_id for emp in employees}
+        candidates = {c.id: c for c in db.query(Candidate).filter(Candidate.id.in_(application_ids))} if application_ids else {}
         enriched_employees = []
         for emp in employees:
-            candidate = db.query(Candidate).filter(Candidate.id == emp.application_id).first()
+            candidate = candidates.get(emp.application_id)
             
             employee_data = {
                 "id": emp.id,
@@ -65,22 +65,6 @@ def generate_referral_link(
 ):
     """Generate referral link for employees to share"""
     try:
-        # Create referral_links table if not exists
-        create_table_query = text("""
-            CREATE TABLE IF NOT EXISTS referral_links (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                job_id INT NOT NULL,
-                referrer_employee_id INT NOT NULL,
-                referrer_name VARCHAR(255) NOT NULL,
-                referral_code VARCHAR(50) UNIQUE NOT NULL,
-                referral_url TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                status VARCHAR(20) DEFAULT 'Active'
-            )
-        """)
-        db.execute(create_table_query)
-        db.commit()
-        
         # Generate unique referral code
         referral_code = f"REF_{data.job_id}_{uuid.uuid4().hex[:8].upper()}"
         referral_url = f"http://localhost:3000/apply/{data.job_id}?ref={referral_code}"
@@ -5,6 +5,8 @@ from models.models_master import Hospital
 from models.models_tenant import Role, Permission, RolePermission
 from .tenant_seed import seed_tenant
 from utils.audit_logger import audit_crud
+from utils.permissions import invalidate_role_permissions
+from utils.pagination import page_limit, parse_fields, project, keyset_page
 
 import database
 from database import logger
@@ -66,6 +68,7 @@ def create_role(
                     tdb.add(RolePermission(role_id=new_role.id, permission_id=perm.id))
 
             tdb.commit()
+            invalidate_role_permissions(str(hospital.db_name))
             
             # Audit log
             audit_crud(request, tenant_db, user, "CREATE_ROLE", "roles", str(new_role.id), {}, {"name": payload["name"], "permissions": permission_names})
@@ -81,9 +84,42 @@ def create_role(
 # ---------------------------------------------------
 # LIST ROLES  🔒 Protected
 # ---------------------------------------------------
+def query_roles_page(tdb: Session, after_id: int | None = None, limit: int | None = None) -> list:
+    """Roles ordered by id plus their permission names, in two queries for any page size"""
+    query = tdb.query(Role).order_by(Role.id)
+    if after_id is not None:
+        query = query.filter(Role.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    roles = query.all()
+    if not roles:
+        return []
+
+    perm_names = {role.id: [] for role in roles}
+    rows = (
+        tdb.query(RolePermission.role_id, Permission.name)
+        .join(Permission, Permission.id == RolePermission.permission_id)
+        .filter(RolePermission.role_id.in_(list(perm_names)))
+        .order_by(Permission.id)
+        .all()
+    )
+    for role_id, name in rows:
+        perm_names[role_id].append(name)
+
+    return [{
+        "id": role.id,
+        "name": role.name,
+        "description": role.description,
+        "permissions": perm_names[role.id]
+    } for role in roles]
+
+
 @router.get("/roles/{tenant_db}/list")
 def list_roles(
     tenant_db: str,
+    after_id: int | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
     db: Session = Depends(database.get_master_db),
     user = Depends(get_current_user)   # 🔐 Token required
 ):
@@ -93,31 +129,12 @@ def list_roles(
     engine = database.get_tenant_engine(str(hospital.db_name))
     tdb = Session(bind=engine)
 
+    limit = page_limit(limit)
     with tdb:
-        roles = tdb.query(Role).all()
-        result = []
-
-        for role in roles:
-            perm_ids = (
-                tdb.query(RolePermission.permission_id)
-                .filter(RolePermission.role_id == role.id).all()
-            )
-            perm_ids = [p[0] for p in perm_ids]
-
-            perm_names = (
-                tdb.query(Permission.name)
-                .filter(Permission.id.in_(perm_ids)).all()
-            )
-            perm_names = [p[0] for p in perm_names]
-
-            result.append({
-                "id": role.id,
-                "name": role.name,
-                "description": role.description,
-                "permissions": perm_names
-            })
+        result = query_roles_page(tdb, after_id, limit)
 
-        return {"roles": result}
+    selected = parse_fields(fields)
+    return {"roles": [project(item, selected) for item in result], **keyset_page(result, limit)}
 
 
 # ---------------------------------------------------
@@ -148,6 +165,7 @@ def delete_role(
         tdb.query(RolePermission).filter(RolePermission.role_id == role_id).delete()
         tdb.delete(role)
         tdb.commit()
+        invalidate_role_permissions(str(hospital.db_name))
         
         # Audit log
         audit_crud(request, tenant_db, user, "DELETE_ROLE", "roles", str(role_id), old_values, {})
@@ -193,6 +211,7 @@ def update_role(
                 tdb.add(RolePermission(role_id=role.id, permission_id=perm.id))
 
         tdb.commit()
+        invalidate_role_permissions(str(hospital.db_name))
         
         # Audit log
         audit_crud(request, tenant_db, user, "UPDATE_ROLE", "roles", str(role_id), old_values, {"name": payload["name"], "permissions": payload.get("permissions", [])})
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from database import get_tenant_db
+from database import AsyncTenantSession, get_tenant_db_async
 from models.models_tenant import TrainingProgram, User
 from pydantic import BaseModel
 from typing import Optional
@@ -21,8 +21,7 @@ class TrainingProgramCreate(BaseModel):
     max_participants: Optional[int] = None
     status: str = "Draft"
 
-@router.post("/programs")
-async def create_training_program(program: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+def _create_training_program(db: Session, program: dict, request: Request, user):
     try:
         # Parse dates
         start_date = None
@@ -66,8 +65,11 @@ async def create_training_program(program: dict, request: Request, db: Session =
         print(f"Error creating training program: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error creating training program: {str(e)}")
 
-@router.get("/programs")
-async def get_training_programs(db: Session = Depends(get_tenant_db)):
+@router.post("/programs")
+async def create_training_program(program: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_create_training_program, program, request, user)
+
+def _get_training_programs(db: Session):
     try:
         programs = db.query(TrainingProgram).all()
         
@@ -92,8 +94,11 @@ async def get_training_programs(db: Session = Depends(get_tenant_db)):
         print(f"Error fetching training programs: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching training programs: {str(e)}")
 
-@router.put("/programs/{program_id}")
-async def update_training_program(program_id: int, program: dict, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.get("/programs")
+async def get_training_programs(db: AsyncTenantSession = Depends(get_tenant_db_async)):
+    return await db.run(_get_training_programs)
+
+def _update_training_program(db: Session, program_id: int, program: dict, request: Request, user):
     try:
         db_program = db.query(TrainingProgram).filter(TrainingProgram.id == program_id).first()
         if not db_program:
@@ -137,8 +142,11 @@ async def update_training_program(program_id: int, program: dict, request: Reque
         print(f"Error updating training program: {str(e)}")
         raise HTTPException(status_code=422, detail=f"Error updating training program: {str(e)}")
 
-@router.delete("/programs/{program_id}")
-async def delete_training_program(program_id: int, request: Request, db: Session = Depends(get_tenant_db), user = Depends(get_current_user)):
+@router.put("/programs/{program_id}")
+async def update_training_program(program_id: int, program: dict, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_update_training_program, program_id, program, request, user)
+
+def _delete_training_program(db: Session, program_id: int, request: Request, user):
     try:
         db_program = db.query(TrainingProgram).filter(TrainingProgram.id == program_id).first()
         if not db_program:
@@ -157,4 +165,8 @@ async def delete_training_program(program_id: int, request: Request, db: Session
     except Exception as e:
         db.rollback()
         print(f"Error deleting training program: {str(e)}")
-        raise HTTPException(status_code=422, detail=f"Error deleting training program: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=422, detail=f"Error deleting training program: {str(e)}")
+
+@router.delete("/programs/{program_id}")
+async def delete_training_program(program_id: int, request: Request, db: AsyncTenantSession = Depends(get_tenant_db_async), user = Depends(get_current_user)):
+    return await db.run(_delete_training_program, program_id, request, user)
\ No newline at end of file
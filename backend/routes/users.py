@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.models_master import Hospital
 from models.models_tenant import User, Role, Department
 import schemas.schemas_tenant as schemas_tenant
@@ -7,6 +7,8 @@ import database
 from database import logger
 from passlib.context import CryptContext
 from utils.audit_logger import audit_crud
+from utils.pagination import page_limit, parse_fields, project, keyset_page
+from utils.user_directory import email_taken_elsewhere, upsert_user_entry, remove_user_entry
 
 # 🔐 added for token authentication
 from routes.hospital import get_current_user
@@ -45,6 +47,9 @@ def create_user(
             if tdb.query(User).filter(User.email == payload.email).first():
                 raise HTTPException(400, "Email already exists")
 
+            if email_taken_elsewhere(db, payload.email, str(hospital.db_name)):
+                raise HTTPException(400, "Email already registered with another hospital")
+
             role = tdb.query(Role).filter(Role.id == payload.role_id).first()
             if not role:
                 raise HTTPException(400, f"Role with id {payload.role_id} not found")
@@ -66,6 +71,8 @@ def create_user(
             tdb.add(new_user)
             tdb.commit()
             tdb.refresh(new_user)
+
+            upsert_user_entry(db, hospital, new_user.id, new_user.email)
             
             # Audit log
             audit_crud(request, tenant_db, user, "CREATE_USER", "users", str(new_user.id), {}, {"name": payload.name, "email": payload.email})
@@ -84,9 +91,48 @@ def create_user(
 # ============================================================
 # LIST USERS 🔒 Protected
 # ============================================================
+def user_list_item(u) -> dict:
+    role_name = u.role.name if u.role else "No Role"
+    dept_name = u.department.name if u.department else "No Department"
+    return {
+        "id": u.id,
+        "name": u.name,
+        "email": u.email,
+        "role_id": u.role_id,
+        "role": role_name,
+        "role_name": role_name,
+        "department_id": u.department_id,
+        "department": dept_name,
+        "department_name": dept_name,
+        "employee_code": getattr(u, 'employee_code', None),
+        "employee_type": getattr(u, 'employee_type', None),
+        "designation": getattr(u, 'designation', None),
+        "joining_date": str(getattr(u, 'joining_date', None)) if getattr(u, 'joining_date', None) else None,
+        "status": getattr(u, 'status', 'Active'),
+        "is_employee": bool(getattr(u, 'employee_code', None)),
+        "created_at": str(u.created_at)
+    }
+
+
+def query_users_page(tdb: Session, after_id: int | None = None, limit: int | None = None) -> list:
+    """Users ordered by id with role and department joined in the same query"""
+    query = tdb.query(User).options(
+        joinedload(User.role),
+        joinedload(User.department)
+    ).order_by(User.id)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [user_list_item(u) for u in query.all()]
+
+
 @router.get("/users/{tenant_db}/list")
 def list_users(
     tenant_db: str,
+    after_id: int | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
     db: Session = Depends(database.get_master_db),
     user = Depends(get_current_user)    # 🔐 Token required
 ):
@@ -96,34 +142,12 @@ def list_users(
     engine = database.get_tenant_engine(str(hospital.db_name))
     tdb = Session(bind=engine)
 
+    limit = page_limit(limit)
     with tdb:
-        users = tdb.query(User).all()
+        output = query_users_page(tdb, after_id, limit)
 
-        output = []
-        for u in users:
-            role_name = u.role.name if u.role else "No Role"
-            dept_name = u.department.name if u.department else "No Department"
-            
-            output.append({
-                "id": u.id,
-                "name": u.name,
-                "email": u.email,
-                "role_id": u.role_id,
-                "role": role_name,
-                "role_name": role_name,
-                "department_id": u.department_id,
-                "department": dept_name,
-                "department_name": dept_name,
-                "employee_code": getattr(u, 'employee_code', None),
-                "employee_type": getattr(u, 'employee_type', None),
-                "designation": getattr(u, 'designation', None),
-                "joining_date": str(getattr(u, 'joining_date', None)) if getattr(u, 'joining_date', None) else None,
-                "status": getattr(u, 'status', 'Active'),
-                "is_employee": bool(getattr(u, 'employee_code', None)),
-                "created_at": str(u.created_at)
-            })
-
-        return {"users": output}
+    selected = parse_fields(fields)
+    return {"users": [project(item, selected) for item in output], **keyset_page(output, limit)}
 
 
 # ============================================================
@@ -132,10 +156,13 @@ def list_users(
 @router.get("/hospitals/users/{tenant_db}/list")
 def list_users_hospitals(
     tenant_db: str,
+    after_id: int | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
     db: Session = Depends(database.get_master_db),
     user = Depends(get_current_user)    # 🔐 Token required
 ):
-    return list_users(tenant_db, db, user)
+    return list_users(tenant_db, after_id=after_id, limit=limit, fields=fields, db=db, user=user)
 
 
 # ============================================================
@@ -168,6 +195,8 @@ def update_user(
         if payload.name is not None:
             setattr(existing_user, 'name', payload.name)
         if payload.email is not None:
+            if email_taken_elsewhere(db, payload.email, str(hospital.db_name)):
+                raise HTTPException(400, "Email already registered with another hospital")
             setattr(existing_user, 'email', payload.email)
         if payload.role_id is not None:
             setattr(existing_user, 'role_id', payload.role_id)
@@ -177,6 +206,9 @@ def update_user(
             setattr(existing_user, 'password', pwd_context.hash(payload.password))
 
         tdb.commit()
+
+        if payload.email is not None:
+            upsert_user_entry(db, hospital, existing_user.id, existing_user.email)
         
         # Audit log
         audit_crud(request, tenant_db, user, "UPDATE_USER", "users", str(user_id), old_values, payload.dict(exclude_unset=True))
@@ -212,6 +244,8 @@ def delete_user(
 
         tdb.delete(user_to_delete)
         tdb.commit()
+
+        remove_user_entry(db, str(hospital.db_name), user_id)
         
         # Audit log
         audit_crud(request, tenant_db, user, "DELETE_USER", "users", str(user_id), old_values, {})
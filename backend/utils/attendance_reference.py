@@ -0,0 +1,101 @@
+import os
+from datetime import datetime, time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from models.models_tenant import AttendanceRule, Shift
+from database import open_tenant_session, logger
+from utils.ttl_cache import TTLCache
+
+# Safety net for changes made by other processes; shift and rule writes invalidate immediately
+ATTENDANCE_REFERENCE_TTL = float(os.getenv("ATTENDANCE_REFERENCE_TTL", 300))
+ATTENDANCE_REFERENCE_TENANTS = int(os.getenv("ATTENDANCE_REFERENCE_TENANTS", 200))
+
+# tenant_db -> AttendanceReference
+_references = TTLCache(maxsize=ATTENDANCE_REFERENCE_TENANTS, ttl=ATTENDANCE_REFERENCE_TTL)
+
+
+def shift_minutes(value) -> Optional[int]:
+    """'HH:MM' shift time as minutes after midnight; None when it doesn't parse"""
+    try:
+        parsed = datetime.strptime(str(value), '%H:%M')
+    except (ValueError, TypeError):
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+class AttendanceReference:
+    """A tenant's shifts as (start, end) minute offsets and the active Late/Early grace minutes"""
+
+    def __init__(self, shifts: dict, late_grace: Optional[int], early_grace: Optional[int]):
+        self.shifts = shifts
+        self.late_grace = late_grace
+        self.early_grace = early_grace
+
+
+def load_attendance_reference(tdb: Session) -> AttendanceReference:
+    """All shifts and the first active Late and Early rule, in two queries"""
+    shifts = {}
+    for shift_id, start, end in tdb.query(Shift.id, Shift.start_time, Shift.end_time):
+        start_minutes, end_minutes = shift_minutes(start), shift_minutes(end)
+        # shifts with unreadable timings never produce Late/Early
+        if start_minutes is not None and end_minutes is not None:
+            shifts[shift_id] = (start_minutes, end_minutes)
+
+    grace = {}
+    rules = tdb.query(AttendanceRule.rule_type, AttendanceRule.value).filter(
+        AttendanceRule.rule_type.in_(('Late', 'Early')),
+        AttendanceRule.is_active.is_(True)  # type: ignore
+    ).order_by(AttendanceRule.id)
+    for rule_type, value in rules:
+        grace.setdefault(rule_type, value)
+
+    return AttendanceReference(shifts, grace.get('Late'), grace.get('Early'))
+
+
+def tenant_attendance_reference(tenant_db: str, tdb: Session | None = None) -> AttendanceReference:
+    """Cached reference data for a tenant; pass tdb to reuse an open session on a miss"""
+    reference = _references.get(tenant_db)
+    if reference is not None:
+        return reference
+
+    if tdb is not None:
+        reference = load_attendance_reference(tdb)
+    else:
+        with open_tenant_session(tenant_db) as session:
+            reference = load_attendance_reference(session)
+    _references.set(tenant_db, reference)
+    logger.info(f"Loaded {len(reference.shifts)} shifts and attendance rules for {tenant_db}")
+    return reference
+
+
+def session_attendance_reference(tdb: Session) -> AttendanceReference:
+    """Reference data for the tenant a session is bound to"""
+    return tenant_attendance_reference(str(tdb.get_bind().url.database), tdb)
+
+
+def invalidate_attendance_reference(tenant_db: str):
+    """Drop a tenant's cached shifts and rules after either changes"""
+    _references.pop(tenant_db)
+
+
+def attendance_status(reference: AttendanceReference, shift_id: Optional[int],
+                      in_time: Optional[time], out_time: Optional[time]) -> str:
+    """Late/Early/Present for a punch against its rostered shift; no I/O, safe to call per row in a batch"""
+    shift = reference.shifts.get(shift_id)
+    if shift is None:
+        return 'Present'
+    start_minutes, end_minutes = shift
+
+    # Check Late (check-in after shift start + grace)
+    if in_time is not None and reference.late_grace is not None:
+        if in_time.hour * 60 + in_time.minute > start_minutes + reference.late_grace:
+            return 'Late'
+
+    # Check Early (check-out before shift end - grace)
+    if out_time is not None and reference.early_grace is not None:
+        if out_time.hour * 60 + out_time.minute < end_minutes - reference.early_grace:
+            return 'Early'
+
+    return 'Present'
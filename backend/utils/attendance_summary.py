@@ -0,0 +1,183 @@
+"""
+Monthly attendance summary.
+
+attendance_monthly_summary holds one row per employee-month with day counts
+by punch status, worked minutes and OT minutes. Punch writes refresh only the
+employee-months they touch, inside the writer's transaction, so reports,
+payslips and payroll read a handful of rows instead of scanning punches.
+attendance_daily_totals holds the tenant-wide punch count per day and status
+for the daily report and is refreshed for the touched days the same way.
+rebuild_attendance_summary and rebuild_daily_totals recompute whole months
+(rebuild_attendance_summary.py).
+"""
+import calendar
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+# Worked time beyond this per day counts as OT
+STANDARD_DAY_MINUTES = 8 * 60
+
+SUMMARY_COLUMNS = [
+    "present_days", "late_days", "early_days", "absent_days", "punched_days", "worked_minutes", "ot_minutes",
+]
+
+# Night shifts punch out after midnight, so a negative span wraps by a day
+SUMMARY_SELECT_SQL = """
+    SELECT employee_id, yr AS year, mon AS month,
+           SUM(status = 'Present') AS present_days, SUM(status = 'Late') AS late_days,
+           SUM(status = 'Early') AS early_days, SUM(status = 'Absent') AS absent_days,
+           COUNT(*) AS punched_days, SUM(worked) AS worked_minutes,
+           SUM(GREATEST(worked - :standard_minutes, 0)) AS ot_minutes
+    FROM (
+        SELECT employee_id, YEAR(date) AS yr, MONTH(date) AS mon, status,
+               CASE WHEN in_time IS NULL OR out_time IS NULL THEN 0
+                    ELSE (TIME_TO_SEC(out_time) - TIME_TO_SEC(in_time)
+                          + IF(out_time < in_time, 86400, 0)) DIV 60
+               END AS worked
+        FROM attendance_punches
+        WHERE {where}
+    ) punches
+    GROUP BY employee_id, yr, mon
+"""
+
+_AGGREGATE_SQL = (
+    "INSERT INTO attendance_monthly_summary (employee_id, year, month, " + ", ".join(SUMMARY_COLUMNS) + ")"
+    + SUMMARY_SELECT_SQL
+    + "ON DUPLICATE KEY UPDATE " + ", ".join(f"{name} = VALUES({name})" for name in SUMMARY_COLUMNS)
+    + ", updated_at = NOW()"
+)
+
+# NULL statuses are stored as 'Unknown' so the unique (date, status) key holds
+DAILY_TOTALS_SELECT_SQL = """
+    SELECT date, COALESCE(status, 'Unknown') AS status, COUNT(*) AS punches
+    FROM attendance_punches
+    WHERE {where}
+    GROUP BY date, COALESCE(status, 'Unknown')
+"""
+
+_DAILY_TOTALS_SQL = "INSERT INTO attendance_daily_totals (date, status, punches)" + DAILY_TOTALS_SELECT_SQL
+
+
+def _month_bounds(year: int, month: int) -> tuple:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def refresh_attendance_summary(db: Session, keys: Iterable[tuple]) -> int:
+    """Recompute the employee-months and daily totals covering (employee_id, date) pairs; caller commits"""
+    by_month = defaultdict(set)
+    days = set()
+    for employee_id, punch_date in keys:
+        if isinstance(punch_date, str):
+            punch_date = date.fromisoformat(punch_date[:10])
+        by_month[(punch_date.year, punch_date.month)].add(int(employee_id))
+        days.add(punch_date)
+
+    delete_stmt = text("""
+        DELETE FROM attendance_monthly_summary
+        WHERE year = :year AND month = :month AND employee_id IN :employee_ids
+    """).bindparams(bindparam("employee_ids", expanding=True))
+    insert_stmt = text(_AGGREGATE_SQL.format(
+        where="date BETWEEN :start_date AND :end_date AND employee_id IN :employee_ids"
+    )).bindparams(bindparam("employee_ids", expanding=True))
+
+    for (year, month), employee_ids in by_month.items():
+        start_date, end_date = _month_bounds(year, month)
+        ids = sorted(employee_ids)
+        # the delete covers employee-months whose punches are all gone (date moved or deleted)
+        db.execute(delete_stmt, {"year": year, "month": month, "employee_ids": ids})
+        db.execute(insert_stmt, {"start_date": start_date, "end_date": end_date, "employee_ids": ids,
+                                 "standard_minutes": STANDARD_DAY_MINUTES})
+
+    if days:
+        params = {"days": sorted(days)}
+        db.execute(text("DELETE FROM attendance_daily_totals WHERE date IN :days")
+                   .bindparams(bindparam("days", expanding=True)), params)
+        db.execute(text(_DAILY_TOTALS_SQL.format(where="date IN :days"))
+                   .bindparams(bindparam("days", expanding=True)), params)
+    return sum(len(ids) for ids in by_month.values())
+
+
+def _range_filter(start: Optional[date], end: Optional[date]) -> tuple:
+    if start is None and end is None:
+        return "1 = 1", "1 = 1", {}
+    start = (start or date(1970, 1, 1)).replace(day=1)
+    end = _month_bounds((end or date.today()).year, (end or date.today()).month)[1]
+    return (
+        "date BETWEEN :start_date AND :end_date",
+        "year * 100 + month BETWEEN :first_month AND :last_month",
+        {"start_date": start, "end_date": end,
+         "first_month": start.year * 100 + start.month, "last_month": end.year * 100 + end.month},
+    )
+
+
+def rebuild_attendance_summary(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """Recompute whole months in [start, end], or everything; works on a session or connection, caller commits"""
+    punch_where, summary_where, params = _range_filter(start, end)
+    db.execute(text(f"DELETE FROM attendance_monthly_summary WHERE {summary_where}"), params)
+    result = db.execute(text(_AGGREGATE_SQL.format(where=punch_where)),
+                        {**params, "standard_minutes": STANDARD_DAY_MINUTES})
+    return result.rowcount
+
+
+def rebuild_daily_totals(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """Recompute the per-day totals for whole months in [start, end], or everything; caller commits"""
+    punch_where, _, params = _range_filter(start, end)
+    db.execute(text(f"DELETE FROM attendance_daily_totals WHERE {punch_where}"), params)
+    return db.execute(text(_DAILY_TOTALS_SQL.format(where=punch_where)), params).rowcount
+
+
+def summary_drift(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+    """Employee-months whose stored summary differs from a fresh aggregate of the punches"""
+    punch_where, summary_where, params = _range_filter(start, end)
+    expected = {
+        (row.employee_id, row.year, row.month): tuple(int(getattr(row, name) or 0) for name in SUMMARY_COLUMNS)
+        for row in db.execute(text(SUMMARY_SELECT_SQL.format(where=punch_where)),
+                              {**params, "standard_minutes": STANDARD_DAY_MINUTES})
+    }
+    stored = {
+        (row.employee_id, row.year, row.month): tuple(int(getattr(row, name) or 0) for name in SUMMARY_COLUMNS)
+        for row in db.execute(text(f"""
+            SELECT employee_id, year, month, {", ".join(SUMMARY_COLUMNS)}
+            FROM attendance_monthly_summary
+            WHERE {summary_where}
+        """), params)
+    }
+    drift = []
+    for key in sorted(expected.keys() | stored.keys()):
+        if expected.get(key) != stored.get(key):
+            drift.append({"employee_id": key[0], "year": key[1], "month": key[2],
+                          "stored": stored.get(key), "expected": expected.get(key)})
+    return drift
+
+
+def _row_dict(row) -> Dict:
+    values = {name: int(getattr(row, name) or 0) for name in SUMMARY_COLUMNS}
+    # payroll and payslips have always counted late arrivals as attended days
+    values["attended_days"] = values["present_days"] + values["late_days"]
+    return values
+
+
+def month_attendance(db: Session, year: int, month: int) -> Dict[int, Dict]:
+    """Summary per employee for one month"""
+    rows = db.execute(text(f"""
+        SELECT employee_id, {", ".join(SUMMARY_COLUMNS)}
+        FROM attendance_monthly_summary
+        WHERE year = :year AND month = :month
+    """), {"year": year, "month": month})
+    return {row.employee_id: _row_dict(row) for row in rows}
+
+
+def employee_month_attendance(db: Session, employee_id: int, year: int, month: int) -> Dict:
+    """Summary for one employee-month; zeros when there were no punches"""
+    row = db.execute(text(f"""
+        SELECT {", ".join(SUMMARY_COLUMNS)}
+        FROM attendance_monthly_summary
+        WHERE employee_id = :employee_id AND year = :year AND month = :month
+    """), {"employee_id": employee_id, "year": year, "month": month}).first()
+    if row is None:
+        return {**{name: 0 for name in SUMMARY_COLUMNS}, "attended_days": 0}
+    return _row_dict(row)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from models.models_master import AuditLog, ErrorLog
-from database import get_master_db
+from database import MasterSessionLocal
+from utils.audit_writer import audit_writer
 import json
 import traceback
 from datetime import datetime
@@ -35,24 +36,25 @@ def log_audit(
     ip_address: str | None = None,
     user_agent: str | None = None
 ):
-    """Log audit trail to master database"""
+    """Log audit trail to master database (queued when the background writer is running)"""
+    row = dict(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        action=action,
+        table_name=table_name,
+        record_id=str(record_id) if record_id else None,
+        old_values=old_values,
+        new_values=new_values,
+        ip_address=ip_address,
+        user_agent=user_agent
+    )
+    if audit_writer.submit(row):
+        return
+
     try:
-        master_db = next(get_master_db())
-        
-        audit_log = AuditLog(
-            tenant_id=tenant_id,
-            user_id=user_id,
-            action=action,
-            table_name=table_name,
-            record_id=str(record_id) if record_id else None,
-            old_values=old_values,
-            new_values=new_values,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-        
-        master_db.add(audit_log)
-        master_db.commit()
+        with MasterSessionLocal() as master_db:
+            master_db.add(AuditLog(**row))
+            master_db.commit()
     except Exception as e:
         print(f"Audit logging failed: {str(e)}")
 
@@ -86,7 +88,7 @@ def log_error(
 ):
     """Log errors to master database"""
     try:
-        master_db = next(get_master_db())
+        master_db = MasterSessionLocal()
         
         error_log = ErrorLog(
             tenant_id=tenant_id,
@@ -100,8 +102,9 @@ def log_error(
             ip_address=ip_address
         )
         
-        master_db.add(error_log)
-        master_db.commit()
+        with master_db:
+            master_db.add(error_log)
+            master_db.commit()
     except Exception as e:
         print(f"Error logging failed: {str(e)}")
 
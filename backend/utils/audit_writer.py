@@ -0,0 +1,243 @@
+import os
+import re
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.exc import OperationalError, InterfaceError, SQLAlchemyError
+from database import master_engine, logger
+from models.models_master import AuditLog
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", 10000))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 200))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1.0))
+AUDIT_ENQUEUE_TIMEOUT = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", 0.05))
+# Each process spills to its own file; files left by processes that are gone are replayed by the survivors
+AUDIT_SPILL_DIR = os.path.abspath(os.getenv(
+    "AUDIT_SPILL_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audit_spill")
+))
+AUDIT_SPILL_FILE = os.getenv("AUDIT_SPILL_FILE")
+SPILL_PATTERN = re.compile(r"^audit_spill\.(\d+)\.jsonl(\.replay)?$")
+
+# Errors that mean the master DB is unreachable rather than the rows being bad
+UNAVAILABLE_ERRORS = (OperationalError, InterfaceError)
+
+
+def _json_safe(values):
+    """Snapshot audit values so they can be serialized later and on another thread"""
+    if values is None:
+        return None
+    if isinstance(values, dict):
+        values = {k: v for k, v in values.items() if not str(k).startswith("_sa_")}
+    try:
+        return json.loads(json.dumps(values, default=str))
+    except (TypeError, ValueError):
+        return {"repr": str(values)}
+
+
+class AuditWriter:
+    """Background writer that bulk-inserts audit rows into the master DB"""
+
+    def __init__(
+        self,
+        maxsize: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        spill_file: str | None = AUDIT_SPILL_FILE
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._spill_file = spill_file
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._spill_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def spill_file(self) -> str:
+        """Resolved per call so a worker forked after import spills under its own pid"""
+        if self._spill_file:
+            return os.path.abspath(self._spill_file)
+        return os.path.join(AUDIT_SPILL_DIR, f"audit_spill.{os.getpid()}.jsonl")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started")
+
+    def stop(self, timeout: float = 10.0):
+        """Drain everything queued and stop the worker"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Audit writer did not drain in time, spilling remaining rows")
+            self._spill(self._drain_nowait())
+        self._thread = None
+        logger.info("Audit writer stopped")
+
+    def submit(self, row: dict) -> bool:
+        """Queue one audit row; returns False when the writer is not running"""
+        if not self.running:
+            return False
+        row = dict(row)
+        row["old_values"] = _json_safe(row.get("old_values"))
+        row["new_values"] = _json_safe(row.get("new_values"))
+        row.setdefault("created_at", datetime.now())
+        try:
+            # Backpressure: wait briefly for room, then spill instead of blocking the request
+            self._queue.put(row, timeout=AUDIT_ENQUEUE_TIMEOUT)
+        except queue.Full:
+            logger.warning("Audit queue full, spilling row to disk")
+            self._spill([row])
+        return True
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _run(self):
+        last_replay = 0.0
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            if time.monotonic() - last_replay > 30:
+                last_replay = time.monotonic()
+                self._replay_spill()
+        self._replay_spill()
+
+    def _next_batch(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            if self._stop.is_set():
+                batch.extend(self._drain_nowait(self.batch_size - len(batch)))
+                break
+        return batch
+
+    def _drain_nowait(self, limit: int | None = None) -> list:
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _insert(self, rows: list):
+        with master_engine.begin() as conn:
+            conn.execute(AuditLog.__table__.insert(), rows)
+
+    def _write(self, rows: list):
+        try:
+            self._insert(rows)
+        except UNAVAILABLE_ERRORS as e:
+            logger.error(f"Master DB unavailable for audit batch of {len(rows)}: {e}")
+            self._spill(rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Audit batch insert failed, dropping {len(rows)} rows: {e}")
+
+    # ------------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------------
+    def _spill(self, rows: list):
+        if not rows:
+            return
+        with self._spill_lock:
+            try:
+                os.makedirs(os.path.dirname(self.spill_file), exist_ok=True)
+                with open(self.spill_file, "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, default=str) + "\n")
+            except OSError as e:
+                logger.error(f"Audit spill failed, {len(rows)} rows lost: {e}")
+
+    def _orphaned_spills(self) -> list:
+        """Spill files of other processes that are no longer running"""
+        directory = os.path.dirname(self.spill_file)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        orphans = []
+        for name in names:
+            match = SPILL_PATTERN.match(name)
+            if not match or int(match.group(1)) == os.getpid():
+                continue
+            try:
+                os.kill(int(match.group(1)), 0)
+            except ProcessLookupError:
+                orphans.append(os.path.join(directory, name))
+            except OSError:
+                pass  # alive under another user
+        return orphans
+
+    def _claim_spill(self, source: str, replay_file: str):
+        """Move a spill file onto the replay file, appending when an earlier replay was interrupted"""
+        claimed = f"{replay_file}.claim"
+        os.replace(source, claimed)  # atomic, so only one process wins an orphan
+        if not os.path.exists(replay_file):
+            os.replace(claimed, replay_file)
+            return
+        with open(claimed, encoding="utf-8") as src, open(replay_file, "a", encoding="utf-8") as dst:
+            for line in src:
+                dst.write(line if line.endswith("\n") else line + "\n")
+        os.remove(claimed)
+
+    def _replay_spill(self):
+        replay_file = f"{self.spill_file}.replay"
+        with self._spill_lock:
+            sources = [self.spill_file] if os.path.exists(self.spill_file) else []
+            sources += self._orphaned_spills()
+            for source in sources:
+                try:
+                    self._claim_spill(source, replay_file)
+                except FileNotFoundError:
+                    pass  # another process claimed the orphan first
+                except OSError as e:
+                    logger.error(f"Could not claim audit spill {source}: {e}")
+            if not os.path.exists(replay_file):
+                return
+
+        rows, bad = [], []
+        with open(replay_file, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    if row.get("created_at"):
+                        row["created_at"] = datetime.fromisoformat(row["created_at"])
+                except (ValueError, TypeError, AttributeError):
+                    bad.append(line if line.endswith("\n") else line + "\n")
+                    continue
+                rows.append(row)
+
+        if bad:
+            # a torn write from a killed process; kept for inspection instead of stopping the writer
+            logger.error(f"Quarantining {len(bad)} unreadable spilled audit rows in {replay_file}.bad")
+            with open(f"{replay_file}.bad", "a", encoding="utf-8") as f:
+                f.writelines(bad)
+
+        logger.info(f"Replaying {len(rows)} spilled audit rows")
+        for i in range(0, len(rows), self.batch_size):
+            self._write(rows[i:i + self.batch_size])
+        os.remove(replay_file)
+
+audit_writer = AuditWriter()
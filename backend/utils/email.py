@@ -1,10 +1,13 @@
 import os
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import List, Optional
+from typing import Callable, List, Optional
 import logging
 
 logger = logging.getLogger("HRM")
@@ -16,6 +19,44 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "Nutryah@123")
 SMTP_FROM = os.getenv("SMTP_FROM", "NUTRYAH <no-reply@nutryah.com>")
 
 
+def build_message(to_email: str, subject: str, html_content: str, attachments: Optional[List[dict]] = None) -> MIMEMultipart:
+    """Build an HTML MIME message with optional attachments"""
+    msg = MIMEMultipart()
+    msg["From"] = SMTP_FROM or SMTP_USER or ""
+    msg["To"] = to_email
+    msg["Subject"] = subject
+
+    msg.attach(MIMEText(html_content, "html"))
+    
+    # Add attachments if provided
+    if attachments:
+        for attachment in attachments:
+            try:
+                part = MIMEBase('application', 'octet-stream')
+                # Handle both binary content and file paths
+                if isinstance(attachment.get('content'), bytes):
+                    part.set_payload(attachment['content'])
+                elif 'file_path' in attachment:
+                    with open(attachment['file_path'], 'rb') as f:
+                        part.set_payload(f.read())
+                else:
+                    logger.error(f"❌ Invalid attachment format: {attachment}")
+                    continue
+                
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename="{attachment["filename"]}"'
+                )
+                msg.attach(part)
+                logger.info(f"📎 Attached file: {attachment['filename']}")
+            except Exception as attach_error:
+                logger.error(f"❌ Failed to attach {attachment.get('filename', 'unknown')}: {attach_error}")
+                continue
+
+    return msg
+
+
 def send_email(to_email: str, subject: str, html_content: str, attachments: Optional[List[dict]] = None):
     """
     Sends an HTML email using SMTP (Office365 supported)
@@ -29,39 +70,7 @@ def send_email(to_email: str, subject: str, html_content: str, attachments: Opti
             logger.error("❌ Missing SMTP credentials")
             return False
         
-        # Create message
-        msg = MIMEMultipart()
-        msg["From"] = SMTP_FROM or SMTP_USER or ""
-        msg["To"] = to_email
-        msg["Subject"] = subject
-
-        msg.attach(MIMEText(html_content, "html"))
-        
-        # Add attachments if provided
-        if attachments:
-            for attachment in attachments:
-                try:
-                    part = MIMEBase('application', 'octet-stream')
-                    # Handle both binary content and file paths
-                    if isinstance(attachment.get('content'), bytes):
-                        part.set_payload(attachment['content'])
-                    elif 'file_path' in attachment:
-                        with open(attachment['file_path'], 'rb') as f:
-                            part.set_payload(f.read())
-                    else:
-                        logger.error(f"❌ Invalid attachment format: {attachment}")
-                        continue
-                    
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{attachment["filename"]}"'
-                    )
-                    msg.attach(part)
-                    logger.info(f"📎 Attached file: {attachment['filename']}")
-                except Exception as attach_error:
-                    logger.error(f"❌ Failed to attach {attachment.get('filename', 'unknown')}: {attach_error}")
-                    continue
+        msg = build_message(to_email, subject, html_content, attachments)
 
         # Connect to SMTP server with timeout
         logger.info(f"🔗 Connecting to SMTP server...")
@@ -96,3 +105,133 @@ def send_email(to_email: str, subject: str, html_content: str, attachments: Opti
     except Exception as e:
         logger.error(f"❌ Email sending failed: {type(e).__name__}: {e}")
         return False
+
+
+# ============================================================
+# BULK SENDING — persistent authenticated SMTP connections
+# ============================================================
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 4))
+SMTP_MAX_RETRIES = int(os.getenv("SMTP_MAX_RETRIES", 2))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
+
+# SMTP errors after which the connection is dropped and re-opened before retrying; other
+# SMTP replies leave it usable. smtplib.SMTPException subclasses OSError, so it is caught first.
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)
+
+
+class SMTPConnectionPool:
+    """Sends many messages over a few reused SMTP connections, one per worker thread"""
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        user: Optional[str] = SMTP_USER,
+        password: Optional[str] = SMTP_PASSWORD,
+        sender: Optional[str] = None,
+        use_tls: bool = SMTP_USE_TLS,
+        size: int = SMTP_POOL_SIZE,
+        max_retries: int = SMTP_MAX_RETRIES,
+        timeout: int = 30
+    ):
+        self.host = host or "localhost"
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender or user or SMTP_FROM
+        self.use_tls = use_tls
+        self.size = max(1, size)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        with self._lock:
+            self._connections.append(server)
+        logger.info(f"🔗 Opened pooled SMTP connection to {self.host}:{self.port}")
+        return server
+
+    def _connection(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        if server is None:
+            server = self._local.server = self._connect()
+        return server
+
+    def _drop_connection(self):
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is not None:
+            with self._lock:
+                if server in self._connections:
+                    self._connections.remove(server)
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+    def send(self, message: MIMEMultipart) -> dict:
+        """Send one message on this thread's connection, retrying transient failures"""
+        to_email = message["To"]
+        last_error = None
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                self._connection().sendmail(self.sender, to_email, message.as_string())
+                return {"email": to_email, "status": "sent", "attempts": attempt, "error": None}
+            except smtplib.SMTPRecipientsRefused as e:
+                # Permanent for this recipient; retrying will not help
+                return {"email": to_email, "status": "failed", "attempts": attempt, "error": f"Recipient refused: {e}"}
+            except smtplib.SMTPAuthenticationError as e:
+                self._drop_connection()
+                return {"email": to_email, "status": "failed", "attempts": attempt, "error": f"SMTP authentication failed: {e}"}
+            except smtplib.SMTPException as e:
+                last_error = e
+                if isinstance(e, RECONNECT_ERRORS):
+                    self._drop_connection()
+            except OSError as e:
+                # socket-level failure (reset, timeout, TLS); the connection is unusable
+                last_error = e
+                self._drop_connection()
+            if attempt <= self.max_retries:
+                time.sleep(min(2 ** (attempt - 1), 5))
+        logger.error(f"❌ Giving up on {to_email}: {last_error}")
+        return {"email": to_email, "status": "failed", "attempts": self.max_retries + 1, "error": str(last_error)}
+
+    def send_many(self, messages: List[tuple], on_result: Optional[Callable[[object, dict], None]] = None) -> List[dict]:
+        """
+        Send (key, message) pairs concurrently; returns one status dict per pair in input order.
+        on_result(key, status) is called as each message finishes.
+        """
+        results = [None] * len(messages)
+
+        def deliver(index: int, key, message):
+            status = self.send(message)
+            status["key"] = key
+            results[index] = status
+            if on_result:
+                on_result(key, status)
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.size, max(1, len(messages))), thread_name_prefix="smtp") as pool:
+                futures = [pool.submit(deliver, i, key, message) for i, (key, message) in enumerate(messages)]
+                for future in futures:
+                    future.result()
+        finally:
+            self.close()
+        return results
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for server in connections:
+            try:
+                server.quit()
+            except Exception:
+                pass
@@ -0,0 +1,219 @@
+import os
+import socket
+import threading
+import uuid
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from database import MasterSessionLocal, open_tenant_session, logger
+from models.models_master import BackgroundJob
+from sqlalchemy import func
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_RESULTS_DIR = Path(os.getenv("JOB_RESULTS_DIR", Path(__file__).resolve().parent.parent / "job_results")).resolve()
+# Running jobs report in every JOB_HEARTBEAT_SECONDS; one silent for JOB_STALE_SECONDS lost its worker
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", 30))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", 180))
+
+# Identifies this process in background_jobs.worker_id
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# job_type -> callable(ctx, **params)
+JOB_HANDLERS = {}
+
+_executor = None
+_heartbeat_stop = threading.Event()
+_heartbeat_thread = None
+
+
+def job_handler(job_type: str):
+    """Register a function as the handler for a job type"""
+    def decorator(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+    return decorator
+
+
+class JobContext:
+    """Handed to job handlers: tenant DB access, progress reporting and result files"""
+
+    def __init__(self, job_id: str, tenant_db: str):
+        self.job_id = job_id
+        self.tenant_db = tenant_db
+        self._last_progress = -1
+
+    def tenant_session(self):
+        return open_tenant_session(self.tenant_db, autoflush=False)
+
+    def progress(self, percent: int, message: str | None = None):
+        percent = max(0, min(100, int(percent)))
+        if percent == self._last_progress and message is None:
+            return
+        self._last_progress = percent
+        _update_job(self.job_id, progress=percent, message=message)
+
+    def save_file(self, content: bytes, filename: str, media_type: str):
+        JOB_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = JOB_RESULTS_DIR / f"{self.job_id}_{filename}"
+        path.write_bytes(content)
+        _update_job(
+            self.job_id,
+            result_path=str(path),
+            result_filename=filename,
+            result_media_type=media_type
+        )
+        return str(path)
+
+
+def _update_job(job_id: str, **fields):
+    with MasterSessionLocal() as db:
+        db.query(BackgroundJob).filter(BackgroundJob.id == job_id).update(fields, synchronize_session=False)
+        db.commit()
+
+
+def _claim_job(job_id: str):
+    """Atomically move a queued job to running for this worker; None when another worker got it first"""
+    now = datetime.now()
+    with MasterSessionLocal() as db:
+        claimed = db.query(BackgroundJob).filter(
+            BackgroundJob.id == job_id,
+            BackgroundJob.status == "queued"
+        ).update(
+            {"status": "running", "worker_id": WORKER_ID, "started_at": now, "heartbeat_at": now},
+            synchronize_session=False
+        )
+        db.commit()
+        if claimed != 1:
+            return None
+        return db.query(BackgroundJob.job_type, BackgroundJob.tenant_id, BackgroundJob.params).filter(
+            BackgroundJob.id == job_id
+        ).first()
+
+
+def _run_job(job_id: str):
+    job = _claim_job(job_id)
+    if job is None:
+        return
+    job_type, tenant_db, params = job.job_type, job.tenant_id, job.params or {}
+
+    handler = JOB_HANDLERS.get(job_type)
+    if handler is None:
+        _update_job(job_id, status="failed", error=f"Unknown job type: {job_type}", finished_at=datetime.now())
+        return
+
+    logger.info(f"Job {job_id} ({job_type}) started for tenant {tenant_db}")
+    try:
+        result = handler(JobContext(job_id, tenant_db), **params)
+        _update_job(
+            job_id,
+            status="succeeded",
+            progress=100,
+            result=result,
+            finished_at=datetime.now()
+        )
+        logger.info(f"Job {job_id} ({job_type}) succeeded")
+    except Exception as e:
+        logger.error(f"Job {job_id} ({job_type}) failed: {str(e)}")
+        _update_job(
+            job_id,
+            status="failed",
+            error=f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}",
+            finished_at=datetime.now()
+        )
+
+
+def submit_job(job_type: str, tenant_db: str, params: dict | None = None, created_by: str | None = None) -> BackgroundJob:
+    """Persist a queued job and hand it to the worker pool"""
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    job = BackgroundJob(
+        id=str(uuid.uuid4()),
+        tenant_id=tenant_db,
+        job_type=job_type,
+        status="queued",
+        progress=0,
+        params=params or {},
+        created_by=created_by
+    )
+    with MasterSessionLocal() as db:
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        db.expunge(job)
+
+    _get_executor().submit(_run_job, job.id)
+    return job
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job-worker")
+    return _executor
+
+
+def _fail_stale_jobs() -> int:
+    """Fail running jobs whose worker stopped sending heartbeats"""
+    cutoff = datetime.now() - timedelta(seconds=JOB_STALE_SECONDS)
+    with MasterSessionLocal() as db:
+        stale = db.query(BackgroundJob).filter(
+            BackgroundJob.status == "running",
+            func.coalesce(BackgroundJob.heartbeat_at, BackgroundJob.started_at) < cutoff
+        ).update({
+            "status": "failed",
+            "error": "Worker stopped responding (server restart or crash)",
+            "finished_at": datetime.now()
+        }, synchronize_session=False)
+        db.commit()
+    if stale:
+        logger.warning(f"Marked {stale} stale running jobs as failed")
+    return stale
+
+
+def _heartbeat_loop():
+    while not _heartbeat_stop.wait(JOB_HEARTBEAT_SECONDS):
+        try:
+            with MasterSessionLocal() as db:
+                db.query(BackgroundJob).filter(
+                    BackgroundJob.worker_id == WORKER_ID,
+                    BackgroundJob.status == "running"
+                ).update({"heartbeat_at": datetime.now()}, synchronize_session=False)
+                db.commit()
+            _fail_stale_jobs()
+        except Exception as e:
+            logger.error(f"Job heartbeat failed: {str(e)}")
+
+
+def start_job_runner():
+    """Start the worker pool and heartbeat, and pick up jobs no live worker owns"""
+    global _heartbeat_thread
+    _get_executor()
+    # other workers may be running jobs right now; only jobs without a recent heartbeat are failed
+    _fail_stale_jobs()
+    with MasterSessionLocal() as db:
+        queued = [job_id for (job_id,) in db.query(BackgroundJob.id).filter(
+            BackgroundJob.status == "queued"
+        ).order_by(BackgroundJob.created_at)]
+
+    # every worker may submit the same queued job; _claim_job lets exactly one run it
+    for job_id in queued:
+        _executor.submit(_run_job, job_id)
+
+    _heartbeat_stop.clear()
+    _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+    _heartbeat_thread.start()
+    logger.info(f"Job runner {WORKER_ID} started with {JOB_WORKERS} workers, {len(queued)} queued jobs resumed")
+
+
+def stop_job_runner():
+    global _executor, _heartbeat_thread
+    _heartbeat_stop.set()
+    if _heartbeat_thread is not None:
+        _heartbeat_thread.join(timeout=5)
+        _heartbeat_thread = None
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        logger.info("Job runner stopped")
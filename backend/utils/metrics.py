@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from utils.nplusone import N_PLUS_ONE_MODE, NPlusOneError, QueryShapeTracker
+
+logger = logging.getLogger("HRM")
+slow_query_logger = logging.getLogger("HRM.slow_query")
+
+# Statements at or above this duration are written to the slow-query log (0 disables it)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 500))
+SLOW_QUERY_LOG_PARAMS = os.getenv("SLOW_QUERY_LOG_PARAMS", "true").lower() == "true"
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE")
+SLOW_QUERY_MAX_CHARS = 2000
+# Requests at or above this latency log their SQL totals and slowest statement (0 disables it)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 2000))
+
+if SLOW_QUERY_LOG_FILE:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG_FILE)
+    _handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    slow_query_logger.addHandler(_handler)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+# ---------------------------------------------------------------------------
+# Minimal Prometheus metric types
+# ---------------------------------------------------------------------------
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+http_requests_total = Counter(
+    "hrm_http_requests_total", "HTTP requests by route template, method, status and tenant",
+    ("route", "method", "status", "tenant")
+)
+http_request_duration = Histogram(
+    "hrm_http_request_duration_seconds", "End-to-end request latency",
+    ("route", "method", "tenant")
+)
+http_request_db_queries = Histogram(
+    "hrm_http_request_db_queries", "SQL statements executed per request",
+    ("route", "method", "tenant"), buckets=QUERY_COUNT_BUCKETS
+)
+http_request_db_duration = Histogram(
+    "hrm_http_request_db_seconds", "Total time spent in SQL per request",
+    ("route", "method", "tenant")
+)
+http_request_slowest_query = Histogram(
+    "hrm_http_request_slowest_query_seconds", "Slowest single SQL statement per request",
+    ("route", "method", "tenant")
+)
+db_queries_total = Counter("hrm_db_queries_total", "SQL statements executed by database", ("database",))
+db_query_duration = Histogram("hrm_db_query_duration_seconds", "SQL statement latency by database", ("database",))
+db_slow_queries_total = Counter("hrm_db_slow_queries_total", "Statements over SLOW_QUERY_MS", ("database",))
+
+REGISTRY = [
+    http_requests_total, http_request_duration, http_request_db_queries, http_request_db_duration,
+    http_request_slowest_query, db_queries_total, db_query_duration, db_slow_queries_total,
+]
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Per-request SQL accounting
+# ---------------------------------------------------------------------------
+class RequestStats:
+    """SQL totals for one request; shared with DB threads through a context var"""
+
+    def __init__(self, track_shapes: bool = N_PLUS_ONE_MODE != "off"):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.shapes = QueryShapeTracker() if track_shapes else None
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float):
+        with self._lock:
+            self.query_count += 1
+            self.db_time += elapsed
+            if elapsed > self.slowest_time:
+                self.slowest_time = elapsed
+                self.slowest_statement = statement
+        if self.shapes is not None:
+            self.shapes.observe(statement)
+
+
+_current_stats = contextvars.ContextVar("request_sql_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(track_shapes: bool = True):
+    """Collect SQL stats for a block of work outside a request (scripts, checks)"""
+    stats = RequestStats(track_shapes=track_shapes)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    database = conn.engine.url.database or "-"
+
+    db_queries_total.inc(database)
+    db_query_duration.observe(elapsed, database)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        db_slow_queries_total.inc(database)
+        message = f"[{database}] {elapsed * 1000:.1f} ms: {' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]}"
+        if SLOW_QUERY_LOG_PARAMS:
+            message += f" | params={str(parameters)[:SLOW_QUERY_MAX_CHARS]}"
+        slow_query_logger.warning(message)
+
+
+def _handle_error(context):
+    # failed statements never reach after_cursor_execute; drop their start time
+    if context.connection is None or context.cursor is None:
+        return
+    starts = context.connection.info.get("query_start_time")
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Attach timing listeners to an engine (idempotent)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+def _request_tenant(scope) -> str:
+    from utils.token import verify_token
+
+    headers = dict(scope.get("headers") or [])
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    if authorization:
+        token = authorization.split(" ")[1] if " " in authorization else authorization
+        payload = verify_token(token)
+        if payload and payload.get("tenant_db"):
+            return payload["tenant_db"]
+    # never label with client-supplied headers: every distinct value would be a new series
+    return "-"
+
+
+class MetricsMiddleware:
+    """Records latency and SQL totals per request, labeled by route template and tenant"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status = {"code": 500}
+        start = time.perf_counter()
+        # 'raise' mode holds the response start until the handler is done, so a failed check can still send a 500
+        hold_start = stats.shapes is not None and N_PLUS_ONE_MODE == "raise"
+        held = {"start": None, "failed": False}
+
+        def request_label() -> str:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            return f"{scope.get('method', '-')} {route}"
+
+        async def send_wrapper(message):
+            if held["failed"]:
+                return  # the original response was replaced by the N+1 error
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.query_count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.db_time * 1000:.1f}".encode()))
+                message = {**message, "headers": headers}
+                if hold_start:
+                    held["start"] = message
+                    return
+            elif message["type"] == "http.response.body" and held["start"] is not None:
+                start_message, held["start"] = held["start"], None
+                try:
+                    stats.shapes.check(request_label(), mode="raise")
+                except NPlusOneError as e:
+                    held["failed"] = True
+                    status["code"] = 500
+                    logger.error(str(e))
+                    body = json.dumps({"detail": str(e)}).encode()
+                    await send({"type": "http.response.start", "status": 500, "headers": [
+                        (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    ]})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "-")
+            tenant = _request_tenant(scope)
+
+            http_requests_total.inc(route, method, str(status["code"]), tenant)
+            http_request_duration.observe(elapsed, route, method, tenant)
+            http_request_db_queries.observe(stats.query_count, route, method, tenant)
+            http_request_db_duration.observe(stats.db_time, route, method, tenant)
+            http_request_slowest_query.observe(stats.slowest_time, route, method, tenant)
+
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                slowest = " ".join((stats.slowest_statement or "").split())[:SLOW_QUERY_MAX_CHARS]
+                slow_query_logger.warning(
+                    f"Slow request {method} {route} [{tenant}] {elapsed * 1000:.1f} ms, "
+                    f"{stats.query_count} queries in {stats.db_time * 1000:.1f} ms, "
+                    f"slowest {stats.slowest_time * 1000:.1f} ms: {slowest}"
+                )
+
+        # After the response: warn mode logs here, and statements a streaming body ran after its
+        # first chunk can only be logged. 'raise' mode already failed the request above.
+        if stats.shapes is not None and not held["failed"]:
+            stats.shapes.check(f"{method} {route}", mode="warn")
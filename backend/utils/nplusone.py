@@ -0,0 +1,62 @@
+import os
+import re
+import logging
+import threading
+
+logger = logging.getLogger("HRM")
+
+APP_ENV = os.getenv("APP_ENV", "development").lower()
+
+# off | warn | raise; warns outside production unless set explicitly
+N_PLUS_ONE_MODE = os.getenv("N_PLUS_ONE_MODE", "off" if APP_ENV == "production" else "warn").lower()
+# A statement shape seen this many times in one request is reported
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+_IN_LIST = re.compile(r"\(\s*(?:%\([^)]*\)s|\?|%s)(?:\s*,\s*(?:%\([^)]*\)s|\?|%s))*\s*\)")
+_PARAM = re.compile(r"%\([^)]*\)s|%s|\?|:\w+")
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+class NPlusOneError(Exception):
+    """Raised in 'raise' mode when a request repeats the same statement shape"""
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with literals, bind params and IN lists collapsed, so per-row lookups compare equal"""
+    shape = _STRING.sub("?", statement)
+    shape = _IN_LIST.sub("(?)", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return " ".join(shape.split())
+
+
+class QueryShapeTracker:
+    """Counts statement shapes for one unit of work (usually a request)"""
+
+    def __init__(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.threshold = threshold
+        self.shapes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, statement: str):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated(self) -> dict:
+        """{shape: count} for shapes at or over the threshold"""
+        with self._lock:
+            return {shape: count for shape, count in self.shapes.items() if count >= self.threshold}
+
+    def check(self, label: str, mode: str = N_PLUS_ONE_MODE):
+        """Warn about or raise on repeated shapes, per mode"""
+        repeated = self.repeated()
+        if not repeated or mode == "off":
+            return repeated
+        details = "; ".join(f"{count}x {shape[:300]}" for shape, count in sorted(repeated.items(), key=lambda i: -i[1]))
+        message = f"Possible N+1 in {label}: {details}"
+        if mode == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+        return repeated
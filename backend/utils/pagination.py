@@ -0,0 +1,28 @@
+MAX_PAGE_SIZE = 500
+
+
+def page_limit(limit: int | None) -> int | None:
+    """Clamp a requested page size; None means no paging"""
+    if limit is None:
+        return None
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def parse_fields(fields: str | None) -> set | None:
+    """'id,name' -> {'id', 'name'}; None/empty means every field"""
+    if not fields:
+        return None
+    return {f.strip() for f in fields.split(",") if f.strip()}
+
+
+def project(item: dict, fields: set | None) -> dict:
+    if fields is None:
+        return item
+    return {k: v for k, v in item.items() if k in fields}
+
+
+def keyset_page(items: list, limit: int | None, key: str = "id") -> dict:
+    """Cursor for the next page: the key of the last item when the page is full"""
+    if limit is None or len(items) < limit:
+        return {"next_after_id": None}
+    return {"next_after_id": items[-1][key]}
@@ -0,0 +1,48 @@
+import os
+from sqlalchemy.orm import Session
+from models.models_tenant import Permission, RolePermission
+from database import open_tenant_session, logger
+from utils.ttl_cache import TTLCache
+
+# Safety net for changes made by other processes; local role writes invalidate immediately
+PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", 300))
+PERMISSION_CACHE_TENANTS = int(os.getenv("PERMISSION_CACHE_TENANTS", 200))
+
+# tenant_db -> {role_id: frozenset(permission names)}
+_role_permissions = TTLCache(maxsize=PERMISSION_CACHE_TENANTS, ttl=PERMISSION_CACHE_TTL)
+
+
+def load_role_permissions(tdb: Session) -> dict:
+    """Every role's permission names with a single join"""
+    mapping = {}
+    rows = tdb.query(RolePermission.role_id, Permission.name).join(
+        Permission, Permission.id == RolePermission.permission_id
+    ).all()
+    for role_id, name in rows:
+        mapping.setdefault(role_id, set()).add(str(name))
+    return {role_id: frozenset(names) for role_id, names in mapping.items()}
+
+
+def tenant_role_permissions(tenant_db: str, tdb: Session | None = None) -> dict:
+    """Cached role -> permissions map for a tenant; pass tdb to reuse an open session on a miss"""
+    mapping = _role_permissions.get(tenant_db)
+    if mapping is not None:
+        return mapping
+
+    if tdb is not None:
+        mapping = load_role_permissions(tdb)
+    else:
+        with open_tenant_session(tenant_db) as session:
+            mapping = load_role_permissions(session)
+    _role_permissions.set(tenant_db, mapping)
+    logger.info(f"Loaded permissions for {len(mapping)} roles in {tenant_db}")
+    return mapping
+
+
+def role_permissions(tenant_db: str, role_id, tdb: Session | None = None) -> frozenset:
+    return tenant_role_permissions(tenant_db, tdb).get(role_id, frozenset())
+
+
+def invalidate_role_permissions(tenant_db: str):
+    """Drop a tenant's cached permissions after roles or their permissions change"""
+    _role_permissions.pop(tenant_db)
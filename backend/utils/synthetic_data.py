@@ -0,0 +1,347 @@
+import random
+import calendar
+from datetime import date, time, datetime, timedelta
+
+from passlib.context import CryptContext
+from sqlalchemy import bindparam, text
+
+from database import open_tenant_session, logger
+from utils.attendance_summary import rebuild_daily_totals, refresh_attendance_summary
+from models.models_tenant import (
+    Role, Department, Grade, Shift, User, EmployeeSalary, EmployeeRoster, AttendancePunch, AttendanceMonthlySummary,
+    LeaveType, LeavePolicy, LeaveApplication, ODApplication, AttendanceRegularization,
+    JobRequisition, Candidate, PMSGoal
+)
+
+# Every generated row is recognisable by one of these so it can be reset
+MARK = "[SYN]"
+CODE_PREFIX = "SYN"
+DEFAULT_UNTIL = date(2025, 12, 31)  # fixed so the same seed always yields the same dates
+PASSWORD = "Synthetic@123"
+
+DEPARTMENT_NAMES = [
+    "Emergency", "Cardiology", "Nursing", "Radiology", "Pharmacy", "Pathology", "Orthopaedics",
+    "Paediatrics", "Oncology", "Front Office", "Housekeeping", "Finance", "Human Resources", "IT",
+]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Ananya", "Kabir", "Sara", "Vivaan", "Nisha",
+               "Arjun", "Priya", "Dev", "Kavya", "Rahul", "Sneha", "Aditya", "Pooja", "Karan", "Riya"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Menon", "Das", "Khan", "Joshi",
+              "Rao", "Pillai", "Singh", "Mehta", "Bose"]
+GOAL_TITLES = ["Reduce patient wait time", "Complete mandatory CME hours", "Improve audit score",
+               "Cut overtime hours", "Lower medication errors", "Finish BLS recertification"]
+SHIFTS = [("General", "09:00", "18:00"), ("Morning", "07:00", "15:00"),
+          ("Evening", "14:00", "22:00"), ("Night", "22:00", "06:00")]
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+
+class GeneratorConfig:
+    def __init__(self, employees: int = 200, months: int = 3, departments: int = 8, grades: int = 5,
+                 candidates: int | None = None, goals_per_employee: int = 2, seed: int = 42,
+                 until: date = DEFAULT_UNTIL, batch_size: int = 5000):
+        self.employees = employees
+        self.months = months
+        self.departments = min(departments, len(DEPARTMENT_NAMES))
+        self.grades = grades
+        self.candidates = employees // 2 if candidates is None else candidates
+        self.goals_per_employee = goals_per_employee
+        self.seed = seed
+        self.until = until
+        self.batch_size = batch_size
+
+    @property
+    def start(self) -> date:
+        year, month = self.until.year, self.until.month - self.months + 1
+        while month <= 0:
+            month += 12
+            year -= 1
+        return date(year, month, 1)
+
+
+def _bulk_insert(db, table, rows: list, batch_size: int) -> int:
+    """executemany in chunks; pymysql sends each chunk as one multi-row INSERT"""
+    for offset in range(0, len(rows), batch_size):
+        db.execute(table.insert(), rows[offset:offset + batch_size])
+    return len(rows)
+
+
+def _month_ranges(start: date, until: date):
+    current = start
+    while current <= until:
+        last = date(current.year, current.month, calendar.monthrange(current.year, current.month)[1])
+        yield current, min(last, until)
+        current = last + timedelta(days=1)
+
+
+def _clock(base: str, minutes: int) -> time:
+    hour, minute = (int(p) for p in base.split(":"))
+    moment = datetime(2000, 1, 1, hour, minute) + timedelta(minutes=minutes)
+    return moment.time()
+
+
+# ---------------------------------------------------------------------------
+# Reset
+# ---------------------------------------------------------------------------
+def reset_synthetic_data(db, batch_size: int = 5000) -> int:
+    """Delete everything a previous run generated; returns the number of employees removed"""
+    employee_ids = [row[0] for row in db.execute(
+        text("SELECT id FROM users WHERE employee_code LIKE :code"), {"code": f"{CODE_PREFIX}-%"}
+    )]
+    for offset in range(0, len(employee_ids), batch_size):
+        chunk = employee_ids[offset:offset + batch_size]
+        for model in (AttendancePunch, AttendanceMonthlySummary, EmployeeRoster, LeaveApplication, ODApplication,
+                      AttendanceRegularization, EmployeeSalary, PMSGoal):
+            db.query(model).filter(model.employee_id.in_(chunk)).delete(synchronize_session=False)
+        db.execute(
+            text("DELETE FROM payroll_runs WHERE employee_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": [str(i) for i in chunk]}
+        )
+        db.query(User).filter(User.id.in_(chunk)).delete(synchronize_session=False)
+
+    db.query(Candidate).filter(Candidate.resume_url == MARK).delete(synchronize_session=False)
+    db.query(JobRequisition).filter(JobRequisition.title.like(f"{MARK}%")).delete(synchronize_session=False)
+    db.query(LeaveType).filter(LeaveType.code.like(f"{CODE_PREFIX}-%")).delete(synchronize_session=False)
+    db.query(LeavePolicy).filter(LeavePolicy.name == f"Standard {MARK}").delete(synchronize_session=False)
+    db.query(Shift).filter(Shift.name.like(f"%{MARK}")).delete(synchronize_session=False)
+    db.query(Grade).filter(Grade.code.like(f"{CODE_PREFIX}-%")).delete(synchronize_session=False)
+    db.query(Department).filter(Department.name.like(f"%{MARK}")).delete(synchronize_session=False)
+    db.query(Role).filter(Role.name == f"Employee {MARK}").delete(synchronize_session=False)
+    rebuild_daily_totals(db)
+    db.commit()
+    return len(employee_ids)
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+def _reference_data(db, config: GeneratorConfig, rng: random.Random) -> dict:
+    role = Role(name=f"Employee {MARK}", description="Synthetic load-test employees")
+    departments = [Department(name=f"{name} {MARK}") for name in DEPARTMENT_NAMES[:config.departments]]
+    grades = []
+    for level in range(1, config.grades + 1):
+        min_salary = 180000 * level
+        grades.append(Grade(
+            code=f"{CODE_PREFIX}-G{level}", name=f"Grade {level} {MARK}",
+            min_salary=min_salary, max_salary=min_salary * 2,
+            basic_percent=40, hra_percent=20, allowance_percent=20, special_percent=20,
+            pf_applicable=True, pf_percent=12, esi_applicable=level <= 2, esi_percent=0.75,
+            effective_from=config.start
+        ))
+    shifts = [Shift(name=f"{name} {MARK}", start_time=start, end_time=end) for name, start, end in SHIFTS]
+    leave_types = [
+        LeaveType(name=f"Casual Leave {MARK}", code=f"{CODE_PREFIX}-CL", category="General", annual_limit=12),
+        LeaveType(name=f"Sick Leave {MARK}", code=f"{CODE_PREFIX}-SL", category="Medical", annual_limit=10),
+    ]
+    # leave apply needs an active policy; SYN- codes fall through to leave_allocations
+    policy = LeavePolicy(name=f"Standard {MARK}", annual=12, sick=10, casual=12,
+                         leave_allocations={f"{CODE_PREFIX}-CL": 12, f"{CODE_PREFIX}-SL": 10}, status="Active")
+    db.add(role)
+    db.add_all(departments + grades + shifts + leave_types + [policy])
+    db.flush()
+    return {"role": role, "departments": departments, "grades": grades, "shifts": shifts, "leave_types": leave_types}
+
+
+def _employees(db, config: GeneratorConfig, rng: random.Random, ref: dict) -> list:
+    password = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(PASSWORD)
+    rows, profiles = [], []
+    for i in range(config.employees):
+        code = f"{CODE_PREFIX}-{i + 1:06d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        department = ref["departments"][i % len(ref["departments"])]
+        grade = ref["grades"][min(int(rng.expovariate(1.2)), len(ref["grades"]) - 1)]
+        rows.append({
+            "name": name, "email": f"{code.lower()}@synthetic.example", "password": password,
+            "role_id": ref["role"].id, "department_id": department.id, "employee_code": code,
+            "employee_type": rng.choice(["Permanent", "Permanent", "Permanent", "Contract"]),
+            "designation": "Staff", "joining_date": config.start - timedelta(days=rng.randint(30, 2000)),
+            "status": "Active", "created_at": datetime.combine(config.start, time(9, 0)),
+        })
+        profiles.append({
+            "index": i, "code": code, "name": name, "grade": grade,
+            "ctc": rng.randint(grade.min_salary, grade.max_salary) // 1000 * 1000,
+            "shift": ref["shifts"][0] if rng.random() < 0.5 else rng.choice(ref["shifts"]),
+            "rotates": rng.random() < 0.25,
+            "weekly_off": rng.randint(0, 6),
+        })
+    _bulk_insert(db, User.__table__, rows, config.batch_size)
+
+    ids = dict(db.execute(
+        text("SELECT employee_code, id FROM users WHERE employee_code LIKE :code"), {"code": f"{CODE_PREFIX}-%"}
+    ).all())
+    for profile in profiles:
+        profile["id"] = ids[profile["code"]]
+
+    _bulk_insert(db, EmployeeSalary.__table__, [
+        {"employee_id": p["id"], "ctc": p["ctc"], "basic_percent": 40, "hra_percent": 20,
+         "allowances_percent": 20, "special_percent": 20, "pf_eligible": True,
+         "esi_eligible": p["grade"].esi_applicable}
+        for p in profiles
+    ], config.batch_size)
+    return profiles
+
+
+def _month(db, config: GeneratorConfig, rng: random.Random, ref: dict, profiles: list,
+           first: date, last: date, counts: dict):
+    days = [first + timedelta(days=n) for n in range((last - first).days + 1)]
+    shifts = ref["shifts"]
+    roster, punches, leaves, ods, regularizations, payroll = [], [], [], [], [], []
+
+    for p in profiles:
+        workdays = [d for d in days if d.weekday() != p["weekly_off"]]
+        leave_days = set()
+        if workdays and rng.random() < 0.35:
+            start_index = rng.randrange(len(workdays))
+            span = workdays[start_index:start_index + rng.randint(1, 3)]
+            status = rng.choices(["Approved", "Pending", "Rejected"], weights=[7, 2, 1])[0]
+            leaves.append({
+                "employee_id": p["id"], "leave_type_id": rng.choice(ref["leave_types"]).id,
+                "from_date": span[0], "to_date": span[-1], "total_days": float(len(span)),
+                "reason": "Personal", "status": status,
+                "applied_at": datetime.combine(span[0] - timedelta(days=rng.randint(1, 10)), time(10, 0)),
+            })
+            if status == "Approved":
+                leave_days.update(span)
+
+        present = absent = 0
+        ot_minutes = 0
+        for d in days:
+            week_shift = shifts[(d.isocalendar()[1] + p["index"]) % len(shifts)] if p["rotates"] else p["shift"]
+            if d.weekday() == p["weekly_off"]:
+                roster.append({"employee_id": p["id"], "shift_id": week_shift.id, "date": d, "status": "OFF"})
+                continue
+            on_leave = d in leave_days
+            roster.append({"employee_id": p["id"], "shift_id": week_shift.id, "date": d,
+                           "status": "Leave" if on_leave else "Scheduled"})
+            if on_leave:
+                continue
+
+            roll = rng.random()
+            if roll < 0.015:
+                ods.append({"employee_id": p["id"], "od_date": d, "purpose": "Outreach camp",
+                            "location": "Field", "status": rng.choice(["approved", "approved", "pending"])})
+                present += 1
+                continue
+            if roll < 0.045:
+                absent += 1
+                continue
+
+            late_by = max(-20, min(60, int(rng.gauss(2, 8))))
+            stay = rng.randint(-15, 60)
+            missed_out = rng.random() < 0.02
+            punches.append({
+                "employee_id": p["id"], "date": d,
+                "in_time": _clock(week_shift.start_time, late_by),
+                "out_time": None if missed_out else _clock(week_shift.end_time, stay),
+                "location": "Main Campus", "source": rng.choice(["WEB", "MOBILE"]),
+                "status": "Late" if late_by > 10 else "Present",
+            })
+            present += 1
+            ot_minutes += max(0, stay - 30)
+            if missed_out:
+                regularizations.append({
+                    "employee_id": p["id"], "punch_date": d, "issue_type": "Missed OUT",
+                    "reason": "Forgot to punch out",
+                    "status": rng.choices(["Approved", "Pending", "Rejected"], weights=[6, 3, 1])[0],
+                })
+
+        monthly = p["ctc"] / 12
+        per_day = monthly / len(days)
+        basic = round(monthly * 0.4, 2)
+        hra = round(monthly * 0.2, 2)
+        lop_deduction = round(per_day * absent, 2)
+        payroll.append({
+            "employee_id": p["id"], "employee_name": p["name"], "employee_code": p["code"],
+            "month": MONTH_NAMES[first.month - 1], "year": first.year,
+            "present_days": present, "leave_days": len(leave_days), "lop_days": absent,
+            "ot_hours": round(ot_minutes / 60, 2), "basic_salary": basic, "hra_salary": hra,
+            "allowances": round(monthly - basic - hra, 2), "gross_salary": round(monthly, 2),
+            "lop_deduction": lop_deduction,
+            "net_salary": round(monthly - lop_deduction - basic * 0.12, 2), "status": "Completed",
+        })
+
+    counts["employee_roster"] += _bulk_insert(db, EmployeeRoster.__table__, roster, config.batch_size)
+    counts["attendance_punches"] += _bulk_insert(db, AttendancePunch.__table__, punches, config.batch_size)
+    refresh_attendance_summary(db, [(p["id"], first) for p in profiles])
+    rebuild_daily_totals(db, first, first)
+    counts["leave_applications"] += _bulk_insert(db, LeaveApplication.__table__, leaves, config.batch_size)
+    counts["od_applications"] += _bulk_insert(db, ODApplication.__table__, ods, config.batch_size)
+    counts["attendance_regularizations"] += _bulk_insert(
+        db, AttendanceRegularization.__table__, regularizations, config.batch_size
+    )
+    insert_payroll = text("""
+        INSERT INTO payroll_runs
+            (employee_id, employee_name, employee_code, month, year, present_days, leave_days, lop_days,
+             ot_hours, basic_salary, hra_salary, allowances, gross_salary, lop_deduction, net_salary, status)
+        VALUES
+            (:employee_id, :employee_name, :employee_code, :month, :year, :present_days, :leave_days, :lop_days,
+             :ot_hours, :basic_salary, :hra_salary, :allowances, :gross_salary, :lop_deduction, :net_salary, :status)
+    """)
+    for offset in range(0, len(payroll), config.batch_size):
+        db.execute(insert_payroll, payroll[offset:offset + config.batch_size])
+    counts["payroll_runs"] += len(payroll)
+
+
+def _recruitment_and_goals(db, config: GeneratorConfig, rng: random.Random, ref: dict, profiles: list, counts: dict):
+    requisitions = [
+        JobRequisition(title=f"{MARK} {department.name.replace(MARK, '').strip()} Staff", department=department.name,
+                       openings=rng.randint(1, 5), status="Open", rounds=2, round_names={"1": "Technical", "2": "HR"})
+        for department in ref["departments"]
+    ]
+    db.add_all(requisitions)
+    db.flush()
+    counts["job_requisition"] = len(requisitions)
+
+    counts["candidates"] = _bulk_insert(db, Candidate.__table__, [
+        {"job_id": rng.choice(requisitions).id, "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+         "email": f"candidate{i + 1:06d}@synthetic.example", "phone": f"9{rng.randint(100000000, 999999999)}",
+         "experience": rng.randint(0, 15), "resume_url": MARK,
+         "stage": rng.choice(["New", "Screening", "Interview", "Offered", "Rejected"]),
+         "current_round": 0, "completed_rounds": [], "score": rng.randint(20, 95)}
+        for i in range(config.candidates)
+    ], config.batch_size)
+
+    goals = []
+    for p in profiles:
+        for _ in range(config.goals_per_employee):
+            target = rng.randint(5, 100)
+            goals.append({
+                "employee_id": p["id"], "title": rng.choice(GOAL_TITLES), "goal_type": "Performance",
+                "target": str(target), "current_value": str(rng.randint(0, target)), "measurement_method": "%",
+                "weightage": rng.choice([10, 20, 25]), "start_date": config.start, "end_date": config.until,
+                "status": rng.choice(["Active", "Active", "Completed"]),
+            })
+    counts["pms_goals"] = _bulk_insert(db, PMSGoal.__table__, goals, config.batch_size)
+
+
+def generate_tenant_data(tenant_db: str, config: GeneratorConfig, reset: bool = True, progress=None) -> dict:
+    """
+    Populate a tenant with deterministic synthetic data; returns row counts per table.
+    The same config (seed included) always produces the same rows.
+    """
+    rng = random.Random(config.seed)
+    counts = {name: 0 for name in (
+        "employee_roster", "attendance_punches", "leave_applications", "od_applications",
+        "attendance_regularizations", "payroll_runs"
+    )}
+    report = progress or (lambda message: logger.info(message))
+
+    with open_tenant_session(tenant_db) as db:
+        if reset:
+            removed = reset_synthetic_data(db, config.batch_size)
+            report(f"Removed {removed} previously generated employees")
+
+        ref = _reference_data(db, config, rng)
+        profiles = _employees(db, config, rng, ref)
+        counts["users"] = counts["employee_salary"] = len(profiles)
+        db.commit()
+        report(f"Created {len(profiles)} employees in {len(ref['departments'])} departments")
+
+        # one transaction per month keeps undo logs bounded on large runs
+        for first, last in _month_ranges(config.start, config.until):
+            _month(db, config, rng, ref, profiles, first, last, counts)
+            db.commit()
+            report(f"Generated {first:%B %Y}")
+
+        _recruitment_and_goals(db, config, rng, ref, profiles, counts)
+        db.commit()
+
+    return counts
@@ -0,0 +1,125 @@
+import os
+import hashlib
+import threading
+from datetime import datetime
+
+from database import MasterSessionLocal, create_tenant_database, get_tenant_engine, logger
+from models.models_master import Hospital, TenantSchemaVersion
+import models.models_tenant as models_tenant
+from utils.ttl_cache import TTLCache
+
+UNKNOWN_TENANT_TTL = float(os.getenv("UNKNOWN_TENANT_TTL", 60))
+
+# Tenants verified at the current fingerprint by this process
+_ready = set()
+_ready_lock = threading.Lock()
+_tenant_locks = {}
+# Names with no registered hospital (e.g. DEFAULT_TENANT_DB), so they skip the master lookup for a while
+_unknown = TTLCache(maxsize=1024, ttl=UNKNOWN_TENANT_TTL)
+
+_fingerprint = None
+
+
+def schema_fingerprint() -> str:
+    """Hash of the tenant ORM schema and the tenant migration head"""
+    global _fingerprint
+    if _fingerprint is None:
+        from utils.tenant_migrations import head_revision
+
+        parts = [f"alembic:{head_revision()}"]
+        for table in sorted(models_tenant.MasterBase.metadata.sorted_tables, key=lambda t: t.name):
+            columns = ",".join(f"{c.name}:{c.type!r}" for c in table.columns)
+            indexes = ",".join(sorted(i.name for i in table.indexes if i.name))
+            parts.append(f"{table.name}({columns})[{indexes}]")
+        _fingerprint = hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+    return _fingerprint
+
+
+def _tenant_lock(db_name: str) -> threading.Lock:
+    with _ready_lock:
+        return _tenant_locks.setdefault(db_name, threading.Lock())
+
+
+def provision_tenant(db_name: str):
+    """Create the tenant DB if needed, create ORM tables and apply migrations"""
+    from utils.tenant_migrations import upgrade_tenant, record_version
+
+    create_tenant_database(db_name)
+    models_tenant.MasterBase.metadata.create_all(bind=get_tenant_engine(db_name))
+    upgrade_tenant(db_name)
+    record_version(db_name, fingerprint=schema_fingerprint(), migrated_at=datetime.now())
+    with _ready_lock:
+        _ready.add(db_name)
+    _unknown.pop(db_name)
+    logger.info(f"Tenant {db_name} provisioned at fingerprint {schema_fingerprint()[:12]}")
+
+
+def ensure_tenant_ready(db_name: str):
+    """Provision a tenant on first use if startup has not verified it yet"""
+    if db_name in _ready or _unknown.get(db_name):
+        return
+    with _tenant_lock(db_name):
+        if db_name in _ready:
+            return
+        with MasterSessionLocal() as db:
+            if db.query(Hospital.id).filter(Hospital.db_name == db_name).first() is None:
+                # not a registered tenant; leave the request to fail as before
+                _unknown.set(db_name, True)
+                with _ready_lock:
+                    _tenant_locks.pop(db_name, None)
+                return
+            version = db.get(TenantSchemaVersion, db_name)
+            current = version is not None and version.fingerprint == schema_fingerprint()
+        if current:
+            with _ready_lock:
+                _ready.add(db_name)
+            return
+        provision_tenant(db_name)
+
+
+def _verify(db_name: str):
+    try:
+        with _tenant_lock(db_name):
+            if db_name not in _ready:
+                provision_tenant(db_name)
+    except Exception as e:
+        logger.error(f"Error provisioning tenant DB {db_name}: {str(e)}")
+
+
+def bootstrap_tenants():
+    """Mark tenants at the current fingerprint ready and provision the rest one at a time"""
+    fingerprint = schema_fingerprint()
+    with MasterSessionLocal() as db:
+        rows = db.query(Hospital.db_name, TenantSchemaVersion.fingerprint).outerjoin(
+            TenantSchemaVersion, TenantSchemaVersion.db_name == Hospital.db_name
+        ).all()
+
+    stale = []
+    with _ready_lock:
+        for db_name, tenant_fingerprint in rows:
+            if tenant_fingerprint == fingerprint:
+                _ready.add(str(db_name))
+            else:
+                stale.append(str(db_name))
+
+    logger.info(f"Tenant bootstrap: {len(rows) - len(stale)} current, {len(stale)} to verify")
+    if not stale:
+        return
+    # serial: in-process alembic upgrades share module-global state and already queue on one lock;
+    # migrate_tenants.py upgrades many tenants in parallel worker processes
+    for db_name in stale:
+        _verify(db_name)
+    logger.info("Tenant bootstrap finished")
+
+
+def start_tenant_bootstrap() -> threading.Thread:
+    """Run bootstrap_tenants off the startup path so the app serves traffic immediately"""
+    def run():
+        try:
+            bootstrap_tenants()
+        except Exception as e:
+            logger.error(f"Error during tenant database setup: {str(e)}")
+
+    thread = threading.Thread(target=run, name="tenant-bootstrap", daemon=True)
+    thread.start()
+    return thread
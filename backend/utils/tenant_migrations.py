@@ -0,0 +1,130 @@
+import os
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, pool
+
+from database import MasterSessionLocal, tenant_database_url, logger
+from models.models_master import Hospital, TenantSchemaVersion
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+MIGRATION_WORKERS = int(os.getenv("MIGRATION_WORKERS", 4))
+
+# alembic's context/op proxies are module globals, so in-process upgrades must not overlap
+_upgrade_lock = threading.Lock()
+
+
+def tenant_alembic_config(db_name: str | None = None) -> Config:
+    config = Config(str(ALEMBIC_INI), ini_section="tenant")
+    if db_name:
+        config.cmd_opts = argparse.Namespace(x=[f"tenant={db_name}"])
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(tenant_alembic_config()).get_current_head()
+
+
+def current_revision(db_name: str) -> str | None:
+    """Revision recorded in the tenant DB's own alembic_version table"""
+    engine = create_engine(tenant_database_url(db_name), poolclass=pool.NullPool)
+    try:
+        with engine.connect() as conn:
+            return MigrationContext.configure(conn).get_current_revision()
+    finally:
+        engine.dispose()
+
+
+def upgrade_tenant(db_name: str, revision: str = "head") -> str | None:
+    """Migrate one tenant in this process; returns the revision it ends on"""
+    config = tenant_alembic_config(db_name)
+    config.attributes["configure_logger"] = False
+    with _upgrade_lock:
+        command.upgrade(config, revision)
+    version = current_revision(db_name)
+    record_version(db_name, status="current", revision=version, error=None, migrated_at=datetime.now())
+    return version
+
+
+def _upgrade_in_worker(db_name: str, revision: str) -> str | None:
+    # Runs in a child process, one tenant at a time per worker
+    command.upgrade(tenant_alembic_config(db_name), revision)
+    return current_revision(db_name)
+
+
+def record_version(db_name: str, **fields):
+    with MasterSessionLocal() as db:
+        row = db.get(TenantSchemaVersion, db_name)
+        if row is None:
+            row = TenantSchemaVersion(db_name=db_name)
+            db.add(row)
+        for key, value in fields.items():
+            setattr(row, key, value)
+        db.commit()
+
+
+def outdated_tenants(db_names: list | None = None) -> list:
+    """Tenants whose recorded revision is not the current head"""
+    head = head_revision()
+    with MasterSessionLocal() as db:
+        query = db.query(Hospital.db_name).order_by(Hospital.id)
+        if db_names:
+            query = query.filter(Hospital.db_name.in_(db_names))
+        names = [str(name) for (name,) in query]
+        current = {
+            row.db_name
+            for row in db.query(TenantSchemaVersion).filter(
+                TenantSchemaVersion.revision == head,
+                TenantSchemaVersion.status == "current"
+            )
+        }
+    return [name for name in names if name not in current]
+
+
+def migrate_tenants(db_names: list | None = None, workers: int = MIGRATION_WORKERS,
+                    revision: str = "head", only_outdated: bool = True) -> dict:
+    """
+    Upgrade tenants concurrently with a bounded pool of worker processes.
+    Returns {db_name: {"status", "revision", "error"}}.
+    """
+    if only_outdated:
+        targets = outdated_tenants(db_names)
+    elif db_names:
+        targets = list(db_names)
+    else:
+        with MasterSessionLocal() as db:
+            targets = [str(name) for (name,) in db.query(Hospital.db_name).order_by(Hospital.id)]
+
+    if not targets:
+        logger.info("All tenant schemas are current")
+        return {}
+
+    for db_name in targets:
+        record_version(db_name, status="migrating", error=None)
+
+    logger.info(f"Migrating {len(targets)} tenants with {workers} workers")
+    summary = {}
+    # spawn: workers must not inherit the parent's pooled DB connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context) as executor:
+        futures = {executor.submit(_upgrade_in_worker, db_name, revision): db_name for db_name in targets}
+        for future in as_completed(futures):
+            db_name = futures[future]
+            try:
+                version = future.result()
+                record_version(db_name, status="current", revision=version, error=None, migrated_at=datetime.now())
+                summary[db_name] = {"status": "current", "revision": version, "error": None}
+                logger.info(f"Tenant {db_name} migrated to {version}")
+            except Exception as e:
+                record_version(db_name, status="failed", error=f"{type(e).__name__}: {e}")
+                summary[db_name] = {"status": "failed", "revision": None, "error": str(e)}
+                logger.error(f"Tenant {db_name} migration failed: {e}")
+    return summary
@@ -0,0 +1,77 @@
+import os
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from database import MasterSessionLocal, open_tenant_session, logger
+from models.models_master import Hospital
+from routes.hospital import get_current_user
+from utils.ttl_cache import TTLCache
+
+TENANT_CACHE_SIZE = int(os.getenv("TENANT_CACHE_SIZE", 1000))
+TENANT_CACHE_TTL = int(os.getenv("TENANT_CACHE_TTL", 300))
+
+# db_name -> hospital metadata dict
+_tenants = TTLCache(maxsize=TENANT_CACHE_SIZE, ttl=TENANT_CACHE_TTL)
+
+
+def _hospital_info(hospital: Hospital) -> dict:
+    return {
+        "hospital_id": hospital.id,
+        "tenant_id": hospital.tenant_id,
+        "db_name": hospital.db_name,
+        "name": hospital.name,
+        "subscription_plan": hospital.subscription_plan,
+        "license_start_date": hospital.license_start_date,
+        "license_end_date": hospital.license_end_date,
+    }
+
+
+def resolve_tenant(db_name: str) -> dict:
+    """Hospital metadata for a tenant DB, from cache or one master lookup"""
+    info = _tenants.get(db_name)
+    if info is not None:
+        return info
+
+    with MasterSessionLocal() as master:
+        hospital = master.query(Hospital).filter(Hospital.db_name == db_name).first()
+        if not hospital:
+            raise HTTPException(404, "Tenant not found")
+        info = _hospital_info(hospital)
+
+    _tenants.set(db_name, info)
+    return info
+
+
+def invalidate_tenant(db_name: str | None = None):
+    """Drop cached metadata for one tenant, or all of them"""
+    if db_name is None:
+        _tenants.clear()
+    else:
+        _tenants.pop(db_name)
+
+
+def get_tenant_session(user: dict) -> Session:
+    """Open a session on the tenant DB named in the user's token; caller closes it"""
+    info = resolve_tenant(user.get("tenant_db"))
+    return open_tenant_session(str(info["db_name"]))
+
+
+def get_user_tenant_db(user=Depends(get_current_user)):
+    """Tenant session for the authenticated user, closed after the request"""
+    db = get_tenant_session(user)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Any ORM write to a hospital row (registration, plan/licence changes) drops its cache entry
+@event.listens_for(Hospital, "after_insert")
+@event.listens_for(Hospital, "after_update")
+@event.listens_for(Hospital, "after_delete")
+def _invalidate_hospital(mapper, connection, target):
+    if target.db_name:
+        logger.info(f"Invalidating cached tenant metadata for {target.db_name}")
+        invalidate_tenant(str(target.db_name))
@@ -1,5 +1,8 @@
+import os
+import time
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
+from utils.ttl_cache import TTLCache
 
 SECRET_KEY = "HARU"
 ALGORITHM = "HS256"
@@ -7,6 +10,10 @@ ALGORITHM = "HS256"
 ACCESS_EXPIRE_MIN = 480       # Access Token life (8 hours)
 REFRESH_EXPIRE_DAYS = 30        # Refresh Token life (30 days)
 
+# Decoded tokens, kept until they expire
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+_decoded_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_EXPIRE_MIN * 60)
+
 
 def create_access_token(payload: dict):
     data = payload.copy()
@@ -21,8 +28,16 @@ def create_refresh_token(payload: dict):
 
 
 def verify_token(token: str):
+    cached = _decoded_tokens.get(token)
+    if cached is not None:
+        return dict(cached)
+
     try:
         decoded = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return decoded
     except JWTError:
         return None
+
+    lifetime = decoded.get("exp", 0) - time.time()
+    if lifetime > 0:
+        _decoded_tokens.set(token, decoded, ttl=lifetime)
+    return dict(decoded)
@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from models.models_master import Hospital, TenantUserDirectory
+from models.models_tenant import User as TenantUser
+from database import get_tenant_engine, logger
+
+
+def lookup_user_tenant(master_db: Session, email: str):
+    """Return the directory entry for an email, or None"""
+    return master_db.query(TenantUserDirectory).filter(TenantUserDirectory.email == email).first()
+
+
+def find_user_tenant(master_db: Session, email: str):
+    """Return the hospital whose tenant DB owns an email, or None"""
+    entry = lookup_user_tenant(master_db, email)
+    if entry is None:
+        return None
+    return master_db.query(Hospital).filter(Hospital.id == entry.hospital_id).first()
+
+
+def email_taken_elsewhere(master_db: Session, email: str, db_name: str) -> bool:
+    entry = lookup_user_tenant(master_db, email)
+    return entry is not None and entry.db_name != db_name
+
+
+def upsert_user_entry(master_db: Session, hospital: Hospital, tenant_user_id: int, email: str):
+    """Point an email at a tenant user; replaces any entry for the same tenant user"""
+    entry = master_db.query(TenantUserDirectory).filter(
+        TenantUserDirectory.db_name == hospital.db_name,
+        TenantUserDirectory.tenant_user_id == tenant_user_id
+    ).first()
+
+    existing = lookup_user_tenant(master_db, email)
+    if existing is not None and existing is not entry:
+        if existing.db_name != hospital.db_name:
+            logger.warning(f"Email {email} already indexed for tenant {existing.db_name}, skipping {hospital.db_name}")
+            return None
+        master_db.delete(existing)
+        master_db.flush()
+
+    if entry is None:
+        entry = TenantUserDirectory(
+            email=email,
+            hospital_id=hospital.id,
+            db_name=hospital.db_name,
+            tenant_user_id=tenant_user_id
+        )
+        master_db.add(entry)
+    else:
+        entry.email = email
+
+    master_db.commit()
+    return entry
+
+
+def index_tenant_user(master_db: Session, db_name: str, tenant_user_id: int, email: str):
+    """upsert_user_entry for callers that only know the tenant DB name"""
+    hospital = master_db.query(Hospital).filter(Hospital.db_name == db_name).first()
+    if hospital is None:
+        logger.warning(f"No hospital for tenant {db_name}, {email} not indexed")
+        return None
+    return upsert_user_entry(master_db, hospital, tenant_user_id, email)
+
+
+def remove_user_entry(master_db: Session, db_name: str, tenant_user_id: int):
+    master_db.query(TenantUserDirectory).filter(
+        TenantUserDirectory.db_name == db_name,
+        TenantUserDirectory.tenant_user_id == tenant_user_id
+    ).delete(synchronize_session=False)
+    master_db.commit()
+
+
+def rebuild_tenant_entries(master_db: Session, hospital: Hospital) -> int:
+    """Re-index every user of one tenant; returns the number of entries written"""
+    engine = get_tenant_engine(str(hospital.db_name))
+    with Session(bind=engine) as tdb:
+        users = tdb.query(TenantUser.id, TenantUser.email).all()
+
+    master_db.query(TenantUserDirectory).filter(
+        TenantUserDirectory.db_name == hospital.db_name
+    ).delete(synchronize_session=False)
+
+    # Emails already owned by another tenant keep their first (lowest hospital id) owner
+    emails = [u.email for u in users]
+    taken = set()
+    if emails:
+        taken = {
+            row.email for row in master_db.query(TenantUserDirectory.email).filter(
+                TenantUserDirectory.email.in_(emails)
+            )
+        }
+
+    rows = []
+    for u in users:
+        if u.email in taken:
+            logger.warning(f"Email {u.email} in {hospital.db_name} already indexed for another tenant")
+            continue
+        taken.add(u.email)
+        rows.append({
+            "email": u.email,
+            "hospital_id": hospital.id,
+            "db_name": hospital.db_name,
+            "tenant_user_id": u.id
+        })
+
+    if rows:
+        master_db.execute(TenantUserDirectory.__table__.insert(), rows)
+    master_db.commit()
+    return len(rows)
+
+
+def rebuild_user_directory(master_db: Session, db_names: list | None = None) -> dict:
+    """Backfill the directory from tenant DBs; returns entries written per tenant"""
+    query = master_db.query(Hospital).order_by(Hospital.id)
+    if db_names:
+        query = query.filter(Hospital.db_name.in_(db_names))
+
+    summary = {}
+    for hospital in query.all():
+        try:
+            summary[hospital.db_name] = rebuild_tenant_entries(master_db, hospital)
+            logger.info(f"Indexed {summary[hospital.db_name]} users for {hospital.db_name}")
+        except Exception as e:
+            master_db.rollback()
+            logger.error(f"Failed to index users for {hospital.db_name}: {str(e)}")
+            summary[hospital.db_name] = None
+    return summary
@@ -7,8 +7,8 @@ export default function AttendanceReports() {
   const [report, setReport] = useState([]);
 
   const loadDaily = async () => {
-    const res = await api.get("/api/attendance/reports/daily");
-    setReport(res.data);
+    const res = await api.get("/api/attendance/reports/daily/totals");
+    setReport(res.data.days);
   };
 
   const loadMonthly = async () => {
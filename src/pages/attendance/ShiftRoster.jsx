@@ -210,7 +210,7 @@ export default function ShiftRoster() {
       const startDate = dates[0];
       const endDate = dates[dates.length - 1];
       
-      const url = `http://localhost:8000/api/roster/schedule?start_date=${startDate}&end_date=${endDate}${selectedDepartment ? `&department=${selectedDepartment}` : ''}`;
+      const url = `http://localhost:8000/api/roster/schedule?start_date=${startDate}&end_date=${endDate}&format=compact${selectedDepartment ? `&department=${selectedDepartment}` : ''}`;
       
       const response = await fetch(url, {
         headers: { Authorization: `Bearer ${token}` }
@@ -219,36 +219,27 @@ export default function ShiftRoster() {
       if (response.ok) {
         const data = await response.json();
         console.log("Roster data received:", data);
-        setRosterData(data.roster || []);
+        setRosterData(data.employees || []);
         
-        // Auto-populate allocated users from roster data
-        if (data.roster && data.roster.length > 0) {
-          const uniqueUsers = data.roster.reduce((acc, entry) => {
-            if (!acc.find(u => u.id === entry.employee_id)) {
-              acc.push({
-                id: entry.employee_id,
-                name: entry.employee_name || `User ${entry.employee_id}`,
-                department_name: entry.department || "Unknown",
-                role_name: "Unknown",
-                roster: {}
-              });
-            }
-            return acc;
-          }, []);
-          
-          // Populate roster data from schedule
-          data.roster.forEach(empData => {
-            const user = uniqueUsers.find(u => u.id === empData.employee_id);
-            if (user && empData.schedule) {
-              empData.schedule.forEach(dayData => {
-                if (dayData.shift_id) {
-                  user.roster[dayData.date] = dayData.shift_id;
-                }
-              });
-            }
+        // Auto-populate allocated users from the compact shift matrix
+        if (data.employees && data.employees.length > 0) {
+          const allocated = data.employees.map((emp, row) => {
+            const roster = {};
+            data.matrix[row].forEach((shiftId, col) => {
+              if (shiftId) {
+                roster[data.dates[col]] = shiftId;
+              }
+            });
+            return {
+              id: emp.employee_id,
+              name: emp.employee_name || `User ${emp.employee_id}`,
+              department_name: emp.department || "Unknown",
+              role_name: "Unknown",
+              roster
+            };
           });
           
-          setAllocatedUsers(uniqueUsers);
+          setAllocatedUsers(allocated);
         }
       } else {
         console.error("Failed to fetch roster data:", await response.text());
@@ -66,7 +66,7 @@ export default function Shifts() {
       const endDate = dates[dates.length - 1];
       
       const token = localStorage.getItem("access_token");
-      const response = await fetch(`http://localhost:8000/api/roster/schedule?start_date=${startDate}&end_date=${endDate}`, {
+      const response = await fetch(`http://localhost:8000/api/roster/schedule?start_date=${startDate}&end_date=${endDate}&format=compact`, {
         headers: { Authorization: `Bearer ${token}` }
       });
       
@@ -74,12 +74,10 @@ export default function Shifts() {
         const data = await response.json();
         // Process roster data into a more usable format
         const processedData = {};
-        data.roster?.forEach(entry => {
-          if (!processedData[entry.employee_id]) {
-            processedData[entry.employee_id] = {};
-          }
-          entry.schedule?.forEach(dayData => {
-            processedData[entry.employee_id][dayData.date] = dayData.shift_id;
+        data.employees?.forEach((emp, row) => {
+          processedData[emp.employee_id] = {};
+          data.matrix[row].forEach((shiftId, col) => {
+            processedData[emp.employee_id][data.dates[col]] = shiftId;
           });
         });
         setRosterData(processedData);
@@ -147,172 +147,24 @@ export default function PayrollRun() {
         return;
       }
       
-      // If validation passes, proceed with payroll
-      
-      const employeesWithSalary = employees.filter(employee => {
-        // Check if employee is linked to any salary structure in database
-        const linkedStructure = structures.find(structure => {
-          if (!structure.employee_ids) return false;
-          const storedIds = structure.employee_ids.split(',').filter(id => id.trim());
-          // Convert stored IDs to match employee ID types
-          const normalizedIds = storedIds.map(id => {
-            const numId = parseInt(id);
-            return isNaN(numId) ? id : numId;
-          });
-          return normalizedIds.includes(employee.id);
-        });
-        return linkedStructure;
+      // If validation passes, compute and save payroll for all linked employees in one request
+      const bulkRes = await api.post("/api/payroll/runs/bulk", {
+        month: runData.month,
+        year: runData.year,
+        skip_validation: true  // already validated above
       });
       
-      if (employeesWithSalary.length === 0) {
+      if (bulkRes.data.employees_processed === 0) {
         alert('No employees with salary structures found to process payroll.');
         return;
       }
       
-      console.log('Employees with salary structures:', employeesWithSalary.map(e => ({ id: e.id, name: e.name, employee_code: e.employee_code })));
-      
-      const payrollPromises = employeesWithSalary.map(async (employee) => {
-        try {
-          console.log(`\n=== Processing Employee: ${employee.name} ===`);
-          console.log(`Employee data:`, {
-            id: employee.id,
-            original_user_id: employee.original_user_id,
-            employee_code: employee.employee_code,
-            name: employee.name
-          });
-          
-          // Find employee's salary structure from database
-          const linkedStructure = structures.find(structure => {
-            if (!structure.employee_ids) return false;
-            const storedIds = structure.employee_ids.split(',').filter(id => id.trim());
-            // Convert stored IDs to match employee ID types
-            const normalizedIds = storedIds.map(id => {
-              const numId = parseInt(id);
-              return isNaN(numId) ? id : numId;
-            });
-            return normalizedIds.includes(employee.id);
-          });
-          
-          if (!linkedStructure) {
-            console.warn(`❌ No salary structure linked for employee ${employee.name}`);
-            return null;
-          }
-          
-          console.log(`✅ Found salary structure ${linkedStructure.id} for ${employee.name}`);
-          
-          const salaryStructure = linkedStructure;
-          
-          // Calculate attendance data
-          const attendanceRes = await api.get(`/api/attendance/punches/`, {
-            params: {
-              employee_id: employee.original_user_id || employee.id,
-              month: runData.month,
-              year: runData.year
-            }
-          });
-          
-          // Calculate leave data  
-          const leaveRes = await api.get(`/api/leave/applications/`, {
-            params: {
-              employee_id: employee.original_user_id || employee.id,
-              status: 'Approved',
-              from_date: `${runData.year}-${String(months.indexOf(runData.month) + 1).padStart(2, '0')}-01`,
-              to_date: `${runData.year}-${String(months.indexOf(runData.month) + 1).padStart(2, '0')}-31`
-            }
-          });
-          
-          // Process attendance data
-          const monthlyAttendance = attendanceRes.data.filter(record => {
-            const recordDate = new Date(record.date);
-            return recordDate.getMonth() === months.indexOf(runData.month) && 
-                   recordDate.getFullYear() === runData.year &&
-                   record.employee_id == (employee.original_user_id || employee.id);
-          });
-          
-          // Process leave data
-          const monthlyLeaves = leaveRes.data.filter(leave => {
-            const fromDate = new Date(leave.from_date);
-            const toDate = new Date(leave.to_date);
-            const monthStart = new Date(runData.year, months.indexOf(runData.month), 1);
-            const monthEnd = new Date(runData.year, months.indexOf(runData.month) + 1, 0);
-            
-            return leave.employee_id == (employee.original_user_id || employee.id) &&
-                   leave.status === 'Approved' &&
-                   ((fromDate >= monthStart && fromDate <= monthEnd) ||
-                    (toDate >= monthStart && toDate <= monthEnd) ||
-                    (fromDate <= monthStart && toDate >= monthEnd));
-          });
-          
-          const presentDays = monthlyAttendance.filter(record => 
-            record.status === 'Present' || record.status === 'Late'
-          ).length;
-          
-          const leaveDays = monthlyLeaves.reduce((total, leave) => {
-            const fromDate = new Date(leave.from_date);
-            const toDate = new Date(leave.to_date);
-            const monthStart = new Date(runData.year, months.indexOf(runData.month), 1);
-            const monthEnd = new Date(runData.year, months.indexOf(runData.month) + 1, 0);
-            
-            const actualFromDate = fromDate < monthStart ? monthStart : fromDate;
-            const actualToDate = toDate > monthEnd ? monthEnd : toDate;
-            
-            const timeDiff = actualToDate.getTime() - actualFromDate.getTime();
-            const daysDiff = Math.ceil(timeDiff / (1000 * 3600 * 24)) + 1;
-            
-            return total + Math.max(0, daysDiff);
-          }, 0);
-          
-          const daysInMonth = new Date(runData.year, months.indexOf(runData.month) + 1, 0).getDate();
-          const lopDays = Math.max(0, daysInMonth - presentDays - leaveDays);
-          
-          // Calculate salary
-          const monthlyCTC = (salaryStructure.ctc || 0) / 12;
-          const basicSalary = (monthlyCTC * (salaryStructure.basic_percent || 40)) / 100;
-          const hraSalary = (monthlyCTC * (salaryStructure.hra_percent || 20)) / 100;
-          const allowances = monthlyCTC - basicSalary - hraSalary;
-          
-          const grossSalary = monthlyCTC;
-          const lopDeduction = (grossSalary / 30) * lopDays;
-          const netSalary = grossSalary - lopDeduction;
-          
-          // Create payroll run record and save to database
-          const payrollData = {
-            employee_id: employee.original_user_id || employee.id,
-            employee_name: employee.name,
-            employee_code: employee.employee_code,
-            month: runData.month,
-            year: runData.year,
-            present_days: presentDays,
-            leave_days: leaveDays,
-            lop_days: lopDays,
-            basic_salary: basicSalary,
-            hra_salary: hraSalary,
-            allowances: allowances,
-            gross_salary: grossSalary,
-            lop_deduction: lopDeduction,
-            net_salary: netSalary,
-            status: 'Completed',
-            processed_date: new Date().toISOString()
-          };
-          
-          // Save to database
-          await api.post("/api/payroll/runs", payrollData);
-          return payrollData;
-        } catch (error) {
-          console.error(`Error processing payroll for ${employee.name}:`, error);
-          return null;
-        }
-      });
-      
-      const payrollResults = await Promise.all(payrollPromises);
-      const validResults = payrollResults.filter(result => result !== null);
-      
       // Fetch updated data from database
       await fetchRuns();
       setShowRunModal(false);
       setRunData({ month: "", year: new Date().getFullYear() });
       
-      alert(`Payroll processed successfully for ${validResults.length} employees!`);
+      alert(`Payroll processed successfully for ${bulkRes.data.employees_processed} employees!`);
     } catch (error) {
       console.error("Error running payroll:", error);
       